@@ -7,11 +7,13 @@ import numpy as np
 from typing import Optional, List, Dict, Any, Callable
 
 from gestao_vista.models.casa_oracao import CasaOracao
+from gestao_vista.models.presence_matrix import PresenceMatrix
 from gestao_vista.services.data_service import DataService
 from gestao_vista.services.graph_service import GraphService
 from gestao_vista.services.table_service import TableService
 from gestao_vista.services.casa_oracao_service import CasaOracaoService
 from gestao_vista.services.report_service import ReportService
+from gestao_vista.services.trend_analysis_service import TrendAnalysisService
 from gestao_vista.ui.casa_oracao_ui import CasaOracaoUI
 from gestao_vista.ui.observacao_ui import ObservacaoUI
 from gestao_vista.utils.design_system import DESIGN_SYSTEM, setup_styles
@@ -43,6 +45,7 @@ class GestaoVistaApp:
 
         # Inicializar variáveis
         self.df_gestao: Optional[pd.DataFrame] = None
+        self.presence: PresenceMatrix = PresenceMatrix.empty()
         self.casas: List[CasaOracao] = []
         self.caracteristicas: List[str] = []
         self.export_container: Optional[ttk.Frame] = None
@@ -87,7 +90,8 @@ class GestaoVistaApp:
 
     def load_saved_data(self):
         """Carrega os dados salvos"""
-        self.df_gestao = self.data_service.load_gestao()
+        self.presence = self.data_service.load_presence()
+        self.df_gestao = self.presence.to_dataframe()
         self.casas = self.casa_oracao_service.load_casas()
 
         if self.df_gestao is not None and not self.df_gestao.empty:
@@ -100,7 +104,7 @@ class GestaoVistaApp:
             self.df_gestao = pd.DataFrame(columns=["codigo"])
 
         # Inicializar ReportService após carregar os dados
-        self.report_service = ReportService(self.df_gestao, self.casas)
+        self.report_service = ReportService(self.df_gestao, self.casas, self.presence)
 
     def setup_ui(self):
         """Configura a interface do usuário"""
@@ -139,6 +143,15 @@ class GestaoVistaApp:
         )
         comparative_btn.pack(side=tk.LEFT, padx=5)
 
+        # Botão de análise de tendência (períodos do histórico)
+        trend_btn = create_button(
+            toggle_frame,
+            "📉 Tendência",
+            self.show_trend_analysis,
+            "primary",
+        )
+        trend_btn.pack(side=tk.LEFT, padx=5)
+
         # Criar controles
         self.controls_frame, self.caracteristica_combo, self.feedback_label = (
             create_controls(
@@ -158,6 +171,7 @@ class GestaoVistaApp:
             None,  # Removido callback de limpar casas
             lambda: self.casa_oracao_ui.view_casas(self.root),
             lambda: self.observacao_ui.show(),
+            self.export_all_faltantes,
         )
 
     def toggle_view(self, mode: str):
@@ -168,6 +182,7 @@ class GestaoVistaApp:
                 self.df_gestao,
                 self.casas,
                 self.caracteristicas,
+                self.presence,
             )
         else:
             self.view_mode.set(mode)
@@ -189,6 +204,7 @@ class GestaoVistaApp:
                 self.df_gestao,
                 self.caracteristicas,
                 len(self.df_gestao),
+                self.presence,
             )
 
     def on_caracteristica_selected(self, is_valid: bool):
@@ -239,11 +255,15 @@ class GestaoVistaApp:
         )
 
         if file_path:
-            self.df_gestao = self.data_service.import_gestao_from_excel(file_path)
-            if self.df_gestao is not None:
+            presence = self.data_service.import_gestao_presence(file_path)
+            if presence is not None:
+                self.presence = presence
+                self.df_gestao = presence.to_dataframe()
                 self.caracteristicas = self.df_gestao.columns[1:].tolist()
                 self.coluna_codigo = self.df_gestao.columns[0]
-                self.report_service = ReportService(self.df_gestao, self.casas)
+                self.report_service = ReportService(
+                    self.df_gestao, self.casas, self.presence
+                )
                 self.update_ui_with_data()
                 messagebox.showinfo(
                     "✅ Sucesso", "Arquivo de Gestão à Vista carregado com sucesso!"
@@ -256,14 +276,14 @@ class GestaoVistaApp:
         ):
             if self.data_service.clear_gestao():
                 self.df_gestao = None
+                self.presence = PresenceMatrix.empty()
                 self.caracteristicas = []
                 self.caracteristica_combo["values"] = []
                 self.caracteristica_var.set("Escolha uma característica...")
                 self.report_service = None
 
                 # Limpar gráfico
-                for widget in self.graph_frame.winfo_children():
-                    widget.destroy()
+                self.graph_service.clear()
 
                 messagebox.showinfo(
                     "✅ Sucesso", "Dados de Gestão à Vista limpos com sucesso!"
@@ -293,6 +313,16 @@ class GestaoVistaApp:
 
         self.report_service.export_faltantes(caracteristica, self.coluna_codigo)
 
+    def export_all_faltantes(self):
+        """Exporta os faltantes de todos os documentos em um único arquivo"""
+        if self.df_gestao is None or self.report_service is None:
+            messagebox.showwarning(
+                "⚠️ Aviso", "Carregue primeiro o arquivo de Gestão à Vista!"
+            )
+            return
+
+        self.report_service.export_all_faltantes()
+
     def show_comparative_analysis(self):
         """Mostra a janela de análise comparativa"""
         if self.df_gestao is None:
@@ -301,4 +331,8 @@ class GestaoVistaApp:
             )
             return
 
-        self.comparative_analysis_ui.show_dialog(self.df_gestao)
+        self.comparative_analysis_ui.show_dialog(self.df_gestao, self.presence)
+
+    def show_trend_analysis(self):
+        """Gera a análise de tendência dos períodos importados"""
+        TrendAnalysisService.generate_trend_analysis(self.data_service.history)
@@ -0,0 +1,290 @@
+import itertools
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Tabela de contagem de bits por byte (popcount)
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+# Gerador das versões das matrizes (cada matriz criada recebe uma nova versão)
+_versoes = itertools.count(1)
+
+
+class PresenceMatrix:
+    """
+    Matriz de presença de documentos (casas x documentos) com bits empacotados.
+
+    Cada documento é guardado como um bitset sobre as casas, de modo que as
+    contagens por documento são popcounts sobre bytes e os totais por casa
+    são somas vetorizadas, sem reinterpretar strings "X" a cada consulta.
+
+    A matriz não é alterada depois de criada; o atributo version identifica
+    o snapshot e pode ser usado como chave de cache.
+    """
+
+    def __init__(
+        self,
+        codigos: List[str],
+        documentos: List[str],
+        bits: np.ndarray,
+        coluna_codigo: str = "codigo",
+    ):
+        """
+        Inicializa a matriz a partir dos bits já empacotados.
+
+        Args:
+            codigos: Códigos das casas (uma linha por casa)
+            documentos: Nomes dos documentos (uma coluna por documento)
+            bits: Array uint8 (documentos x ceil(casas / 8)) gerado por np.packbits
+            coluna_codigo: Nome da coluna de código no DataFrame de origem
+        """
+        self._codigos = [str(codigo) for codigo in codigos]
+        self._documentos = [str(documento) for documento in documentos]
+        self.coluna_codigo = coluna_codigo
+        self.version = next(_versoes)
+
+        n_bytes = (len(self._codigos) + 7) // 8
+        self._bits = np.asarray(bits, dtype=np.uint8).reshape(
+            len(self._documentos), n_bytes
+        )
+
+        # Índices codigo -> linha (primeira ocorrência) e documento -> coluna
+        self._codigo_index: Dict[str, int] = {}
+        for idx, codigo in enumerate(self._codigos):
+            self._codigo_index.setdefault(codigo, idx)
+        self._documento_index: Dict[str, int] = {
+            documento: idx for idx, documento in enumerate(self._documentos)
+        }
+
+    @classmethod
+    def from_mask(
+        cls,
+        codigos: List[str],
+        documentos: List[str],
+        mask: np.ndarray,
+        coluna_codigo: str = "codigo",
+    ) -> "PresenceMatrix":
+        """
+        Cria a matriz a partir de uma máscara booleana (casas x documentos).
+
+        Args:
+            codigos: Códigos das casas
+            documentos: Nomes dos documentos
+            mask: Máscara booleana com uma linha por casa
+            coluna_codigo: Nome da coluna de código
+        """
+        mask = np.asarray(mask, dtype=bool).reshape(len(codigos), len(documentos))
+        bits = np.packbits(mask.T, axis=1)
+        return cls(codigos, documentos, bits, coluna_codigo)
+
+    @classmethod
+    def from_dataframe(cls, df: Optional[pd.DataFrame]) -> "PresenceMatrix":
+        """
+        Cria a matriz a partir do DataFrame de gestão ("X" = documento presente).
+
+        Args:
+            df: DataFrame com a coluna de código na primeira posição
+        """
+        if df is None or len(df.columns) == 0:
+            return cls.empty()
+
+        coluna_codigo = str(df.columns[0])
+        codigos = df.iloc[:, 0].astype(str).str.strip().tolist()
+        documentos = [str(col) for col in df.columns[1:]]
+        valores = df.iloc[:, 1:].fillna("").astype(str).to_numpy(dtype=str)
+        mask = np.char.upper(np.char.strip(valores)) == "X"
+        return cls.from_mask(codigos, documentos, mask, coluna_codigo)
+
+    @staticmethod
+    def _chave(codigo) -> str:
+        """Normaliza o código da casa como em from_dataframe (str + strip)."""
+        return str(codigo).strip()
+
+    @classmethod
+    def empty(cls) -> "PresenceMatrix":
+        """Cria uma matriz sem casas e sem documentos."""
+        return cls([], [], np.zeros((0, 0), dtype=np.uint8))
+
+    @property
+    def codigos(self) -> List[str]:
+        return self._codigos
+
+    @property
+    def documentos(self) -> List[str]:
+        return self._documentos
+
+    @property
+    def bits(self) -> np.ndarray:
+        return self._bits
+
+    @property
+    def codigo_index(self) -> Dict[str, int]:
+        return self._codigo_index
+
+    @property
+    def documento_index(self) -> Dict[str, int]:
+        return self._documento_index
+
+    @property
+    def n_casas(self) -> int:
+        return len(self._codigos)
+
+    @property
+    def n_documentos(self) -> int:
+        return len(self._documentos)
+
+    @property
+    def is_empty(self) -> bool:
+        return self.n_casas == 0 or self.n_documentos == 0
+
+    def _colunas(self, documentos: Optional[Iterable[str]]) -> np.ndarray:
+        """Converte nomes de documentos em índices de coluna."""
+        if documentos is None:
+            return np.arange(self.n_documentos)
+        return np.array(
+            [self._documento_index[documento] for documento in documentos],
+            dtype=np.intp,
+        )
+
+    def to_mask(self, documentos: Optional[Iterable[str]] = None) -> np.ndarray:
+        """
+        Desempacota a matriz em uma máscara booleana (casas x documentos).
+
+        Args:
+            documentos: Documentos a incluir (None para todos)
+        """
+        colunas = self._colunas(documentos)
+        unpacked = np.unpackbits(self._bits[colunas], axis=1, count=self.n_casas)
+        return unpacked.T.astype(bool)
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """Converte a matriz no DataFrame de gestão ("X" para presente)."""
+        if self.n_casas == 0:
+            return pd.DataFrame(columns=[self.coluna_codigo])
+
+        colunas = {self.coluna_codigo: np.array(self._codigos, dtype=object)}
+        valores = np.where(self.to_mask(), "X", "").astype(object)
+        for idx, documento in enumerate(self._documentos):
+            colunas[documento] = valores[:, idx]
+        return pd.DataFrame(colunas)
+
+    def gather(
+        self, codigos: Iterable[str], documentos: Optional[Iterable[str]] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Junta uma lista de códigos às linhas da matriz (hash join pelo código).
+
+        As posições são resolvidas uma única vez pelo índice codigo -> linha e
+        a submatriz é obtida com um único take sobre a máscara.
+
+        Args:
+            codigos: Códigos das casas, na ordem desejada
+            documentos: Documentos a incluir (None para todos)
+
+        Returns:
+            Tuple com a máscara (códigos x documentos) e um array booleano que
+            indica quais códigos existem na matriz (os ausentes ficam sem
+            nenhum documento)
+        """
+        posicoes = np.fromiter(
+            (self._codigo_index.get(self._chave(codigo), -1) for codigo in codigos),
+            dtype=np.intp,
+        )
+        encontrados = posicoes >= 0
+        mask = self.to_mask(documentos)
+        if mask.shape[0] == 0:
+            return np.zeros((len(posicoes), mask.shape[1]), dtype=bool), encontrados
+        gathered = mask.take(np.where(encontrados, posicoes, 0), axis=0)
+        gathered[~encontrados] = False
+        return gathered, encontrados
+
+    def align(self, codigos: List[str], documentos: List[str]) -> np.ndarray:
+        """
+        Projeta a matriz em outro layout (casas x documentos).
+
+        Casas e documentos que não existem nesta matriz ficam sem presença.
+
+        Args:
+            codigos: Códigos das casas do layout de destino
+            documentos: Documentos do layout de destino
+        """
+        mask = np.zeros((len(codigos), len(documentos)), dtype=bool)
+        rows = np.fromiter(
+            (self._codigo_index.get(self._chave(codigo), -1) for codigo in codigos),
+            dtype=np.intp,
+            count=len(codigos),
+        )
+        cols = np.fromiter(
+            (self._documento_index.get(documento, -1) for documento in documentos),
+            dtype=np.intp,
+            count=len(documentos),
+        )
+        row_ok = np.flatnonzero(rows >= 0)
+        col_ok = np.flatnonzero(cols >= 0)
+        if len(row_ok) and len(col_ok):
+            unpacked = np.unpackbits(
+                self._bits[cols[col_ok]], axis=1, count=self.n_casas
+            ).astype(bool)
+            mask[np.ix_(row_ok, col_ok)] = unpacked[:, rows[row_ok]].T
+        return mask
+
+    def column(self, documento: str) -> np.ndarray:
+        """Retorna a presença de um documento em todas as casas."""
+        idx = self._documento_index[documento]
+        return np.unpackbits(self._bits[idx], count=self.n_casas).astype(bool)
+
+    def row(self, codigo: str) -> Optional[np.ndarray]:
+        """Retorna a presença de todos os documentos de uma casa."""
+        idx = self._codigo_index.get(self._chave(codigo))
+        if idx is None:
+            return None
+        byte, bit = divmod(idx, 8)
+        return ((self._bits[:, byte] >> (7 - bit)) & 1).astype(bool)
+
+    def has_documento(self, codigo: str, documento: str) -> bool:
+        """Verifica se a casa possui o documento."""
+        row = self._codigo_index.get(self._chave(codigo))
+        col = self._documento_index.get(documento)
+        if row is None or col is None:
+            return False
+        byte, bit = divmod(row, 8)
+        return bool((self._bits[col, byte] >> (7 - bit)) & 1)
+
+    def counts(self, documentos: Optional[Iterable[str]] = None) -> np.ndarray:
+        """
+        Conta quantas casas possuem cada documento (popcount por documento).
+
+        Args:
+            documentos: Documentos a contar (None para todos)
+        """
+        colunas = self._colunas(documentos)
+        return _POPCOUNT[self._bits[colunas]].sum(axis=1, dtype=np.int64)
+
+    def casa_counts(self, documentos: Optional[Iterable[str]] = None) -> np.ndarray:
+        """
+        Conta quantos documentos cada casa possui.
+
+        Args:
+            documentos: Documentos considerados (None para todos)
+        """
+        return self.to_mask(documentos).sum(axis=1, dtype=np.int64)
+
+    def casa_percentages(
+        self, documentos: Optional[Iterable[str]] = None
+    ) -> np.ndarray:
+        """
+        Calcula o percentual de documentos presentes em cada casa.
+
+        Args:
+            documentos: Documentos considerados (None para todos)
+        """
+        colunas = self._colunas(documentos)
+        if len(colunas) == 0:
+            return np.zeros(self.n_casas, dtype=float)
+        return self.casa_counts(documentos) / len(colunas) * 100
+
+    def faltantes(self, documento: str) -> List[str]:
+        """Retorna os códigos das casas que não possuem o documento."""
+        indices = np.flatnonzero(~self.column(documento))
+        return [self._codigos[idx] for idx in indices]
@@ -0,0 +1,120 @@
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from gestao_vista.models.presence_matrix import PresenceMatrix
+from gestao_vista.utils.constants import is_documento_obrigatorio
+
+# Quantidade de agregações guardadas em memória (snapshots x seleções de documentos)
+MAX_CACHED_AGGREGATES = 16
+
+
+@dataclass(frozen=True)
+class DocumentAggregates:
+    """
+    Agregados por documento de um snapshot da matriz de presença.
+
+    Attributes:
+        documentos: Documentos agregados, na ordem solicitada
+        contagens: Quantidade de casas com cada documento
+        percentuais: Percentual de casas com cada documento
+        total_casas: Total de casas do snapshot
+        obrigatorios: Documentos obrigatórios, na ordem de documentos
+        opcionais: Documentos opcionais, na ordem de documentos
+        ordem_grafico: Índices dos documentos na ordem do gráfico (obrigatórios
+            e depois opcionais, cada grupo do maior para o menor)
+    """
+
+    documentos: List[str]
+    contagens: np.ndarray
+    percentuais: np.ndarray
+    total_casas: int
+    obrigatorios: List[str]
+    opcionais: List[str]
+    ordem_grafico: List[int]
+
+    @property
+    def por_documento(self) -> Dict[str, int]:
+        """Contagens indexadas pelo nome do documento."""
+        return dict(zip(self.documentos, self.contagens.tolist()))
+
+
+_cache: "OrderedDict[Tuple[int, Tuple[str, ...]], DocumentAggregates]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+class AggregationService:
+    """
+    Calcula, em uma única passada vetorizada, os agregados por documento
+    usados pelos gráficos, tabelas e relatórios.
+
+    Os resultados são guardados por versão do snapshot (PresenceMatrix.version)
+    e seleção de documentos, e reaproveitados por todos os consumidores.
+    """
+
+    @staticmethod
+    def aggregate(
+        presence: PresenceMatrix, documentos: Optional[List[str]] = None
+    ) -> DocumentAggregates:
+        """
+        Retorna os agregados por documento do snapshot.
+
+        Args:
+            presence: Matriz de presença do Gestão à Vista
+            documentos: Documentos a agregar (None para todos)
+        """
+        documentos = list(presence.documentos if documentos is None else documentos)
+        key = (presence.version, tuple(documentos))
+
+        with _cache_lock:
+            aggregates = _cache.get(key)
+            if aggregates is not None:
+                _cache.move_to_end(key)
+                return aggregates
+
+        aggregates = AggregationService._compute(presence, documentos)
+
+        with _cache_lock:
+            _cache[key] = aggregates
+            while len(_cache) > MAX_CACHED_AGGREGATES:
+                _cache.popitem(last=False)
+        return aggregates
+
+    @staticmethod
+    def _compute(presence: PresenceMatrix, documentos: List[str]) -> DocumentAggregates:
+        """Calcula os agregados (popcount de todos os documentos de uma vez)."""
+        contagens = presence.counts(documentos)
+        total_casas = presence.n_casas
+        percentuais = (
+            contagens / total_casas * 100
+            if total_casas
+            else np.zeros(len(documentos), dtype=float)
+        )
+
+        obrigatorio = np.array(
+            [is_documento_obrigatorio(documento) for documento in documentos],
+            dtype=bool,
+        )
+        indices_obrig = np.flatnonzero(obrigatorio)
+        indices_opc = np.flatnonzero(~obrigatorio)
+
+        # Os agregados são compartilhados pelo cache, então não podem ser alterados
+        contagens.setflags(write=False)
+        percentuais.setflags(write=False)
+
+        # Ordenar cada grupo por contagem (maior para menor)
+        ordem_obrig = indices_obrig[np.argsort(contagens[indices_obrig])[::-1]]
+        ordem_opc = indices_opc[np.argsort(contagens[indices_opc])[::-1]]
+
+        return DocumentAggregates(
+            documentos=documentos,
+            contagens=contagens,
+            percentuais=percentuais,
+            total_casas=total_casas,
+            obrigatorios=[documentos[i] for i in indices_obrig],
+            opcionais=[documentos[i] for i in indices_opc],
+            ordem_grafico=np.concatenate([ordem_obrig, ordem_opc]).tolist(),
+        )
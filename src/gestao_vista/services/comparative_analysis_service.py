@@ -1,29 +1,139 @@
 import pandas as pd
 import matplotlib.pyplot as plt
 import numpy as np
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 from tkinter import messagebox, filedialog
 import os
+from dataclasses import dataclass
 from datetime import datetime
+from openpyxl import Workbook
 
-from gestao_vista.utils.constants import is_documento_obrigatorio
+from gestao_vista.models.presence_matrix import PresenceMatrix
+from gestao_vista.services.aggregation_service import AggregationService
+from gestao_vista.services.report_service import write_sheet
 from gestao_vista.utils.design_system import DESIGN_SYSTEM
 
 
+@dataclass
+class CasaDiff:
+    """
+    Diferença por casa entre dois períodos, alinhada pelo código.
+
+    Attributes:
+        codigos: Casas dos dois períodos (as do atual primeiro)
+        documentos: Documentos dos dois períodos
+        no_atual: Indica se a casa existe no período atual
+        no_anterior: Indica se a casa existe no período de comparação
+        documento_no_atual: Indica se o documento existe no período atual
+        documento_no_anterior: Indica se o documento existe no período de
+            comparação
+        ganhou: Casas x documentos que passaram a ter o documento
+        perdeu: Casas x documentos que deixaram de ter o documento
+        inalterado: Casas x documentos sem mudança
+        (ganhou, perdeu e inalterado consideram apenas casas e documentos
+        presentes nos dois períodos)
+    """
+
+    codigos: List[str]
+    documentos: List[str]
+    no_atual: np.ndarray
+    no_anterior: np.ndarray
+    documento_no_atual: np.ndarray
+    documento_no_anterior: np.ndarray
+    ganhou: np.ndarray
+    perdeu: np.ndarray
+    inalterado: np.ndarray
+
+    def resumo_dataframe(self) -> pd.DataFrame:
+        """
+        Quantidade de casas que ganharam, perderam ou mantiveram cada documento
+        presente nos dois períodos.
+        """
+        em_ambos = self.documento_no_atual & self.documento_no_anterior
+        return pd.DataFrame(
+            {
+                "Documento": np.asarray(self.documentos, dtype=object)[em_ambos],
+                "Ganharam": self.ganhou.sum(axis=0)[em_ambos],
+                "Perderam": self.perdeu.sum(axis=0)[em_ambos],
+                "Sem alteração": self.inalterado.sum(axis=0)[em_ambos],
+            }
+        )
+
+    def mudancas_dataframe(self) -> pd.DataFrame:
+        """Lista (código, documento, mudança) de todas as casas que mudaram."""
+        linhas_g, colunas_g = np.nonzero(self.ganhou)
+        linhas_p, colunas_p = np.nonzero(self.perdeu)
+        codigos = np.asarray(self.codigos, dtype=object)
+        documentos = np.asarray(self.documentos, dtype=object)
+        df = pd.DataFrame(
+            {
+                "codigo": np.concatenate([codigos[linhas_g], codigos[linhas_p]]),
+                "Documento": np.concatenate(
+                    [documentos[colunas_g], documentos[colunas_p]]
+                ),
+                "Mudança": ["Ganhou"] * len(linhas_g) + ["Perdeu"] * len(linhas_p),
+            }
+        )
+        return df.sort_values(["Documento", "Mudança", "codigo"], kind="stable")
+
+    def casas_um_periodo_dataframe(self, rotulo_anterior: str) -> pd.DataFrame:
+        """Casas que existem em apenas um dos períodos."""
+        so_atual = self.no_atual & ~self.no_anterior
+        so_anterior = self.no_anterior & ~self.no_atual
+        codigos = np.asarray(self.codigos, dtype=object)
+        return pd.DataFrame(
+            {
+                "codigo": np.concatenate([codigos[so_atual], codigos[so_anterior]]),
+                "Presente apenas em": ["Atual"] * int(so_atual.sum())
+                + [rotulo_anterior] * int(so_anterior.sum()),
+            }
+        )
+
+    def documentos_um_periodo_dataframe(self, rotulo_anterior: str) -> pd.DataFrame:
+        """Documentos que existem em apenas um dos períodos."""
+        so_atual = self.documento_no_atual & ~self.documento_no_anterior
+        so_anterior = self.documento_no_anterior & ~self.documento_no_atual
+        documentos = np.asarray(self.documentos, dtype=object)
+        return pd.DataFrame(
+            {
+                "Documento": np.concatenate(
+                    [documentos[so_atual], documentos[so_anterior]]
+                ),
+                "Presente apenas em": ["Atual"] * int(so_atual.sum())
+                + [rotulo_anterior] * int(so_anterior.sum()),
+            }
+        )
+
+
 class ComparativeAnalysisService:
     def __init__(self):
         """Inicializa o serviço de análise comparativa."""
         self.current_data = None
         self.comparison_data = None
+        self.current_presence = None
+        self.comparison_presence = None
         self.comparison_label = None
 
-    def set_current_data(self, df: pd.DataFrame):
+    def set_current_data(
+        self, df: pd.DataFrame, presence: Optional[PresenceMatrix] = None
+    ):
         """Define os dados atuais para comparação."""
         self.current_data = df
+        self.current_presence = (
+            presence if presence is not None else PresenceMatrix.from_dataframe(df)
+        )
 
-    def set_comparison_data(self, df: pd.DataFrame, label: str):
+    def set_comparison_data(
+        self,
+        df: pd.DataFrame,
+        label: str,
+        presence: Optional[PresenceMatrix] = None,
+    ):
         """Define os dados para comparação e seu rótulo."""
         self.comparison_data = df
+        self.comparison_presence = (
+            presence if presence is not None else PresenceMatrix.from_dataframe(df)
+        )
         self.comparison_label = label
 
     def generate_comparative_analysis(self) -> bool:
@@ -41,8 +151,8 @@ class ComparativeAnalysisService:
 
         try:
             # Preparar dados para análise
-            current_counts = self._count_documents(self.current_data)
-            comparison_counts = self._count_documents(self.comparison_data)
+            current_counts = self._count_documents(self.current_presence)
+            comparison_counts = self._count_documents(self.comparison_presence)
 
             # Calcular diferenças
             differences = {}
@@ -147,8 +257,24 @@ class ComparativeAnalysisService:
 
                 plt.close(fig)
 
+                # Planilha com as mudanças por casa, ao lado do gráfico; o
+                # gráfico já foi salvo, então uma falha aqui é informada à parte
+                try:
+                    excel_path = self.export_per_casa_diff(file_path)
+                except Exception as e:
+                    messagebox.showwarning(
+                        "⚠️ Aviso",
+                        "Gráfico da análise comparativa salvo em "
+                        f"{os.path.basename(file_path)}, mas não foi possível "
+                        f"gravar a planilha de mudanças por casa: {str(e)}",
+                    )
+                    return True
+
                 messagebox.showinfo(
-                    "✅ Sucesso", "Análise comparativa gerada com sucesso!"
+                    "✅ Sucesso",
+                    "Análise comparativa gerada com sucesso!\n"
+                    f"Gráfico: {os.path.basename(file_path)}\n"
+                    f"Mudanças por casa: {os.path.basename(excel_path)}",
                 )
                 return True
 
@@ -161,18 +287,94 @@ class ComparativeAnalysisService:
             )
             return False
 
-    def _count_documents(self, df: pd.DataFrame) -> Dict[str, int]:
+    def per_casa_diff(self) -> CasaDiff:
+        """
+        Compara os dois períodos casa a casa (XOR das matrizes alinhadas).
+
+        As matrizes são alinhadas pela união dos códigos e dos documentos;
+        casas e documentos presentes em apenas um período não entram em
+        ganhos/perdas (são listados à parte).
+        """
+        atual = self.current_presence
+        anterior = self.comparison_presence
+
+        codigos = list(dict.fromkeys(atual.codigos + anterior.codigos))
+        documentos = list(dict.fromkeys(atual.documentos + anterior.documentos))
+        mask_atual = atual.align(codigos, documentos)
+        mask_anterior = anterior.align(codigos, documentos)
+
+        no_atual = np.fromiter(
+            (c in atual.codigo_index for c in codigos), dtype=bool, count=len(codigos)
+        )
+        no_anterior = np.fromiter(
+            (c in anterior.codigo_index for c in codigos),
+            dtype=bool,
+            count=len(codigos),
+        )
+        documento_no_atual = np.fromiter(
+            (d in atual.documento_index for d in documentos),
+            dtype=bool,
+            count=len(documentos),
+        )
+        documento_no_anterior = np.fromiter(
+            (d in anterior.documento_index for d in documentos),
+            dtype=bool,
+            count=len(documentos),
+        )
+        em_ambos = np.outer(
+            no_atual & no_anterior, documento_no_atual & documento_no_anterior
+        )
+
+        mudou = mask_atual ^ mask_anterior
+        return CasaDiff(
+            codigos=codigos,
+            documentos=documentos,
+            no_atual=no_atual,
+            no_anterior=no_anterior,
+            documento_no_atual=documento_no_atual,
+            documento_no_anterior=documento_no_anterior,
+            ganhou=mudou & mask_atual & em_ambos,
+            perdeu=mudou & mask_anterior & em_ambos,
+            inalterado=~mudou & em_ambos,
+        )
+
+    def export_per_casa_diff(self, file_path: str) -> str:
+        """
+        Grava a comparação por casa em uma planilha ao lado do gráfico.
+
+        Args:
+            file_path: Caminho do gráfico exportado
+
+        Returns:
+            str: Caminho da planilha gravada
+        """
+        diff = self.per_casa_diff()
+        excel_path = os.path.splitext(file_path)[0] + "_por_casa.xlsx"
+
+        workbook = Workbook(write_only=True)
+        write_sheet(workbook, diff.resumo_dataframe(), "Resumo por Documento")
+        write_sheet(workbook, diff.mudancas_dataframe(), "Mudanças por Casa")
+        write_sheet(
+            workbook,
+            diff.casas_um_periodo_dataframe(self.comparison_label),
+            "Casas em um Período",
+        )
+        write_sheet(
+            workbook,
+            diff.documentos_um_periodo_dataframe(self.comparison_label),
+            "Documentos em um Período",
+        )
+        workbook.save(excel_path)
+        return excel_path
+
+    def _count_documents(self, presence: PresenceMatrix) -> Dict[str, int]:
         """
-        Conta a quantidade de documentos marcados com 'X' para cada característica.
+        Conta a quantidade de casas que possuem cada documento.
 
         Args:
-            df: DataFrame com os dados do Gestão à Vista
+            presence: Matriz de presença do Gestão à Vista
 
         Returns:
             Dict[str, int]: Dicionário com as contagens de cada documento
         """
-        counts = {}
-        for col in df.columns[1:]:  # Ignora a primeira coluna (código)
-            count = df[col].fillna("").astype(str).str.upper().str.strip().eq("X").sum()
-            counts[col] = count
-        return counts
+        return AggregationService.aggregate(presence).por_documento
@@ -0,0 +1,131 @@
+import threading
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from gestao_vista.models.presence_matrix import PresenceMatrix
+from gestao_vista.services.aggregation_service import AggregationService
+from gestao_vista.services.observacao_service import ObservacaoService
+from gestao_vista.services.status_matrix_service import (
+    STATUS_COM_OBSERVACAO,
+    STATUS_PRESENTE,
+    StatusMatrix,
+    StatusMatrixService,
+)
+
+# Quantidade de tabelas de conformidade guardadas em memória
+MAX_CACHED_TABLES = 4
+
+
+class ComplianceTable:
+    """
+    Tabela de conformidade por casa, derivada da matriz de situação
+    (presença + observações) de um snapshot.
+
+    Para cada casa (na ordem da matriz) guarda quantos documentos
+    obrigatórios e opcionais estão presentes; os faltantes com observação
+    são lidos da matriz de situação, que o StatusMatrixService mantém
+    atualizada quando observações mudam.
+    """
+
+    def __init__(self, status_matrix: StatusMatrix, documentos: List[str]):
+        """
+        Calcula a tabela de forma vetorizada.
+
+        Args:
+            status_matrix: Matriz de situação do snapshot
+            documentos: Documentos considerados
+        """
+        agregados = AggregationService.aggregate(status_matrix.presence, documentos)
+        self.status_matrix = status_matrix
+        self.presence = status_matrix.presence
+        self.documentos = agregados.documentos
+        self.obrigatorios = agregados.obrigatorios
+        self.opcionais = agregados.opcionais
+
+        # A presença só muda com um novo snapshot
+        self.obrigatorios_presentes = status_matrix.count(
+            STATUS_PRESENTE, self.obrigatorios
+        )
+        self.opcionais_presentes = status_matrix.count(STATUS_PRESENTE, self.opcionais)
+
+    @property
+    def faltantes_com_observacao(self) -> np.ndarray:
+        """Documentos faltantes que já têm observação, por casa."""
+        return self.status_matrix.count(STATUS_COM_OBSERVACAO, self.documentos)
+
+    @property
+    def total_obrigatorios(self) -> int:
+        return len(self.obrigatorios)
+
+    @property
+    def total_opcionais(self) -> int:
+        return len(self.opcionais)
+
+    @property
+    def percentuais_obrigatorios(self) -> np.ndarray:
+        """Percentual de documentos obrigatórios presentes em cada casa."""
+        if not self.total_obrigatorios:
+            return np.zeros(len(self.obrigatorios_presentes), dtype=float)
+        return self.obrigatorios_presentes / self.total_obrigatorios * 100
+
+    @property
+    def percentuais_opcionais(self) -> np.ndarray:
+        """Percentual de documentos opcionais presentes em cada casa."""
+        if not self.total_opcionais:
+            return np.zeros(len(self.opcionais_presentes), dtype=float)
+        return self.opcionais_presentes / self.total_opcionais * 100
+
+    def row(self, codigo: str) -> Optional[int]:
+        """Retorna a linha da casa na tabela (None se não estiver no snapshot)."""
+        return self.presence.codigo_index.get(str(codigo).strip())
+
+
+# Tabelas por (repositório de observações, versão do snapshot, documentos)
+_tables: "OrderedDict[Tuple[int, int, Tuple[str, ...]], ComplianceTable]" = (
+    OrderedDict()
+)
+_tables_lock = threading.Lock()
+
+
+class ComplianceService:
+    """
+    Mantém as tabelas de conformidade por casa, uma por snapshot e seleção
+    de documentos, sobre as matrizes de situação do StatusMatrixService.
+    """
+
+    def __init__(self, observacao_service: Optional[ObservacaoService] = None):
+        self.status_matrix_service = StatusMatrixService(observacao_service)
+        self.observacao_service = self.status_matrix_service.observacao_service
+
+    def table(
+        self, presence: PresenceMatrix, documentos: Optional[List[str]] = None
+    ) -> ComplianceTable:
+        """
+        Retorna a tabela de conformidade do snapshot (calculada uma única vez).
+
+        Args:
+            presence: Matriz de presença do Gestão à Vista
+            documentos: Documentos considerados (None para todos)
+        """
+        documentos = list(presence.documentos if documentos is None else documentos)
+        key = (
+            id(self.observacao_service.repository),
+            presence.version,
+            tuple(documentos),
+        )
+
+        with _tables_lock:
+            table = _tables.get(key)
+            if table is not None:
+                _tables.move_to_end(key)
+                return table
+
+        table = ComplianceTable(self.status_matrix_service.matrix(presence), documentos)
+
+        with _tables_lock:
+            _tables[key] = table
+            while len(_tables) > MAX_CACHED_TABLES:
+                _tables.popitem(last=False)
+        return table
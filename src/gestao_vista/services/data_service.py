@@ -1,13 +1,29 @@
 import os
-import json
+import threading
+import numpy as np
 import pandas as pd
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from pathlib import Path
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 
 from gestao_vista.models.casa_oracao import CasaOracao
+from gestao_vista.models.presence_matrix import PresenceMatrix
+from gestao_vista.services.gestao_history import GestaoHistoryStore
+from gestao_vista.services.import_cache import ImportCache
+from gestao_vista.services.repository import (
+    open_casa_repository,
+    open_gestao_repository,
+)
+from gestao_vista.services.xlsx_stream_reader import GestaoSheet, read_gestao_sheet
 from gestao_vista.utils.constants import normalizar_nome_documento
+from gestao_vista.utils.excel_format import detect_excel_engine
+
+# Cache de objetos já carregados, compartilhado por todas as instâncias do processo.
+# Chave: (diretório de dados, nome do dado); valor: (fingerprint do arquivo, objeto)
+_cache: Dict[Tuple[str, str], Tuple[Any, Any]] = {}
+_cache_lock = threading.Lock()
+_MISSING = object()
 
 
 class DataService:
@@ -21,24 +37,102 @@ class DataService:
         self.data_dir = Path(data_dir)
         self.data_dir.mkdir(exist_ok=True)
 
-        self.gestao_file = self.data_dir / "gestao.json"
+        self.gestao_file = self.data_dir / "gestao.npz"
         self.casas_file = self.data_dir / "casas.json"
+        self.gestao_repository = open_gestao_repository(self.data_dir)
+        self.casas_repository = open_casa_repository(self.data_dir)
+        self.import_cache = ImportCache(self.data_dir / "import_cache")
+        self.history = GestaoHistoryStore(self.data_dir / "history")
 
         # Criar arquivos se não existirem
-        if not self.gestao_file.exists():
+        if not self.gestao_repository.exists():
             self.save_gestao(pd.DataFrame())
-        if not self.casas_file.exists():
+        if not self.casas_repository.exists():
             self.save_casas([])
 
+    def _cache_key(self, name: str) -> Tuple[str, str]:
+        return str(self.data_dir.resolve()), name
+
+    def _cache_get(self, name: str, repository) -> Any:
+        """
+        Retorna o objeto em cache se o arquivo não mudou desde que foi lido.
+
+        Args:
+            name: Nome do dado em cache
+            repository: Repositório que fornece o fingerprint do arquivo
+        """
+        fingerprint = repository.fingerprint()
+        if fingerprint is None:
+            return _MISSING
+        with _cache_lock:
+            entry = _cache.get(self._cache_key(name))
+        if entry is None or entry[0] != fingerprint:
+            return _MISSING
+        return entry[1]
+
+    def _cache_put(self, name: str, repository, value: Any):
+        """
+        Guarda o objeto no cache associado ao fingerprint atual do arquivo.
+
+        Args:
+            name: Nome do dado em cache
+            repository: Repositório que fornece o fingerprint do arquivo
+            value: Objeto carregado ou recém-gravado
+        """
+        fingerprint = repository.fingerprint()
+        with _cache_lock:
+            if fingerprint is None:
+                _cache.pop(self._cache_key(name), None)
+            else:
+                _cache[self._cache_key(name)] = (fingerprint, value)
+
+    def _cache_invalidate(self, name: str):
+        with _cache_lock:
+            _cache.pop(self._cache_key(name), None)
+
+    def load_presence(self) -> PresenceMatrix:
+        """Carrega a matriz de presença de documentos de gestão."""
+        try:
+            presence = self._cache_get("gestao", self.gestao_repository)
+            if presence is not _MISSING:
+                return presence
+
+            presence = self.gestao_repository.load()
+            if presence is None:
+                return PresenceMatrix.empty()
+            self._cache_put("gestao", self.gestao_repository, presence)
+            return presence
+        except Exception as e:
+            print(f"Erro ao carregar dados de gestão: {e}")
+            return PresenceMatrix.empty()
+
+    def save_presence(self, presence: PresenceMatrix) -> bool:
+        """
+        Salva a matriz de presença de documentos de gestão.
+
+        Args:
+            presence: Matriz de presença de documentos
+        """
+        try:
+            self.gestao_repository.save(presence)
+            self._cache_put("gestao", self.gestao_repository, presence)
+            self._cache_invalidate("gestao_df")
+            return True
+        except Exception as e:
+            print(f"Erro ao salvar dados de gestão: {e}")
+            return False
+
     def load_gestao(self) -> Optional[pd.DataFrame]:
         """Carrega os dados de gestão."""
         try:
-            if self.gestao_file.exists():
-                data = pd.read_json(self.gestao_file)
-                if data.empty:
-                    return pd.DataFrame(columns=["codigo"])
-                return data
-            return pd.DataFrame(columns=["codigo"])
+            data = self._cache_get("gestao_df", self.gestao_repository)
+            if data is _MISSING:
+                data = self.load_presence().to_dataframe()
+                self._cache_put("gestao_df", self.gestao_repository, data)
+            if data.empty:
+                return pd.DataFrame(columns=["codigo"])
+            # Cópia para que alterações do chamador não afetem o cache
+            return data.copy()
         except Exception as e:
             print(f"Erro ao carregar dados de gestão: {e}")
             return pd.DataFrame(columns=["codigo"])
@@ -54,8 +148,7 @@ class DataService:
             # Garantir que temos pelo menos a coluna código
             if df.empty and "codigo" not in df.columns:
                 df = pd.DataFrame(columns=["codigo"])
-            df.to_json(self.gestao_file)
-            return True
+            return self.save_presence(PresenceMatrix.from_dataframe(df))
         except Exception as e:
             print(f"Erro ao salvar dados de gestão: {e}")
             return False
@@ -63,16 +156,11 @@ class DataService:
     def load_casas(self) -> List[CasaOracao]:
         """Carrega as casas de oração."""
         try:
-            if self.casas_file.exists():
-                with open(self.casas_file, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                    if not isinstance(data, list):
-                        print(
-                            f"Erro: dados do arquivo não são uma lista, recebido {type(data)}"
-                        )
-                        return []
-                    return [CasaOracao.from_dict(casa) for casa in data]
-            return []
+            casas = self._cache_get("casas", self.casas_repository)
+            if casas is _MISSING:
+                casas = self.casas_repository.load()
+                self._cache_put("casas", self.casas_repository, casas)
+            return list(casas)
         except Exception as e:
             print(f"Erro ao carregar casas de oração: {str(e)}")
             return []
@@ -89,9 +177,8 @@ class DataService:
                 print(f"Erro: casas deve ser uma lista, recebido {type(casas)}")
                 return False
 
-            data = [casa.to_dict() for casa in casas]
-            with open(self.casas_file, "w", encoding="utf-8") as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            self.casas_repository.save(casas)
+            self._cache_put("casas", self.casas_repository, list(casas))
             return True
         except Exception as e:
             print(f"Erro ao salvar casas: {str(e)}")
@@ -100,8 +187,7 @@ class DataService:
     def clear_gestao(self) -> bool:
         """Limpa os dados de gestão."""
         try:
-            if self.gestao_file.exists():
-                self.gestao_file.unlink()
+            self.gestao_repository.delete()
             self.save_gestao(pd.DataFrame())
             return True
         except Exception as e:
@@ -111,8 +197,6 @@ class DataService:
     def clear_casas(self) -> bool:
         """Limpa os dados das casas de oração."""
         try:
-            if self.casas_file.exists():
-                self.casas_file.unlink()
             self.save_casas([])
             return True
         except Exception as e:
@@ -123,80 +207,55 @@ class DataService:
         self, file_path: str, header_row: Optional[int] = None
     ) -> pd.DataFrame:
         """
-        Lê um arquivo Excel de forma segura, tentando diferentes métodos.
+        Lê um arquivo Excel de forma segura, com o engine adequado ao formato.
+
+        O formato (.xlsx, .xls ou .ods) é detectado pelo conteúdo do arquivo,
+        então a leitura é feita uma única vez, já com o engine correto.
 
         Args:
             file_path: Caminho para o arquivo Excel
             header_row: Linha que contém os cabeçalhos (None para primeira linha)
         """
-        try:
-            # Primeiro, tentar com openpyxl (para .xlsx)
-            try:
-                return pd.read_excel(
-                    file_path,
-                    header=header_row,
-                    engine="openpyxl",
-                    dtype=str,
-                )
-            except Exception as e:
-                print(f"Erro ao tentar ler com openpyxl: {e}")
-                pass
-
-            # Se falhar, tentar com xlrd (para .xls)
-            try:
-                return pd.read_excel(
-                    file_path,
-                    header=header_row,
-                    engine="xlrd",
-                    dtype=str,
-                )
-            except Exception as e:
-                print(f"Erro ao tentar ler com xlrd: {e}")
-                pass
-
-            # Se ainda falhar, tentar com odf (para .ods)
-            try:
-                return pd.read_excel(
-                    file_path,
-                    header=header_row,
-                    engine="odf",
-                    dtype=str,
-                )
-            except Exception as e:
-                print(f"Erro ao tentar ler com odf: {e}")
-                pass
+        engine = detect_excel_engine(file_path)
 
-            # Se todas as tentativas falharem, tentar uma última vez com o engine padrão
+        try:
             return pd.read_excel(
                 file_path,
                 header=header_row,
+                engine=engine,
                 dtype=str,
             )
-
         except Exception as e:
-            print(f"Erro ao ler arquivo Excel: {e}")
+            print(f"Erro ao ler arquivo Excel com {engine}: {e}")
             raise ValueError(
                 "Não foi possível ler o arquivo Excel. "
                 "Certifique-se que o arquivo não está corrompido e está no formato correto (.xls ou .xlsx)"
             )
 
-    def import_gestao_from_excel(
+    def import_gestao_presence(
         self, file_path: str, should_save: bool = True
-    ) -> Optional[pd.DataFrame]:
+    ) -> Optional[PresenceMatrix]:
         """
-        Importa dados de gestão de um arquivo Excel.
+        Importa dados de gestão de um arquivo Excel como matriz de presença.
+
+        Planilhas já importadas são lidas do cache de importações.
 
         Args:
             file_path: Caminho para o arquivo Excel
-            should_save: Se True, salva os dados no arquivo gestao.json. Se False, apenas retorna o DataFrame.
+            should_save: Se True, salva os dados no snapshot de gestão. Se False, apenas retorna a matriz.
         """
         try:
-            df = self._import_gestao_from_excel_internal(file_path)
+            key = self.import_cache.key_for(file_path)
+            presence = self.import_cache.get(key)
+            if presence is None:
+                presence = self._import_gestao_from_excel_internal(file_path)
+                self.import_cache.put(key, presence)
 
-            if df is not None and should_save:
-                self.save_gestao(df)
+            if should_save:
+                self.save_presence(presence)
+                self._record_history(presence, file_path)
 
-            return df
+            return presence
         except Exception as e:
             print(f"Erro ao importar arquivo de gestão: {e}")
             messagebox.showerror(
@@ -206,85 +265,130 @@ class DataService:
             )
             return None
 
-    def _import_gestao_from_excel_internal(
-        self, file_path: str
+    def _record_history(self, presence: PresenceMatrix, file_path: str):
+        """
+        Registra a importação como um novo período no histórico.
+
+        Args:
+            presence: Matriz de presença importada
+            file_path: Arquivo de origem
+        """
+        try:
+            self.history.record(
+                presence, rotulo=Path(file_path).stem, arquivo=Path(file_path).name
+            )
+        except Exception as e:
+            print(f"Erro ao gravar histórico de gestão: {e}")
+
+    def import_gestao_from_excel(
+        self, file_path: str, should_save: bool = True
     ) -> Optional[pd.DataFrame]:
+        """
+        Importa dados de gestão de um arquivo Excel.
+
+        Args:
+            file_path: Caminho para o arquivo Excel
+            should_save: Se True, salva os dados no snapshot de gestão. Se False, apenas retorna o DataFrame.
+        """
+        presence = self.import_gestao_presence(file_path, should_save)
+        if presence is None:
+            return None
+        return presence.to_dataframe()
+
+    def _import_gestao_from_excel_internal(self, file_path: str) -> PresenceMatrix:
         """
         Função interna para importar dados de gestão de um arquivo Excel.
-        Esta função não salva os dados, apenas processa e retorna o DataFrame.
+        Esta função não salva os dados, apenas processa e retorna a matriz de presença.
+
+        Arquivos .xlsx são lidos em streaming (apenas códigos e flags de
+        presença); os demais formatos passam pelo pandas.
 
         Args:
             file_path: Caminho para o arquivo Excel
         """
         try:
-            # Ler o arquivo Excel
-            df = self._read_excel_safe(file_path, header_row=14)
-
-            # Validar se o DataFrame foi carregado corretamente
-            if df is None or df.empty:
-                raise ValueError("Arquivo Excel está vazio ou com formato inválido")
-
-            # Limpar e preparar o DataFrame
-            # Remover colunas vazias ou sem nome
-            df = df.loc[:, ~df.columns.str.contains("^Unnamed")]
-            df = df.dropna(axis=1, how="all")
-
-            # Remover linhas completamente vazias
-            df = df.dropna(how="all")
-
-            # Validar se temos pelo menos uma coluna
-            if df.empty or len(df.columns) == 0:
-                raise ValueError("Nenhuma coluna válida encontrada no arquivo")
-
-            # Garantir que a primeira coluna seja o código
-            if "codigo" not in str(df.columns[0]).lower():
-                df = df.rename(columns={df.columns[0]: "codigo"})
-
-            # Normalizar nomes das colunas usando o dicionário DOCUMENTOS
-            colunas_normalizadas = {}
-            colunas_para_remover = []
-
-            # Primeiro passo: normalizar todas as colunas
-            for col in df.columns:
-                if col.lower() != "codigo":  # Não normalizar a coluna código
-                    try:
-                        nome_normalizado = normalizar_nome_documento(col)
-
-                        if nome_normalizado in colunas_normalizadas:
-                            # Se já existe uma coluna com esse nome normalizado,
-                            # combinar os valores (X em qualquer uma das colunas = X)
-                            df[colunas_normalizadas[nome_normalizado]] = (
-                                df[colunas_normalizadas[nome_normalizado]]
-                                .fillna("")
-                                .str.upper()
-                                .str.strip()
-                                .combine(
-                                    df[col].fillna("").str.upper().str.strip(),
-                                    lambda x, y: "X" if "X" in [x, y] else "",
-                                )
-                            )
-                            colunas_para_remover.append(col)
-                        else:
-                            colunas_normalizadas[nome_normalizado] = nome_normalizado
-                            if col != nome_normalizado:
-                                df = df.rename(columns={col: nome_normalizado})
-                    except Exception as e:
-                        print(f"Erro ao normalizar coluna {col}: {e}")
-                        continue
+            sheet = None
+            if detect_excel_engine(file_path) == "openpyxl":
+                sheet = read_gestao_sheet(file_path, header_row=14)
 
-            # Remover colunas duplicadas
-            if colunas_para_remover:
-                df = df.drop(columns=colunas_para_remover)
+            if sheet is None:
+                df = self._read_excel_safe(file_path, header_row=14)
+                if df is None or df.empty:
+                    raise ValueError("Arquivo Excel está vazio ou com formato inválido")
+                sheet = GestaoSheet.from_dataframe(df)
 
-            # Converter todos os valores para string e limpar
-            for col in df.columns:
-                df[col] = df[col].astype(str).str.strip()
-
-            return df
+            return self._normalize_gestao_sheet(sheet)
         except Exception as e:
             print(f"Erro ao importar arquivo de gestão: {e}")
             raise
 
+    def _normalize_gestao_sheet(self, sheet: GestaoSheet) -> PresenceMatrix:
+        """
+        Limpa e normaliza a planilha bruta de gestão.
+
+        Args:
+            sheet: Conteúdo bruto da planilha
+        """
+        # Validar se a planilha foi carregada corretamente
+        if not sheet.headers or len(sheet.codigos) == 0:
+            raise ValueError("Arquivo Excel está vazio ou com formato inválido")
+
+        # Remover colunas sem nome ou completamente vazias
+        colunas = [
+            idx
+            for idx, header in enumerate(sheet.headers)
+            if header is not None and sheet.preenchidas[:, idx].any()
+        ]
+
+        # Validar se temos pelo menos uma coluna
+        if not colunas:
+            raise ValueError("Nenhuma coluna válida encontrada no arquivo")
+        if colunas[0] != sheet.codigo_column:
+            raise ValueError("Coluna de código não encontrada no arquivo")
+
+        # Remover linhas completamente vazias
+        linhas = sheet.preenchidas[:, colunas].any(axis=1)
+        codigos = [
+            codigo.strip()
+            for codigo, manter in zip(sheet.codigos, linhas.tolist())
+            if manter
+        ]
+
+        # Garantir que a primeira coluna seja o código
+        coluna_codigo = sheet.headers[colunas[0]]
+        if "codigo" not in coluna_codigo.lower():
+            coluna_codigo = "codigo"
+
+        # Normalizar nomes das colunas usando o dicionário DOCUMENTOS
+        documentos: List[str] = []
+        grupos: List[int] = []
+        for idx in colunas[1:]:
+            header = sheet.headers[idx]
+            try:
+                nome_normalizado = normalizar_nome_documento(header)
+            except Exception as e:
+                print(f"Erro ao normalizar coluna {header}: {e}")
+                nome_normalizado = header
+
+            if nome_normalizado not in documentos:
+                documentos.append(nome_normalizado)
+            grupos.append(documentos.index(nome_normalizado))
+
+        # Colunas com o mesmo nome normalizado são combinadas (X em qualquer
+        # uma das colunas = X) em uma única redução: as colunas são ordenadas
+        # por documento e cada grupo contíguo é reduzido com OR
+        if documentos:
+            grupos_array = np.asarray(grupos)
+            ordem = np.argsort(grupos_array, kind="stable")
+            origem = np.asarray(colunas[1:])[ordem]
+            inicios = np.flatnonzero(np.r_[True, np.diff(grupos_array[ordem]) != 0])
+            mask = np.logical_or.reduceat(
+                sheet.presenca[np.ix_(linhas, origem)], inicios, axis=1
+            )
+        else:
+            mask = np.zeros((len(codigos), 0), dtype=bool)
+        return PresenceMatrix.from_mask(codigos, documentos, mask, coluna_codigo)
+
     def import_casas_from_excel(self, file_path: str) -> List[CasaOracao]:
         """
         Importa casas de oração de um arquivo Excel.
@@ -303,7 +407,9 @@ class DataService:
             # Ler o arquivo Excel
             try:
                 print(f"Tentando ler arquivo: {file_path}")
-                df = pd.read_excel(file_path, dtype=str)
+                df = pd.read_excel(
+                    file_path, engine=detect_excel_engine(file_path), dtype=str
+                )
                 print(
                     f"Arquivo lido com sucesso. Colunas encontradas: {df.columns.tolist()}"
                 )
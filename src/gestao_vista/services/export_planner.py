@@ -0,0 +1,294 @@
+import os
+import struct
+import zlib
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from gestao_vista.utils.constants import EXPORT_MEMORY_BUDGET_MB
+
+# Bytes por pixel durante a rasterização de uma faixa: buffers RGBA e alfa do
+# Agg, cópia RGB e linhas filtradas do PNG (array e bytes)
+BYTES_PER_PIXEL = 14
+
+# Bytes por pixel da imagem final montada em memória, usada quando o formato
+# não pode ser gravado em faixas (JPEG); o PIL guarda RGB com 4 bytes por pixel
+BYTES_PER_PIXEL_IMAGEM = 4
+
+# Formatos gravados em faixas, montados inteiros em memória ou vetoriais
+FORMATOS_EM_FAIXAS = {"png"}
+FORMATOS_VETORIAIS = {"pdf"}
+
+# Linhas mínimas de uma faixa nos formatos montados em memória: a imagem
+# inteira ocupa quase todo o orçamento e cada faixa redesenha a figura, então
+# o DPI é reduzido até sobrar espaço para faixas desta altura
+MIN_LINHAS_POR_FAIXA = 32
+
+# Total máximo de pixels das imagens exportadas: o limite padrão do PIL
+# (Image.MAX_IMAGE_PIXELS), acima do qual abrir a imagem gera
+# DecompressionBombWarning
+MAX_PIXELS_IMAGEM = 89_478_485
+
+# Tamanho máximo dos blocos IDAT do PNG
+PNG_CHUNK_SIZE = 1 << 16
+
+# Nível de compressão do PNG (3 comprime quase tanto quanto 6 na grade de
+# cores chapadas, em menos da metade do tempo)
+PNG_COMPRESSION_LEVEL = 3
+
+
+@dataclass
+class ExportPlan:
+    """
+    Plano de exportação de uma grade (linhas de altura fixa sob um cabeçalho).
+
+    Attributes:
+        formato: Formato do arquivo (png, jpg, pdf)
+        dpi: DPI efetivo (a linha da grade tem uma quantidade inteira de pixels)
+        pixels_por_unidade: Pixels de uma unidade da grade
+        largura_px: Largura da imagem em pixels
+        altura_px: Altura da imagem em pixels
+        faixas: Intervalos de linhas [inicio, fim) renderizados de cada vez
+        pico_bytes: Estimativa da memória máxima usada na rasterização
+    """
+
+    formato: str
+    dpi: float
+    pixels_por_unidade: int
+    largura_px: int
+    altura_px: int
+    faixas: List[Tuple[int, int]]
+    pico_bytes: int
+
+    @property
+    def vetorial(self) -> bool:
+        return self.formato in FORMATOS_VETORIAIS
+
+
+class ExportPlanner:
+    """
+    Escolhe DPI e divisão em faixas para exportar uma grade dentro de um
+    orçamento de memória.
+
+    A grade é descrita em unidades (uma unidade = altura de uma linha): um
+    topo fixo (margem e cabeçalho), n_linhas linhas e uma base fixa (margem).
+    PNG é rasterizado em faixas horizontais gravadas uma a uma, então a
+    memória depende da largura e não da quantidade de linhas; JPEG precisa da
+    imagem inteira e por isso tem o DPI reduzido até caber; PDF é vetorial.
+    No JPEG o DPI é reduzido até que as faixas tenham pelo menos
+    MIN_LINHAS_POR_FAIXA linhas (ou a grade inteira), e não apenas uma.
+    Em todos os formatos raster a imagem fica com no máximo
+    MAX_PIXELS_IMAGEM pixels.
+    """
+
+    def __init__(self, orcamento_mb: Optional[int] = None):
+        """
+        Inicializa o planejador.
+
+        Args:
+            orcamento_mb: Memória máxima para rasterização (None para
+                EXPORT_MEMORY_BUDGET_MB)
+        """
+        orcamento_mb = EXPORT_MEMORY_BUDGET_MB if orcamento_mb is None else orcamento_mb
+        self.orcamento = max(1, int(orcamento_mb)) * 1024 * 1024
+
+    def plan(
+        self,
+        largura: float,
+        topo: float,
+        n_linhas: int,
+        base: float,
+        unidade_pol: float,
+        dpi: float = 300,
+        formato: str = "png",
+    ) -> ExportPlan:
+        """
+        Monta o plano de exportação.
+
+        Args:
+            largura: Largura da grade, em unidades
+            topo: Altura do topo fixo (margem + cabeçalho), em unidades inteiras
+            n_linhas: Quantidade de linhas
+            base: Altura da base fixa (margem), em unidades
+            unidade_pol: Tamanho da unidade em polegadas
+            dpi: DPI desejado
+            formato: Formato do arquivo (png, jpg, pdf)
+        """
+        formato = formato.lower().replace("jpeg", "jpg")
+        if formato in FORMATOS_VETORIAIS:
+            return ExportPlan(
+                formato=formato,
+                dpi=dpi,
+                pixels_por_unidade=0,
+                largura_px=0,
+                altura_px=0,
+                faixas=[(0, n_linhas)],
+                pico_bytes=0,
+            )
+
+        pixels = max(1, round(unidade_pol * dpi))
+        minimo = (
+            1
+            if formato in FORMATOS_EM_FAIXAS
+            else max(1, min(MIN_LINHAS_POR_FAIXA, n_linhas))
+        )
+        while True:
+            largura_px = round(largura * pixels)
+            altura_px = round((topo + n_linhas + base) * pixels)
+            bytes_linha = largura_px * pixels * BYTES_PER_PIXEL
+            bytes_fixos = round((topo + base) * pixels) * largura_px * BYTES_PER_PIXEL
+
+            if formato in FORMATOS_EM_FAIXAS:
+                # Cabeçalho e pelo menos uma linha precisam caber numa faixa
+                disponivel = self.orcamento - bytes_fixos
+                linhas_por_faixa = disponivel // bytes_linha if bytes_linha else 0
+                imagem = 0
+            else:
+                # A imagem inteira fica em memória e as faixas usam o restante
+                imagem = largura_px * altura_px * BYTES_PER_PIXEL_IMAGEM
+                disponivel = self.orcamento - imagem - bytes_fixos
+                linhas_por_faixa = disponivel // bytes_linha if bytes_linha else 0
+
+            total_pixels = largura_px * altura_px
+            if (
+                linhas_por_faixa >= minimo and total_pixels <= MAX_PIXELS_IMAGEM
+            ) or pixels == 1:
+                break
+            # Não cabe: reduzir a resolução proporcionalmente ao excesso
+            necessario = max(
+                (imagem + bytes_fixos + minimo * bytes_linha) / self.orcamento,
+                total_pixels / MAX_PIXELS_IMAGEM,
+            )
+            pixels = max(1, min(pixels - 1, int(pixels / np.sqrt(necessario))))
+
+        linhas_por_faixa = max(1, int(linhas_por_faixa))
+        faixas = [
+            (inicio, min(inicio + linhas_por_faixa, n_linhas))
+            for inicio in range(0, max(n_linhas, 1), linhas_por_faixa)
+        ]
+        maior_faixa = max(fim - inicio for inicio, fim in faixas)
+        return ExportPlan(
+            formato=formato,
+            dpi=pixels / unidade_pol,
+            pixels_por_unidade=pixels,
+            largura_px=largura_px,
+            altura_px=altura_px,
+            faixas=faixas,
+            pico_bytes=imagem + bytes_fixos + maior_faixa * bytes_linha,
+        )
+
+
+class PngStreamWriter:
+    """
+    Grava um PNG RGB de 8 bits recebendo as linhas em blocos.
+
+    Cada bloco é filtrado e comprimido com zlib à medida que chega, e os
+    dados são gravados em blocos IDAT, sem manter a imagem inteira em memória.
+    A imagem é gravada em um arquivo temporário que só substitui o destino
+    quando está completa; se a gravação falhar, o temporário é removido.
+    """
+
+    def __init__(self, file_path: str, largura: int, altura: int, dpi: float):
+        """
+        Abre o arquivo e grava o cabeçalho.
+
+        Args:
+            file_path: Caminho do arquivo
+            largura: Largura da imagem em pixels
+            altura: Altura da imagem em pixels
+            dpi: Resolução gravada no bloco pHYs
+        """
+        self.file_path = file_path
+        self.largura = largura
+        self.altura = altura
+        self._linhas = 0
+        self._compressor = zlib.compressobj(PNG_COMPRESSION_LEVEL)
+        self._pendente = bytearray()
+        self._tmp_path = f"{file_path}.tmp"
+        self._file = open(self._tmp_path, "wb")
+        try:
+            self._file.write(b"\x89PNG\r\n\x1a\n")
+            self._chunk(
+                b"IHDR", struct.pack(">IIBBBBB", largura, altura, 8, 2, 0, 0, 0)
+            )
+            pixels_por_metro = round(dpi / 0.0254)
+            self._chunk(
+                b"pHYs", struct.pack(">IIB", pixels_por_metro, pixels_por_metro, 1)
+            )
+        except Exception:
+            self._discard()
+            raise
+
+    def write(self, linhas: np.ndarray):
+        """
+        Acrescenta linhas à imagem.
+
+        Args:
+            linhas: Array uint8 (altura x largura x 3)
+        """
+        if linhas.shape[1:] != (self.largura, 3):
+            raise ValueError(
+                f"Faixa com formato {linhas.shape[1:]}, esperado ({self.largura}, 3)"
+            )
+        if self._linhas + len(linhas) > self.altura:
+            raise ValueError("Mais linhas do que a altura da imagem")
+
+        # Filtro 0 (None) no início de cada linha
+        filtradas = np.empty((len(linhas), self.largura * 3 + 1), dtype=np.uint8)
+        filtradas[:, 0] = 0
+        filtradas[:, 1:] = linhas.reshape(len(linhas), -1)
+        self._pendente += self._compressor.compress(filtradas.tobytes())
+        self._linhas += len(linhas)
+        self._flush(final=False)
+
+    def close(self):
+        """Finaliza a compressão e move a imagem completa para o destino."""
+        if self._file.closed:
+            return
+        try:
+            if self._linhas != self.altura:
+                raise ValueError(
+                    f"Imagem incompleta: {self._linhas} de {self.altura} linhas"
+                )
+            self._pendente += self._compressor.flush()
+            self._flush(final=True)
+            self._chunk(b"IEND", b"")
+            self._file.close()
+            os.replace(self._tmp_path, self.file_path)
+        except Exception:
+            self._discard()
+            raise
+
+    def _discard(self):
+        """Fecha e remove o arquivo temporário de uma gravação interrompida."""
+        self._file.close()
+        if os.path.exists(self._tmp_path):
+            os.unlink(self._tmp_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self._discard()
+
+    def _flush(self, final: bool):
+        """Grava os dados comprimidos pendentes em blocos IDAT."""
+        inicio = 0
+        restante = len(self._pendente)
+        while restante >= PNG_CHUNK_SIZE or (final and restante):
+            tamanho = min(PNG_CHUNK_SIZE, restante)
+            self._chunk(b"IDAT", bytes(self._pendente[inicio : inicio + tamanho]))
+            inicio += tamanho
+            restante -= tamanho
+        del self._pendente[:inicio]
+
+    def _chunk(self, tipo: bytes, dados: bytes):
+        """Grava um bloco do PNG (tamanho, tipo, dados e CRC)."""
+        self._file.write(struct.pack(">I", len(dados)))
+        self._file.write(tipo)
+        self._file.write(dados)
+        self._file.write(struct.pack(">I", zlib.crc32(tipo + dados) & 0xFFFFFFFF))
@@ -0,0 +1,259 @@
+import json
+import os
+import tempfile
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from gestao_vista.models.presence_matrix import PresenceMatrix
+from gestao_vista.services.gestao_snapshot import GestaoSnapshotStore
+
+# Versão do formato dos arquivos de delta
+DELTA_FORMAT_VERSION = 1
+
+# A cada quantos períodos um snapshot completo (keyframe) é gravado
+KEYFRAME_INTERVAL = 12
+
+
+def _derived_order(previous: PresenceMatrix, removidos: set, adicionados: List[str]):
+    """Ordem das casas implícita no delta: as mantidas e depois as novas."""
+    return [c for c in previous.codigos if c not in removidos] + adicionados
+
+
+class GestaoHistoryStore:
+    """
+    Histórico dos períodos importados do Gestão à Vista (data/history).
+
+    Cada período é gravado como delta em relação ao anterior: casas
+    removidas, casas adicionadas e as posições dos bits de presença que
+    mudaram (no layout do novo período). A cada KEYFRAME_INTERVAL períodos,
+    ou quando o delta ficaria maior que o snapshot, é gravado um snapshot
+    completo, de modo que reconstruir um período aplica no máximo alguns
+    deltas a partir do keyframe mais próximo.
+
+    O índice dos períodos fica em history.json.
+    """
+
+    def __init__(self, history_dir: Path, keyframe_interval: int = KEYFRAME_INTERVAL):
+        """
+        Inicializa o histórico.
+
+        Args:
+            history_dir: Diretório do histórico
+            keyframe_interval: Intervalo (em períodos) entre snapshots completos
+        """
+        self.history_dir = Path(history_dir)
+        self.index_file = self.history_dir / "history.json"
+        self.keyframe_interval = keyframe_interval
+        self._lock = threading.RLock()
+        # Último período reconstruído (id, matriz), reaproveitado no próximo delta
+        self._ultimo: Optional[Tuple[int, PresenceMatrix]] = None
+
+    def periods(self) -> List[dict]:
+        """
+        Retorna os períodos gravados, do mais antigo para o mais recente.
+
+        Cada período tem id, rotulo, arquivo, importado_em e tipo
+        ("keyframe" ou "delta").
+        """
+        with self._lock:
+            if not self.index_file.exists():
+                return []
+            with open(self.index_file, "r", encoding="utf-8") as f:
+                return json.load(f)
+
+    def record(
+        self, presence: PresenceMatrix, rotulo: str, arquivo: str = ""
+    ) -> Optional[dict]:
+        """
+        Grava um novo período no histórico.
+
+        Se a matriz for igual à do último período, nada é gravado.
+
+        Args:
+            presence: Matriz de presença importada
+            rotulo: Rótulo do período (ex.: nome do arquivo)
+            arquivo: Arquivo de origem
+
+        Returns:
+            dict: Metadados do período gravado, ou None se não houve mudança
+        """
+        with self._lock:
+            periods = self.periods()
+            period_id = periods[-1]["id"] + 1 if periods else 1
+            previous = self.load(periods[-1]["id"]) if periods else None
+
+            tipo = "keyframe"
+            arrays = None
+            if previous is not None:
+                arrays = self._delta(previous, presence)
+                if arrays is None:
+                    return None
+                since_keyframe = 0
+                for period in reversed(periods):
+                    if period["tipo"] == "keyframe":
+                        break
+                    since_keyframe += 1
+                delta_size = sum(a.nbytes for a in arrays.values())
+                if (
+                    since_keyframe + 1 < self.keyframe_interval
+                    and delta_size < presence.bits.nbytes
+                ):
+                    tipo = "delta"
+
+            file_name = f"{period_id:06d}.{'delta' if tipo == 'delta' else 'snap'}.npz"
+            if tipo == "delta":
+                self._write_npz(self.history_dir / file_name, arrays)
+            else:
+                GestaoSnapshotStore(self.history_dir / file_name).save(presence)
+
+            period = {
+                "id": period_id,
+                "rotulo": rotulo,
+                "arquivo": arquivo,
+                "importado_em": datetime.now().isoformat(timespec="seconds"),
+                "tipo": tipo,
+                "file": file_name,
+            }
+            self._write_index(periods + [period])
+            self._ultimo = (period_id, presence)
+            return period
+
+    def load(self, period_id: int) -> PresenceMatrix:
+        """
+        Reconstrói a matriz de um período.
+
+        Args:
+            period_id: Id do período
+        """
+        with self._lock:
+            if self._ultimo is not None and self._ultimo[0] == period_id:
+                return self._ultimo[1]
+
+            periods = self.periods()
+            posicao = next(
+                (i for i, p in enumerate(periods) if p["id"] == period_id), None
+            )
+            if posicao is None:
+                raise KeyError(f"Período não encontrado no histórico: {period_id}")
+
+            inicio = posicao
+            while periods[inicio]["tipo"] != "keyframe":
+                inicio -= 1
+
+            presence = None
+            for period in periods[inicio : posicao + 1]:
+                presence = self._apply(presence, period)
+            return presence
+
+    def iter_presences(self) -> Iterator[Tuple[dict, PresenceMatrix]]:
+        """Percorre todos os períodos em ordem, aplicando cada delta uma vez."""
+        presence = None
+        for period in self.periods():
+            presence = self._apply(presence, period)
+            yield period, presence
+
+    def clear(self):
+        """Remove todo o histórico."""
+        with self._lock:
+            for period in self.periods():
+                (self.history_dir / period["file"]).unlink(missing_ok=True)
+            self.index_file.unlink(missing_ok=True)
+            self._ultimo = None
+
+    def _apply(
+        self, previous: Optional[PresenceMatrix], period: dict
+    ) -> PresenceMatrix:
+        """Carrega um keyframe ou aplica um delta sobre o período anterior."""
+        entry_file = self.history_dir / period["file"]
+        if period["tipo"] == "keyframe":
+            return GestaoSnapshotStore(entry_file).load()
+
+        with np.load(entry_file, allow_pickle=False) as data:
+            formato = int(data["formato"])
+            if formato != DELTA_FORMAT_VERSION:
+                raise ValueError(f"Formato de delta não suportado: {formato}")
+            documentos = data["documentos"].tolist()
+            removidos = set(data["codigos_removidos"].tolist())
+            adicionados = data["codigos_adicionados"].tolist()
+            ordem = data["ordem"].tolist() if "ordem" in data.files else None
+            trocas = data["trocas"]
+            coluna_codigo = str(data["coluna_codigo"])
+
+        codigos = (
+            ordem
+            if ordem is not None
+            else _derived_order(previous, removidos, adicionados)
+        )
+        mask = previous.align(codigos, documentos)
+        mask.reshape(-1)[trocas] ^= True
+        return PresenceMatrix.from_mask(codigos, documentos, mask, coluna_codigo)
+
+    @staticmethod
+    def _delta(previous: PresenceMatrix, presence: PresenceMatrix) -> Optional[dict]:
+        """Calcula os arrays do delta (None se não houver nenhuma mudança)."""
+        codigos = presence.codigos
+        documentos = presence.documentos
+        anteriores = set(previous.codigos)
+        atuais = set(codigos)
+        removidos = sorted(anteriores - atuais)
+        adicionados = [c for c in codigos if c not in anteriores]
+
+        mask = presence.to_mask()
+        trocas = np.flatnonzero(
+            (mask ^ previous.align(codigos, documentos)).reshape(-1)
+        )
+
+        if (
+            not len(trocas)
+            and codigos == previous.codigos
+            and documentos == previous.documentos
+            and presence.coluna_codigo == previous.coluna_codigo
+        ):
+            return None
+
+        arrays = {
+            "formato": np.array(DELTA_FORMAT_VERSION),
+            "coluna_codigo": np.array(presence.coluna_codigo),
+            "documentos": np.array(documentos, dtype=str),
+            "codigos_removidos": np.array(removidos, dtype=str),
+            "codigos_adicionados": np.array(adicionados, dtype=str),
+            "trocas": trocas.astype(np.int64),
+        }
+        # A ordem completa só é gravada se não puder ser deduzida do delta
+        if _derived_order(previous, set(removidos), adicionados) != codigos:
+            arrays["ordem"] = np.array(codigos, dtype=str)
+        return arrays
+
+    def _write_npz(self, path: Path, arrays: dict):
+        """Grava os arrays comprimidos de forma atômica."""
+        self.history_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(
+            dir=self.history_dir, prefix=".history-", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez_compressed(f, **arrays)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+    def _write_index(self, periods: List[dict]):
+        """Grava o índice dos períodos de forma atômica."""
+        self.history_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(
+            dir=self.history_dir, prefix=".history-", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(periods, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.index_file)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
@@ -0,0 +1,122 @@
+import os
+import tempfile
+from pathlib import Path
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from gestao_vista.models.presence_matrix import PresenceMatrix
+from gestao_vista.services.repository import GestaoRepository, file_fingerprint
+
+# Versão do formato binário gravado em disco
+SNAPSHOT_FORMAT_VERSION = 2
+
+
+class GestaoSnapshotStore(GestaoRepository):
+    """
+    Armazena os dados de Gestão à Vista em um snapshot binário colunar (NPZ).
+
+    O snapshot guarda apenas o que a aplicação usa: a matriz de presença de
+    documentos com bits empacotados, o índice de códigos e os nomes das
+    colunas. Carregar o arquivo é uma leitura direta de arrays,
+    sem reinterpretar strings "X"/"nan" a cada inicialização.
+    """
+
+    def __init__(self, snapshot_file: Path):
+        """
+        Inicializa o armazenamento de snapshots.
+
+        Args:
+            snapshot_file: Caminho do arquivo .npz do snapshot
+        """
+        self.snapshot_file = Path(snapshot_file)
+
+    def exists(self) -> bool:
+        """Indica se já existe um snapshot gravado."""
+        return self.snapshot_file.exists()
+
+    def save(self, presence: PresenceMatrix) -> None:
+        """
+        Grava a matriz de presença como snapshot binário.
+
+        Args:
+            presence: Matriz de presença de documentos
+        """
+        self._write(
+            formato=np.array(SNAPSHOT_FORMAT_VERSION),
+            coluna_codigo=np.array(presence.coluna_codigo),
+            codigos=np.array(presence.codigos, dtype=str),
+            documentos=np.array(presence.documentos, dtype=str),
+            bits=presence.bits,
+        )
+
+    def load(self) -> Optional[PresenceMatrix]:
+        """
+        Carrega o snapshot como matriz de presença.
+
+        Returns:
+            PresenceMatrix com os dados de gestão ou None se o snapshot não existir
+        """
+        if not self.exists():
+            return None
+
+        with np.load(self.snapshot_file, allow_pickle=False) as data:
+            formato = int(data["formato"])
+            coluna_codigo = str(data["coluna_codigo"])
+            codigos = data["codigos"].tolist()
+            documentos = data["documentos"].tolist()
+
+            if formato == 1:
+                # Formato 1 guardava a matriz booleana sem empacotar
+                return PresenceMatrix.from_mask(
+                    codigos, documentos, data["presenca"], coluna_codigo
+                )
+            if formato != SNAPSHOT_FORMAT_VERSION:
+                raise ValueError(f"Formato de snapshot não suportado: {formato}")
+            return PresenceMatrix(codigos, documentos, data["bits"], coluna_codigo)
+
+    def migrate_from_json(self, json_file: Path) -> bool:
+        """
+        Migra (uma única vez) o antigo gestao.json para o snapshot binário.
+
+        O arquivo JSON original é mantido com a extensão .bak.
+
+        Args:
+            json_file: Caminho do arquivo gestao.json legado
+
+        Returns:
+            bool: True se a migração foi realizada
+        """
+        json_file = Path(json_file)
+        if self.exists() or not json_file.exists():
+            return False
+
+        # dtype=False evita que códigos numéricos sejam convertidos para int
+        df = pd.read_json(json_file, dtype=False)
+        self.save(PresenceMatrix.from_dataframe(df))
+        json_file.replace(json_file.with_name(json_file.name + ".bak"))
+        return True
+
+    def delete(self) -> None:
+        """Remove o snapshot do disco."""
+        if self.exists():
+            self.snapshot_file.unlink()
+
+    def fingerprint(self) -> Optional[Tuple[int, int]]:
+        return file_fingerprint(self.snapshot_file)
+
+    def _write(self, **arrays: np.ndarray) -> None:
+        """Grava os arrays de forma atômica (arquivo temporário + replace)."""
+        self.snapshot_file.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(
+            dir=self.snapshot_file.parent, prefix=".gestao-", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez(f, **arrays)
+            os.replace(tmp_path, self.snapshot_file)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
@@ -1,123 +1,161 @@
-import matplotlib.pyplot as plt
-import numpy as np
 import tkinter as tk
 from tkinter import ttk, messagebox
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from matplotlib.container import BarContainer
+from matplotlib.figure import Figure
 import pandas as pd
+from typing import Optional
 
+from gestao_vista.models.presence_matrix import PresenceMatrix
+from gestao_vista.services.aggregation_service import AggregationService
 from gestao_vista.utils.design_system import DESIGN_SYSTEM
-from gestao_vista.utils.constants import is_documento_obrigatorio
 from gestao_vista.ui.components import create_button
 
 
 class GraphService:
-    @staticmethod
+    """
+    Gráfico de barras dos documentos, mantido como um widget persistente.
+
+    A Figure e o canvas são criados uma única vez por frame; cada atualização
+    apenas altera as alturas, cores e rótulos das barras existentes (o
+    BarContainer só é recriado quando muda a quantidade de documentos) e
+    redesenha com draw_idle. A Figure não é registrada no pyplot, então a
+    memória não cresce com a quantidade de atualizações.
+    """
+
+    def __init__(self):
+        self.graph_frame: Optional[ttk.Frame] = None
+        self.fig: Optional[Figure] = None
+        self.ax = None
+        self.canvas: Optional[FigureCanvasTkAgg] = None
+        self.bars: Optional[BarContainer] = None
+        self.labels: list = []
+        self._chart_frame: Optional[ttk.Frame] = None
+        self._empty_label: Optional[ttk.Label] = None
+
     def plot_graph(
+        self,
         graph_frame: ttk.Frame,
         df_gestao: pd.DataFrame,
         caracteristicas: list,
         total_casas: int,
+        presence: Optional[PresenceMatrix] = None,
     ):
         """Plota o gráfico com os dados atuais"""
-        if df_gestao is None or df_gestao.empty or not caracteristicas:
-            # Limpar frame do gráfico
-            for widget in graph_frame.winfo_children():
-                widget.destroy()
+        self._ensure_widget(graph_frame)
 
+        if df_gestao is None or df_gestao.empty or not caracteristicas:
             # Mostrar mensagem quando não há dados
-            ttk.Label(
-                graph_frame,
-                text="Nenhum dado disponível.\nImporte um arquivo de Gestão à Vista para visualizar o gráfico.",
-                style="SubHeader.TLabel",
-                justify=tk.CENTER,
-            ).pack(expand=True)
+            self._chart_frame.pack_forget()
+            self._empty_label.pack(expand=True)
             return
 
-        # Limpar frame do gráfico
+        self._empty_label.pack_forget()
+        self._chart_frame.pack(fill=tk.BOTH, expand=True)
+
+        # Contagens, percentuais e ordenação calculados uma única vez por snapshot
+        if presence is None:
+            presence = PresenceMatrix.from_dataframe(df_gestao)
+        agregados = AggregationService.aggregate(presence, caracteristicas)
+        obrigatorios = set(agregados.obrigatorios)
+
+        # Obrigatórios à esquerda e opcionais à direita, cada grupo ordenado
+        # por contagem (maior para menor)
+        ordem = agregados.ordem_grafico
+        todas_caracteristicas = [agregados.documentos[i] for i in ordem]
+        todas_contagens = agregados.contagens[ordem].tolist()
+        todos_percentuais = agregados.percentuais[ordem].tolist()
+        todas_cores = [
+            (
+                DESIGN_SYSTEM["colors"]["error"]
+                if caracteristica in obrigatorios
+                else DESIGN_SYSTEM["colors"]["primary"]
+            )
+            for caracteristica in todas_caracteristicas
+        ]
+
+        self._update_bars(todas_contagens, todas_cores)
+
+        # Configurar eixo x
+        self.ax.set_xticks(range(len(todas_caracteristicas)))
+        self.ax.set_xticklabels(
+            todas_caracteristicas,
+            rotation=45,
+            ha="right",
+            fontsize=10,
+            color=DESIGN_SYSTEM["colors"]["text"]["secondary"],
+        )
+
+        # Atualizar valores e porcentagens sobre as barras
+        for bar, label, percentage in zip(self.bars, self.labels, todos_percentuais):
+            height = bar.get_height()
+            label.set_position((bar.get_x() + bar.get_width() / 2.0, height))
+            label.set_text(f"{int(height)}\n({percentage:.1f}%)")
+
+        # Reajustar limites e layout ao novo conteúdo
+        self.ax.relim()
+        self.ax.autoscale_view()
+        self.fig.tight_layout()
+        self.canvas.draw_idle()
+
+    def clear(self):
+        """Remove o gráfico e libera a Figure"""
+        if self.graph_frame is not None:
+            for widget in self.graph_frame.winfo_children():
+                widget.destroy()
+        self.graph_frame = None
+        self.fig = None
+        self.ax = None
+        self.canvas = None
+        self.bars = None
+        self.labels = []
+        self._chart_frame = None
+        self._empty_label = None
+
+    def _ensure_widget(self, graph_frame: ttk.Frame):
+        """Cria a Figure, o canvas e os controles na primeira chamada"""
+        if (
+            self.graph_frame is graph_frame
+            and self._chart_frame is not None
+            and self._chart_frame.winfo_exists()
+        ):
+            return
+
+        self.clear()
         for widget in graph_frame.winfo_children():
             widget.destroy()
+        self.graph_frame = graph_frame
+
+        self._empty_label = ttk.Label(
+            graph_frame,
+            text="Nenhum dado disponível.\nImporte um arquivo de Gestão à Vista para visualizar o gráfico.",
+            style="SubHeader.TLabel",
+            justify=tk.CENTER,
+        )
+        self._chart_frame = ttk.Frame(graph_frame, style="Card.TFrame")
 
         # Criar frame para o gráfico e controles
-        controls_frame = ttk.Frame(graph_frame, style="Card.TFrame")
+        controls_frame = ttk.Frame(self._chart_frame, style="Card.TFrame")
         controls_frame.pack(fill=tk.X, padx=10, pady=(0, 10))
 
-        graph_container = ttk.Frame(graph_frame, style="Card.TFrame")
+        graph_container = ttk.Frame(self._chart_frame, style="Card.TFrame")
         graph_container.pack(fill=tk.BOTH, expand=True)
 
-        # Configurar gráfico
-        fig, ax = plt.subplots(
+        # Configurar gráfico (fora do pyplot, para não acumular figuras)
+        self.fig = Figure(
             figsize=(12, 7), facecolor=DESIGN_SYSTEM["colors"]["background"]["default"]
         )
-        ax.set_facecolor(DESIGN_SYSTEM["colors"]["background"]["paper"])
-
-        # Separar características em obrigatórias e opcionais
-        caracteristicas_obrigatorias = []
-        caracteristicas_opcionais = []
-        contagens_obrigatorias = []
-        contagens_opcionais = []
-        cores_obrigatorias = []
-        cores_opcionais = []
-
-        # Classificar características
-        for caracteristica in caracteristicas:
-            valores = df_gestao[caracteristica].fillna("").astype(str)
-            contagem = valores.str.upper().str.strip().eq("X").sum()
-
-            if is_documento_obrigatorio(caracteristica):
-                caracteristicas_obrigatorias.append(caracteristica)
-                contagens_obrigatorias.append(contagem)
-                cores_obrigatorias.append(DESIGN_SYSTEM["colors"]["error"])
-            else:
-                caracteristicas_opcionais.append(caracteristica)
-                contagens_opcionais.append(contagem)
-                cores_opcionais.append(DESIGN_SYSTEM["colors"]["primary"])
-
-        # Ordenar obrigatórios por contagem (maior para menor)
-        indices_ordenados_obrig = np.argsort(contagens_obrigatorias)[::-1]
-        caracteristicas_obrigatorias = [
-            caracteristicas_obrigatorias[i] for i in indices_ordenados_obrig
-        ]
-        contagens_obrigatorias = [
-            contagens_obrigatorias[i] for i in indices_ordenados_obrig
-        ]
-        cores_obrigatorias = [cores_obrigatorias[i] for i in indices_ordenados_obrig]
-
-        # Ordenar opcionais por contagem (maior para menor)
-        indices_ordenados_opc = np.argsort(contagens_opcionais)[::-1]
-        caracteristicas_opcionais = [
-            caracteristicas_opcionais[i] for i in indices_ordenados_opc
-        ]
-        contagens_opcionais = [contagens_opcionais[i] for i in indices_ordenados_opc]
-        cores_opcionais = [cores_opcionais[i] for i in indices_ordenados_opc]
-
-        # Combinar listas mantendo a ordem (obrigatórios à esquerda, opcionais à direita)
-        todas_caracteristicas = caracteristicas_obrigatorias + caracteristicas_opcionais
-        todas_contagens = contagens_obrigatorias + contagens_opcionais
-        todas_cores = cores_obrigatorias + cores_opcionais
+        self.ax = self.fig.add_subplot()
+        self.ax.set_facecolor(DESIGN_SYSTEM["colors"]["background"]["paper"])
 
-        # Criar gráfico
-        bars = ax.bar(
-            range(len(todas_caracteristicas)), todas_contagens, color=todas_cores
-        )
-
-        # Configurar eixos e labels
-        ax.set_xticks(range(len(todas_caracteristicas)))
-        ax.set_xticklabels(
-            todas_caracteristicas,
-            rotation=45,
-            ha="right",
-            fontsize=10,
-            color=DESIGN_SYSTEM["colors"]["text"]["secondary"],
-        )
-
-        ax.set_ylabel(
+        self.ax.set_ylabel(
             "Número de Casas de Oração",
             fontsize=12,
             color=DESIGN_SYSTEM["colors"]["text"]["primary"],
             labelpad=10,
         )
 
-        ax.set_title(
+        self.ax.set_title(
             "Características das Casas de Oração\n(Documentos obrigatórios em vermelho à esquerda, ordenados de maior para menor)",
             fontsize=14,
             color=DESIGN_SYSTEM["colors"]["text"]["primary"],
@@ -125,7 +163,7 @@ class GraphService:
         )
 
         # Personalizar grid e bordas
-        ax.grid(
+        self.ax.grid(
             True,
             axis="y",
             linestyle="--",
@@ -133,30 +171,13 @@ class GraphService:
             color=DESIGN_SYSTEM["colors"]["border"],
         )
 
-        ax.spines["top"].set_visible(False)
-        ax.spines["right"].set_visible(False)
-        ax.spines["left"].set_color(DESIGN_SYSTEM["colors"]["border"])
-        ax.spines["bottom"].set_color(DESIGN_SYSTEM["colors"]["border"])
-
-        # Adicionar valores e porcentagens sobre as barras
-        for bar in bars:
-            height = bar.get_height()
-            percentage = (height / total_casas) * 100
-            ax.text(
-                bar.get_x() + bar.get_width() / 2.0,
-                height,
-                f"{int(height)}\n({percentage:.1f}%)",
-                ha="center",
-                va="bottom",
-                fontsize=10,
-                fontweight="bold",
-                color=DESIGN_SYSTEM["colors"]["text"]["primary"],
-            )
-
-        # Ajustar layout
-        plt.tight_layout()
+        self.ax.spines["top"].set_visible(False)
+        self.ax.spines["right"].set_visible(False)
+        self.ax.spines["left"].set_color(DESIGN_SYSTEM["colors"]["border"])
+        self.ax.spines["bottom"].set_color(DESIGN_SYSTEM["colors"]["border"])
 
         # Adicionar botão de exportação
+        fig = self.fig
         export_btn = create_button(
             controls_frame,
             "📸 Exportar Gráfico",
@@ -166,9 +187,43 @@ class GraphService:
         export_btn.pack(side=tk.RIGHT, padx=5)
 
         # Criar canvas e exibir
-        canvas = FigureCanvasTkAgg(fig, master=graph_container)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        self.canvas = FigureCanvasTkAgg(self.fig, master=graph_container)
+        self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+
+    def _update_bars(self, contagens: list, cores: list):
+        """
+        Ajusta as barras e os rótulos existentes aos novos valores.
+
+        Args:
+            contagens: Altura de cada barra
+            cores: Cor de cada barra
+        """
+        if self.bars is None or len(self.bars) != len(contagens):
+            # Quantidade de documentos mudou: trocar o container inteiro
+            # (remove as barras e o próprio container de ax.containers)
+            if self.bars is not None:
+                self.bars.remove()
+            for label in self.labels:
+                label.remove()
+
+            self.bars = self.ax.bar(range(len(contagens)), [0] * len(contagens))
+            self.labels = [
+                self.ax.text(
+                    idx,
+                    0,
+                    "",
+                    ha="center",
+                    va="bottom",
+                    fontsize=10,
+                    fontweight="bold",
+                    color=DESIGN_SYSTEM["colors"]["text"]["primary"],
+                )
+                for idx in range(len(contagens))
+            ]
+
+        for bar, contagem, cor in zip(self.bars, contagens, cores):
+            bar.set_height(contagem)
+            bar.set_facecolor(cor)
 
     @staticmethod
     def export_graph(fig):
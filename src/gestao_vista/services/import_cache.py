@@ -0,0 +1,104 @@
+import hashlib
+import os
+from pathlib import Path
+from typing import Optional
+
+from gestao_vista.models.presence_matrix import PresenceMatrix
+from gestao_vista.services.gestao_snapshot import GestaoSnapshotStore
+from gestao_vista.utils.constants import IMPORTADOR_VERSAO, NORMALIZADOR_VERSAO
+
+# Tamanho máximo do cache de importações em disco
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+_CHUNK_SIZE = 1024 * 1024
+
+
+class ImportCache:
+    """
+    Cache em disco das planilhas de Gestão à Vista já importadas.
+
+    Cada entrada é um snapshot da matriz de presença normalizada, identificado
+    pelo SHA-256 do arquivo e pelas versões do importador e do normalizador
+    de documentos.
+    Quando o tamanho total passa do limite, as entradas usadas há mais tempo
+    são removidas (LRU pela data de modificação, atualizada a cada acerto).
+    """
+
+    def __init__(self, cache_dir: Path, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Inicializa o cache.
+
+        Args:
+            cache_dir: Diretório onde as entradas são gravadas
+            max_bytes: Tamanho máximo total das entradas
+        """
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+
+    def key_for(self, file_path: str) -> str:
+        """
+        Calcula a chave do arquivo (SHA-256 do conteúdo + versões do importador
+        e do normalizador).
+
+        Args:
+            file_path: Caminho da planilha
+        """
+        digest = hashlib.sha256()
+        with open(file_path, "rb") as f:
+            for chunk in iter(lambda: f.read(_CHUNK_SIZE), b""):
+                digest.update(chunk)
+        return f"{digest.hexdigest()}-i{IMPORTADOR_VERSAO}-v{NORMALIZADOR_VERSAO}"
+
+    def _entry_file(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.npz"
+
+    def get(self, key: str) -> Optional[PresenceMatrix]:
+        """
+        Retorna a matriz de presença em cache (None se não houver).
+
+        Args:
+            key: Chave calculada por key_for
+        """
+        entry_file = self._entry_file(key)
+        try:
+            presence = GestaoSnapshotStore(entry_file).load()
+            if presence is not None:
+                # Marcar como usado recentemente
+                os.utime(entry_file)
+            return presence
+        except Exception as e:
+            print(f"Erro ao ler cache de importação: {e}")
+            return None
+
+    def put(self, key: str, presence: PresenceMatrix):
+        """
+        Grava a matriz de presença no cache e aplica o limite de tamanho.
+
+        Args:
+            key: Chave calculada por key_for
+            presence: Matriz de presença normalizada
+        """
+        try:
+            GestaoSnapshotStore(self._entry_file(key)).save(presence)
+            self._evict()
+        except Exception as e:
+            print(f"Erro ao gravar cache de importação: {e}")
+
+    def _evict(self):
+        """Remove as entradas menos usadas até caber no limite."""
+        entries = []
+        for entry_file in self.cache_dir.glob("*.npz"):
+            stat = entry_file.stat()
+            entries.append((stat.st_mtime_ns, stat.st_size, entry_file))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry_file in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            entry_file.unlink()
+            total -= size
+
+    def clear(self):
+        """Remove todas as entradas do cache."""
+        for entry_file in self.cache_dir.glob("*.npz"):
+            entry_file.unlink()
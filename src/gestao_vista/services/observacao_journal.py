@@ -0,0 +1,263 @@
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from gestao_vista.services.repository import ObservacaoRepository
+
+# Tamanho do journal (em bytes) a partir do qual ele é compactado no snapshot
+COMPACT_THRESHOLD_BYTES = 256 * 1024
+
+_journals: Dict[Path, "ObservacaoJournal"] = {}
+_journals_lock = threading.Lock()
+
+
+class ObservacaoJournal(ObservacaoRepository):
+    """
+    Armazena as observações como snapshot JSON + journal append-only.
+
+    O snapshot (observacoes.json) mantém o formato de lista usado desde o
+    início. Cada alteração é gravada como uma linha JSON no journal
+    (observacoes.jsonl), e o estado em memória é reconstruído no carregamento
+    aplicando o journal sobre o snapshot. Quando o journal passa do limite de
+    tamanho, ele é compactado no snapshot em uma thread de fundo. O último id
+    alocado fica em observacoes.seq.
+    """
+
+    def __init__(
+        self,
+        snapshot_file: Path,
+        compact_threshold: int = COMPACT_THRESHOLD_BYTES,
+    ):
+        """
+        Inicializa o journal e carrega as observações em memória.
+
+        Args:
+            snapshot_file: Caminho do snapshot (observacoes.json)
+            compact_threshold: Tamanho do journal que dispara a compactação
+        """
+        self.snapshot_file = Path(snapshot_file)
+        self.journal_file = self.snapshot_file.with_suffix(".jsonl")
+        self.sequence_file = self.snapshot_file.with_suffix(".seq")
+        self.compact_threshold = compact_threshold
+
+        self._lock = threading.RLock()
+        self._records: Dict[str, dict] = {}
+        self._last_id = 0
+        self._compaction_thread: Optional[threading.Thread] = None
+
+        self._load()
+
+    @classmethod
+    def open(cls, snapshot_file: Path) -> "ObservacaoJournal":
+        """
+        Retorna o journal compartilhado do processo para o arquivo informado.
+
+        Args:
+            snapshot_file: Caminho do snapshot (observacoes.json)
+        """
+        key = Path(snapshot_file).resolve()
+        with _journals_lock:
+            journal = _journals.get(key)
+            if journal is None:
+                journal = cls(snapshot_file)
+                _journals[key] = journal
+            return journal
+
+    def _load(self):
+        """Carrega o snapshot e aplica os eventos do journal."""
+        with self._lock:
+            self._records = {}
+            needs_compaction = False
+
+            snapshot = []
+            if self.snapshot_file.exists():
+                snapshot = json.loads(self.snapshot_file.read_text() or "[]")
+
+            events = []
+            if self.journal_file.exists():
+                with open(self.journal_file, "r", encoding="utf-8") as f:
+                    for line in f:
+                        line = line.strip()
+                        if not line:
+                            continue
+                        try:
+                            events.append(json.loads(line))
+                        except json.JSONDecodeError:
+                            # Linha incompleta (gravação interrompida)
+                            print(f"Evento de observação inválido ignorado: {line}")
+                needs_compaction = (
+                    self.journal_file.stat().st_size >= self.compact_threshold
+                )
+
+            # A sequência nunca fica abaixo do maior id numérico já usado
+            # (arquivos antigos não têm o arquivo de sequência)
+            ids = [record.get("id") for record in snapshot]
+            ids += [event["data"].get("id") for event in events if event["op"] == "put"]
+            numeric_ids = [int(i) for i in ids if str(i).isdigit()]
+            self._last_id = max([self._read_sequence(), *numeric_ids])
+
+            for record in snapshot:
+                # Versões antigas podiam gerar ids repetidos após exclusões
+                if record.get("id") in self._records:
+                    record = dict(record, id=self.next_id())
+                    needs_compaction = True
+                self._records[record["id"]] = record
+
+            for event in events:
+                self._apply(event)
+
+            if needs_compaction:
+                self.compact()
+
+    def _read_sequence(self) -> int:
+        """Lê o último id alocado do arquivo de sequência (0 se não houver)."""
+        try:
+            return int(self.sequence_file.read_text().strip() or 0)
+        except (OSError, ValueError):
+            return 0
+
+    def next_id(self) -> str:
+        """
+        Aloca o próximo id da sequência persistente.
+
+        Ids nunca são reutilizados, mesmo após exclusões.
+        """
+        with self._lock:
+            self._last_id += 1
+            self.sequence_file.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(
+                dir=self.sequence_file.parent, prefix=".observacoes-", suffix=".tmp"
+            )
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    f.write(str(self._last_id))
+                    # O id só é publicado depois de estar em disco, para que
+                    # uma queda não deixe o arquivo de sequência vazio
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, self.sequence_file)
+            except Exception:
+                if os.path.exists(tmp_path):
+                    os.unlink(tmp_path)
+                raise
+            return str(self._last_id)
+
+    def _apply(self, event: dict):
+        """Aplica um evento do journal ao estado em memória."""
+        if event["op"] == "put":
+            record = event["data"]
+            self._records[record["id"]] = record
+        elif event["op"] == "delete":
+            self._records.pop(event["id"], None)
+
+    def _append(self, event: dict):
+        """Grava um evento no final do journal."""
+        line = (json.dumps(event, ensure_ascii=False) + "\n").encode("utf-8")
+        with open(self.journal_file, "a+b") as f:
+            # Se a última gravação foi interrompida no meio da linha, o evento
+            # começa em uma linha nova para não ser colado à linha incompleta
+            if f.seek(0, os.SEEK_END) > 0:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    line = b"\n" + line
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+            size = f.tell()
+
+        if size >= self.compact_threshold:
+            self._schedule_compaction()
+
+    def records(self) -> List[dict]:
+        """Retorna todas as observações na ordem de criação."""
+        with self._lock:
+            return list(self._records.values())
+
+    def get(self, observacao_id: str) -> Optional[dict]:
+        """Retorna uma observação pelo id."""
+        with self._lock:
+            return self._records.get(observacao_id)
+
+    def by_casa(self, casa_oracao_id: str) -> List[dict]:
+        """Retorna as observações de uma casa, na ordem de criação."""
+        with self._lock:
+            return [
+                record
+                for record in self._records.values()
+                if record["casa_oracao_id"] == casa_oracao_id
+            ]
+
+    @property
+    def last_id(self) -> int:
+        """Último id alocado pela sequência."""
+        with self._lock:
+            return self._last_id
+
+    def put(self, record: dict):
+        """
+        Grava (cria ou substitui) uma observação.
+
+        Args:
+            record: Observação serializada, com o campo "id" preenchido
+        """
+        with self._lock:
+            self._append({"op": "put", "data": record})
+            self._records[record["id"]] = record
+
+    def delete(self, observacao_id: str) -> bool:
+        """
+        Exclui uma observação.
+
+        Args:
+            observacao_id: Id da observação
+        """
+        with self._lock:
+            if observacao_id not in self._records:
+                return False
+            self._append({"op": "delete", "id": observacao_id})
+            del self._records[observacao_id]
+            return True
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._records)
+
+    def compact(self):
+        """Grava o estado atual no snapshot e esvazia o journal."""
+        with self._lock:
+            self.snapshot_file.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(
+                dir=self.snapshot_file.parent, prefix=".observacoes-", suffix=".tmp"
+            )
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(list(self._records.values()), f, indent=2)
+                os.replace(tmp_path, self.snapshot_file)
+            except Exception:
+                if os.path.exists(tmp_path):
+                    os.unlink(tmp_path)
+                raise
+
+            # Reaplicar o journal sobre o novo snapshot não altera o estado,
+            # então uma interrupção antes deste ponto não perde dados
+            with open(self.journal_file, "w", encoding="utf-8"):
+                pass
+
+    def _schedule_compaction(self):
+        """Compacta o journal em uma thread de fundo."""
+        if self._compaction_thread and self._compaction_thread.is_alive():
+            return
+
+        def run():
+            try:
+                self.compact()
+            except Exception as e:
+                print(f"Erro ao compactar observações: {e}")
+
+        self._compaction_thread = threading.Thread(
+            target=run, name="observacoes-compaction", daemon=True
+        )
+        self._compaction_thread.start()
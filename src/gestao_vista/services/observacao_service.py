@@ -1,7 +1,88 @@
-import json
+import threading
 from pathlib import Path
-from typing import List, Optional
+from typing import Callable, Dict, List, Optional, Set, Tuple
 from gestao_vista.models.observacao import Observacao
+from gestao_vista.services.repository import (
+    ObservacaoRepository,
+    open_observacao_repository,
+)
+
+
+class ObservacaoIndex:
+    """
+    Índices em memória das observações de um repositório.
+
+    Mantém id → registro, casa → ids (na ordem de criação) e
+    (casa, documento) → ids. É montado uma única vez a partir do repositório
+    e atualizado a cada gravação/exclusão feita pelo ObservacaoService.
+    Dados derivados das observações podem se inscrever em listeners para
+    serem avisados das casas alteradas.
+    """
+
+    def __init__(self, records: List[dict]):
+        self.by_id: Dict[str, dict] = {}
+        self.by_casa: Dict[str, Dict[str, None]] = {}
+        self.by_casa_documento: Dict[Tuple[str, str], Set[str]] = {}
+        self.listeners: List[Callable[[List[str]], None]] = []
+        for record in records:
+            self.add(record)
+
+    def notify(self, casa_oracao_ids: List[str]):
+        """Avisa os listeners de que as observações das casas mudaram."""
+        for listener in list(self.listeners):
+            try:
+                listener(casa_oracao_ids)
+            except Exception as e:
+                print(f"Erro ao notificar alteração de observações: {e}")
+
+    def add(self, record: dict):
+        """Indexa (ou reindexa) um registro."""
+        observacao_id = record["id"]
+        if observacao_id in self.by_id:
+            self.remove(observacao_id)
+
+        self.by_id[observacao_id] = record
+        casa = record["casa_oracao_id"]
+        self.by_casa.setdefault(casa, {})[observacao_id] = None
+        self.by_casa_documento.setdefault((casa, record["documento"]), set()).add(
+            observacao_id
+        )
+
+    def remove(self, observacao_id: str):
+        """Remove um registro dos índices."""
+        record = self.by_id.pop(observacao_id, None)
+        if record is None:
+            return
+
+        casa = record["casa_oracao_id"]
+        ids_casa = self.by_casa.get(casa)
+        if ids_casa is not None:
+            ids_casa.pop(observacao_id, None)
+            if not ids_casa:
+                del self.by_casa[casa]
+
+        chave = (casa, record["documento"])
+        ids_documento = self.by_casa_documento.get(chave)
+        if ids_documento is not None:
+            ids_documento.discard(observacao_id)
+            if not ids_documento:
+                del self.by_casa_documento[chave]
+
+
+# Índices compartilhados por todos os serviços do processo. Os repositórios de
+# observações já são únicos por processo, então basta um índice por repositório.
+_indices: Dict[int, Tuple[ObservacaoRepository, ObservacaoIndex]] = {}
+_indices_lock = threading.Lock()
+
+
+def _index_for(repository: ObservacaoRepository) -> ObservacaoIndex:
+    """Retorna o índice do repositório, montando-o na primeira chamada."""
+    with _indices_lock:
+        entry = _indices.get(id(repository))
+        if entry is None or entry[0] is not repository:
+            entry = (repository, ObservacaoIndex(repository.records()))
+            _indices[id(repository)] = entry
+        return entry[1]
 
 
 class ObservacaoService:
@@ -9,63 +90,79 @@ class ObservacaoService:
         self.data_dir = Path("data")
         self.observacoes_file = self.data_dir / "observacoes.json"
         self._init_data_file()
+        self.repository = open_observacao_repository(self.data_dir)
+        self.index = _index_for(self.repository)
 
     def _init_data_file(self):
         if not self.data_dir.exists():
             self.data_dir.mkdir(parents=True)
 
-        if not self.observacoes_file.exists():
-            self.observacoes_file.write_text("[]")
-
     def _load_observacoes(self) -> List[dict]:
-        return json.loads(self.observacoes_file.read_text())
-
-    def _save_observacoes(self, observacoes: List[dict]):
-        self.observacoes_file.write_text(json.dumps(observacoes, indent=2))
+        return self.repository.records()
 
     def criar_observacao(self, observacao: Observacao) -> Observacao:
-        observacoes = self._load_observacoes()
-
-        # Gerar ID único
-        novo_id = str(len(observacoes) + 1)
-        observacao.id = novo_id
+        # Gerar ID único (sequência persistente, nunca reutilizada)
+        observacao.id = self.repository.next_id()
 
         # Adicionar nova observação
-        observacoes.append(observacao.to_dict())
-        self._save_observacoes(observacoes)
+        record = observacao.to_dict()
+        self.repository.put(record)
+        self.index.add(record)
+        self.index.notify([record["casa_oracao_id"]])
 
         return observacao
 
     def listar_observacoes_por_casa(self, casa_oracao_id: str) -> List[Observacao]:
-        observacoes = self._load_observacoes()
-        return [
-            Observacao.from_dict(obs)
-            for obs in observacoes
-            if obs["casa_oracao_id"] == casa_oracao_id
-        ]
+        ids = self.index.by_casa.get(casa_oracao_id, {})
+        return [Observacao.from_dict(self.index.by_id[obs_id]) for obs_id in ids]
+
+    def documentos_com_observacao(self, casa_oracao_id: str) -> Set[str]:
+        """Retorna os documentos que têm observação na casa."""
+        return {
+            self.index.by_id[obs_id]["documento"]
+            for obs_id in self.index.by_casa.get(casa_oracao_id, {})
+        }
+
+    def tem_observacao(self, casa_oracao_id: str, documento: str) -> bool:
+        """Indica se há observação para o documento na casa."""
+        return (casa_oracao_id, documento) in self.index.by_casa_documento
 
     def buscar_observacao(self, observacao_id: str) -> Optional[Observacao]:
-        observacoes = self._load_observacoes()
-        for obs in observacoes:
-            if obs["id"] == observacao_id:
-                return Observacao.from_dict(obs)
+        obs = self.index.by_id.get(observacao_id)
+        if obs is not None:
+            return Observacao.from_dict(obs)
         return None
 
     def atualizar_observacao(self, observacao: Observacao) -> bool:
         """Atualiza uma observação existente"""
-        observacoes = self._load_observacoes()
-
-        for i, obs in enumerate(observacoes):
-            if obs["id"] == observacao.id:
-                observacoes[i] = observacao.to_dict()
-                self._save_observacoes(observacoes)
-                return True
-
-        return False
+        anterior = self.index.by_id.get(observacao.id)
+        if anterior is None:
+            return False
+
+        record = observacao.to_dict()
+        self.repository.put(record)
+        self.index.add(record)
+        self.index.notify(
+            list(dict.fromkeys([anterior["casa_oracao_id"], record["casa_oracao_id"]]))
+        )
+        return True
 
     def excluir_observacao(self, observacao_id: str) -> bool:
         """Exclui uma observação"""
-        observacoes = self._load_observacoes()
-        observacoes = [obs for obs in observacoes if obs["id"] != observacao_id]
-        self._save_observacoes(observacoes)
+        anterior = self.index.by_id.get(observacao_id)
+        self.repository.delete(observacao_id)
+        self.index.remove(observacao_id)
+        if anterior is not None:
+            self.index.notify([anterior["casa_oracao_id"]])
         return True
+
+    def subscribe(self, listener: Callable[[List[str]], None]):
+        """
+        Registra uma função chamada com os códigos das casas cujas
+        observações mudaram.
+
+        Args:
+            listener: Função que recebe a lista de códigos das casas
+        """
+        if listener not in self.index.listeners:
+            self.index.listeners.append(listener)
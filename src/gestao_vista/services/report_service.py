@@ -1,15 +1,167 @@
+import re
 import tkinter as tk
 from tkinter import messagebox
+import numpy as np
 import pandas as pd
-from typing import List
+from openpyxl import Workbook
+from openpyxl.utils import get_column_letter
+from typing import List, Optional
 
 from gestao_vista.models.casa_oracao import CasaOracao
+from gestao_vista.models.presence_matrix import PresenceMatrix
+from gestao_vista.services.aggregation_service import AggregationService
+
+# Colunas das casas incluídas nos relatórios
+COLUNAS_CASA = ["codigo", "nome", "endereco", "tipo_imovel", "observacoes", "status"]
+
+# Limite do Excel para nomes de abas e caracteres proibidos neles
+MAX_SHEET_NAME = 31
+_INVALID_SHEET_CHARS = re.compile(r"[\[\]:*?/\\]")
+
+
+def sheet_name(nome: str, usados: set) -> str:
+    """
+    Gera um nome de aba válido e único para o Excel.
+
+    Remove os caracteres proibidos, limita a 31 caracteres e, se o nome já
+    estiver em uso (sem diferenciar maiúsculas), acrescenta um sufixo " (n)".
+
+    Args:
+        nome: Nome desejado
+        usados: Nomes já usados no workbook (em minúsculas); é atualizado
+    """
+    base = _INVALID_SHEET_CHARS.sub("_", str(nome)).strip().strip("'")
+    base = base[:MAX_SHEET_NAME].strip() or "Documento"
+
+    candidato = base
+    contador = 2
+    while candidato.lower() in usados:
+        sufixo = f" ({contador})"
+        candidato = base[: MAX_SHEET_NAME - len(sufixo)].rstrip() + sufixo
+        contador += 1
+    usados.add(candidato.lower())
+    return candidato
+
+
+def write_sheet(workbook: Workbook, df: pd.DataFrame, titulo: str):
+    """
+    Grava o DataFrame em uma aba (modo write-only) com a largura das
+    colunas ajustada ao maior texto de cada coluna.
+
+    Args:
+        workbook: Workbook do openpyxl criado com write_only=True
+        df: Dados da aba
+        titulo: Nome da aba
+    """
+    worksheet = workbook.create_sheet(titulo)
+
+    # No modo write-only as larguras precisam ser definidas antes das linhas
+    larguras = (
+        df.fillna("").astype(str).apply(lambda col: col.str.len().max())
+        if len(df)
+        else pd.Series(0, index=df.columns)
+    )
+    for idx, (col, largura) in enumerate(zip(df.columns, larguras.tolist())):
+        max_length = max(int(largura), len(str(col)))
+        worksheet.column_dimensions[get_column_letter(idx + 1)].width = max_length + 2
+
+    worksheet.append([str(col) for col in df.columns])
+    for row in df.astype(object).where(df.notna(), None).values.tolist():
+        worksheet.append(row)
 
 
 class ReportService:
-    def __init__(self, df_gestao: pd.DataFrame, casas: List[CasaOracao]):
+    def __init__(
+        self,
+        df_gestao: pd.DataFrame,
+        casas: List[CasaOracao],
+        presence: Optional[PresenceMatrix] = None,
+    ):
         self.df_gestao = df_gestao
         self.casas = casas
+        self.presence = (
+            presence
+            if presence is not None
+            else PresenceMatrix.from_dataframe(df_gestao)
+        )
+        self._base: Optional[pd.DataFrame] = None
+
+    def _casas_dataframe(self) -> pd.DataFrame:
+        """Monta o DataFrame das casas indexado pelo código (primeira ocorrência)."""
+        df_casas = pd.DataFrame(
+            [casa.to_dict() for casa in self.casas], columns=COLUNAS_CASA
+        )
+        df_casas["codigo"] = df_casas["codigo"].astype(str)
+        return df_casas.drop_duplicates("codigo", keep="first")
+
+    def _base_dataframe(self) -> pd.DataFrame:
+        """
+        Junta todas as linhas da matriz às casas cadastradas.
+
+        A junção é feita uma única vez e cada relatório de faltantes é apenas
+        uma seleção de linhas dela.
+        """
+        if self._base is None:
+            df_base = pd.DataFrame(
+                {"codigo": np.asarray(self.presence.codigos, dtype=object)}
+            )
+            # Casas não cadastradas ficam com os dados em branco
+            self._base = df_base.merge(
+                self._casas_dataframe(), on="codigo", how="left", sort=False
+            )
+        return self._base
+
+    def faltantes_dataframe(self, caracteristica: str) -> pd.DataFrame:
+        """
+        Monta o relatório de casas sem o documento (junção vetorizada com as casas).
+
+        Args:
+            caracteristica: Característica a ser analisada
+        """
+        linhas = np.flatnonzero(~self.presence.column(caracteristica))
+        return self._faltantes_linhas(caracteristica, linhas)
+
+    def _faltantes_linhas(
+        self, caracteristica: str, linhas: np.ndarray
+    ) -> pd.DataFrame:
+        """Seleciona as linhas faltantes da base no formato do relatório."""
+        df_export = self._base_dataframe().iloc[linhas].reset_index(drop=True)
+        df_export[caracteristica] = self._valores_originais(caracteristica, linhas)
+        df_export["Status"] = "Faltante"
+        return df_export[COLUNAS_CASA + [caracteristica, "Status"]]
+
+    def _valores_originais(self, caracteristica: str, linhas: np.ndarray):
+        """
+        Valores das células do documento no DataFrame de gestão (o que estava
+        na planilha, em vez de uma célula em branco).
+
+        Args:
+            caracteristica: Documento do relatório
+            linhas: Linhas da matriz de presença
+        """
+        if (
+            caracteristica in self.df_gestao.columns
+            and len(self.df_gestao) == self.presence.n_casas
+        ):
+            return self.df_gestao[caracteristica].iloc[linhas].to_numpy()
+        return ""
+
+    def resumo_dataframe(self) -> pd.DataFrame:
+        """Monta o resumo por documento (presentes, faltantes e percentual)."""
+        agregados = AggregationService.aggregate(self.presence)
+        obrigatorios = set(agregados.obrigatorios)
+        return pd.DataFrame(
+            {
+                "Documento": agregados.documentos,
+                "Tipo": [
+                    "Obrigatório" if documento in obrigatorios else "Opcional"
+                    for documento in agregados.documentos
+                ],
+                "Casas com documento": agregados.contagens,
+                "Casas faltantes": agregados.total_casas - agregados.contagens,
+                "% com documento": agregados.percentuais.round(1),
+            }
+        )
 
     def export_faltantes(self, caracteristica: str, coluna_codigo: str):
         """
@@ -20,43 +172,8 @@ class ReportService:
             coluna_codigo: Nome da coluna que contém o código das casas
         """
         try:
-            # Identificar casas faltantes
-            valores = self.df_gestao[caracteristica].fillna("").astype(str)
-            casas_faltantes = self.df_gestao[~valores.str.upper().str.strip().eq("X")][
-                [coluna_codigo, caracteristica]
-            ]
-            casas_faltantes["Status"] = "Faltante"
-
-            # Preparar dados para exportação
-            dados_export = []
-            for _, row in casas_faltantes.iterrows():
-                codigo = str(row[coluna_codigo])
-                casa = next((c for c in self.casas if c.codigo == codigo), None)
-
-                if casa:
-                    dados_export.append(
-                        {
-                            "codigo": codigo,
-                            "nome": casa.nome,
-                            "endereco": casa.endereco,
-                            "tipo_imovel": casa.tipo_imovel,
-                            "observacoes": casa.observacoes,
-                            "status": casa.status,
-                            caracteristica: row[caracteristica],
-                            "Status": "Faltante",
-                        }
-                    )
-                else:
-                    dados_export.append(
-                        {
-                            "codigo": codigo,
-                            caracteristica: row[caracteristica],
-                            "Status": "Faltante",
-                        }
-                    )
-
-            # Criar DataFrame para exportação
-            df_export = pd.DataFrame(dados_export)
+            # Identificar casas faltantes e juntar com os dados das casas
+            df_export = self.faltantes_dataframe(caracteristica)
 
             # Salvar arquivo
             file_path = tk.filedialog.asksaveasfilename(
@@ -67,20 +184,9 @@ class ReportService:
             )
 
             if file_path:
-                with pd.ExcelWriter(file_path, engine="openpyxl") as writer:
-                    df_export.to_excel(
-                        writer, index=False, sheet_name="Casas Faltantes"
-                    )
-
-                    # Ajustar largura das colunas
-                    worksheet = writer.sheets["Casas Faltantes"]
-                    for idx, col in enumerate(df_export.columns):
-                        max_length = max(
-                            df_export[col].astype(str).apply(len).max(), len(str(col))
-                        )
-                        worksheet.column_dimensions[chr(65 + idx)].width = (
-                            max_length + 2
-                        )
+                workbook = Workbook(write_only=True)
+                write_sheet(workbook, df_export, "Casas Faltantes")
+                workbook.save(file_path)
 
                 messagebox.showinfo(
                     "✅ Sucesso",
@@ -91,3 +197,50 @@ class ReportService:
         except Exception as e:
             messagebox.showerror("❌ Erro", f"Erro ao exportar relatório: {str(e)}")
             return False
+
+    def export_all_faltantes(self):
+        """
+        Exporta um único workbook com o resumo e uma aba de casas faltantes
+        por documento.
+
+        A matriz é desempacotada uma vez e a junção com as casas é reaproveitada
+        por todas as abas; o workbook é gravado em modo write-only (streaming).
+        """
+        try:
+            if self.presence.is_empty:
+                messagebox.showwarning(
+                    "⚠️ Aviso", "Nenhum documento disponível para exportar."
+                )
+                return False
+
+            file_path = tk.filedialog.asksaveasfilename(
+                defaultextension=".xlsx",
+                filetypes=[("Excel files", "*.xlsx")],
+                title="Salvar relatório de casas faltantes - todos os documentos",
+                initialfile="casas_faltantes_todos_documentos.xlsx",
+            )
+            if not file_path:
+                return False
+
+            mask = self.presence.to_mask()
+            workbook = Workbook(write_only=True)
+            usados = set()
+            write_sheet(workbook, self.resumo_dataframe(), sheet_name("Resumo", usados))
+            for idx, documento in enumerate(self.presence.documentos):
+                linhas = np.flatnonzero(~mask[:, idx])
+                write_sheet(
+                    workbook,
+                    self._faltantes_linhas(documento, linhas),
+                    sheet_name(documento, usados),
+                )
+            workbook.save(file_path)
+
+            messagebox.showinfo(
+                "✅ Sucesso",
+                f"Relatório exportado com sucesso!\n"
+                f"Documentos exportados: {self.presence.n_documentos}",
+            )
+            return True
+        except Exception as e:
+            messagebox.showerror("❌ Erro", f"Erro ao exportar relatório: {str(e)}")
+            return False
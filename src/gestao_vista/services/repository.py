@@ -0,0 +1,187 @@
+import json
+import os
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from gestao_vista.models.casa_oracao import CasaOracao
+from gestao_vista.models.presence_matrix import PresenceMatrix
+from gestao_vista.utils.constants import STORAGE_BACKEND
+
+
+def file_fingerprint(path: Path) -> Optional[Tuple[int, int]]:
+    """
+    Retorna (mtime_ns, tamanho) do arquivo, usado para invalidar caches.
+
+    Args:
+        path: Caminho do arquivo
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class CasaRepository(ABC):
+    """Interface de persistência das casas de oração."""
+
+    @abstractmethod
+    def exists(self) -> bool:
+        """Indica se o armazenamento já foi inicializado."""
+
+    @abstractmethod
+    def load(self) -> List[CasaOracao]:
+        """Carrega todas as casas de oração."""
+
+    @abstractmethod
+    def save(self, casas: List[CasaOracao]) -> None:
+        """Substitui todas as casas de oração."""
+
+    def fingerprint(self) -> Optional[Tuple[int, int]]:
+        """Identifica a versão dos dados em disco (None desativa o cache)."""
+        return None
+
+
+class GestaoRepository(ABC):
+    """Interface de persistência da matriz de presença do Gestão à Vista."""
+
+    @abstractmethod
+    def exists(self) -> bool:
+        """Indica se o armazenamento já foi inicializado."""
+
+    @abstractmethod
+    def load(self) -> Optional[PresenceMatrix]:
+        """Carrega a matriz de presença (None se não houver dados)."""
+
+    @abstractmethod
+    def save(self, presence: PresenceMatrix) -> None:
+        """Substitui a matriz de presença."""
+
+    @abstractmethod
+    def delete(self) -> None:
+        """Remove a matriz de presença."""
+
+    def fingerprint(self) -> Optional[Tuple[int, int]]:
+        """Identifica a versão dos dados em disco (None desativa o cache)."""
+        return None
+
+
+class ObservacaoRepository(ABC):
+    """Interface de persistência das observações (registros serializados)."""
+
+    @abstractmethod
+    def records(self) -> List[dict]:
+        """Retorna todas as observações na ordem de criação."""
+
+    @abstractmethod
+    def get(self, observacao_id: str) -> Optional[dict]:
+        """Retorna uma observação pelo id."""
+
+    @abstractmethod
+    def by_casa(self, casa_oracao_id: str) -> List[dict]:
+        """Retorna as observações de uma casa, na ordem de criação."""
+
+    @abstractmethod
+    def next_id(self) -> str:
+        """Aloca um id novo, que nunca foi usado por outra observação."""
+
+    @abstractmethod
+    def put(self, record: dict) -> None:
+        """Grava (cria ou substitui) uma observação."""
+
+    @abstractmethod
+    def delete(self, observacao_id: str) -> bool:
+        """Exclui uma observação."""
+
+    def __len__(self) -> int:
+        return len(self.records())
+
+
+class JsonCasaRepository(CasaRepository):
+    """Casas de oração guardadas em um arquivo JSON (casas.json)."""
+
+    def __init__(self, casas_file: Path):
+        self.casas_file = Path(casas_file)
+
+    def exists(self) -> bool:
+        return self.casas_file.exists()
+
+    def load(self) -> List[CasaOracao]:
+        if not self.casas_file.exists():
+            return []
+        with open(self.casas_file, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if not isinstance(data, list):
+            raise ValueError(
+                f"dados do arquivo não são uma lista, recebido {type(data)}"
+            )
+        return [CasaOracao.from_dict(casa) for casa in data]
+
+    def save(self, casas: List[CasaOracao]) -> None:
+        data = [casa.to_dict() for casa in casas]
+        with open(self.casas_file, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+
+    def fingerprint(self) -> Optional[Tuple[int, int]]:
+        return file_fingerprint(self.casas_file)
+
+
+def open_casa_repository(data_dir: Path) -> CasaRepository:
+    """
+    Cria o repositório de casas do backend configurado.
+
+    Args:
+        data_dir: Diretório de dados da aplicação
+    """
+    if STORAGE_BACKEND == "sqlite":
+        from gestao_vista.services.sqlite_repository import SqliteCasaRepository
+
+        return SqliteCasaRepository.open(data_dir)
+    return JsonCasaRepository(Path(data_dir) / "casas.json")
+
+
+def open_gestao_repository(data_dir: Path) -> GestaoRepository:
+    """
+    Cria o repositório de gestão do backend configurado.
+
+    Args:
+        data_dir: Diretório de dados da aplicação
+    """
+    if STORAGE_BACKEND == "sqlite":
+        from gestao_vista.services.sqlite_repository import SqliteGestaoRepository
+
+        return SqliteGestaoRepository.open(data_dir)
+
+    from gestao_vista.services.gestao_snapshot import GestaoSnapshotStore
+
+    store = GestaoSnapshotStore(Path(data_dir) / "gestao.npz")
+    # Migrar o antigo gestao.json para o snapshot binário (apenas uma vez)
+    try:
+        if store.migrate_from_json(Path(data_dir) / "gestao.json"):
+            print("Dados de gestão migrados para o formato binário")
+    except Exception as e:
+        print(f"Erro ao migrar dados de gestão: {e}")
+    return store
+
+
+def open_observacao_repository(data_dir: Path) -> ObservacaoRepository:
+    """
+    Retorna o repositório de observações compartilhado do backend configurado.
+
+    Args:
+        data_dir: Diretório de dados da aplicação
+    """
+    if STORAGE_BACKEND == "sqlite":
+        from gestao_vista.services.sqlite_repository import (
+            SqliteObservacaoRepository,
+        )
+
+        return SqliteObservacaoRepository.open(data_dir)
+
+    from gestao_vista.services.observacao_journal import ObservacaoJournal
+
+    observacoes_file = Path(data_dir) / "observacoes.json"
+    if not observacoes_file.exists():
+        observacoes_file.write_text("[]")
+    return ObservacaoJournal.open(observacoes_file)
@@ -0,0 +1,385 @@
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from gestao_vista.models.casa_oracao import CasaOracao
+from gestao_vista.models.presence_matrix import PresenceMatrix
+from gestao_vista.services.repository import (
+    CasaRepository,
+    GestaoRepository,
+    ObservacaoRepository,
+)
+
+DATABASE_NAME = "gestao_vista.db"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    chave TEXT PRIMARY KEY,
+    valor TEXT
+);
+
+CREATE TABLE IF NOT EXISTS casas (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    codigo TEXT NOT NULL,
+    nome TEXT NOT NULL,
+    tipo_imovel TEXT,
+    endereco TEXT,
+    observacoes TEXT,
+    status TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_casas_codigo ON casas (codigo);
+
+CREATE TABLE IF NOT EXISTS observacoes (
+    id TEXT PRIMARY KEY,
+    casa_oracao_id TEXT NOT NULL,
+    documento TEXT NOT NULL,
+    comentario TEXT NOT NULL,
+    data_criacao TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_observacoes_casa
+    ON observacoes (casa_oracao_id, documento);
+DROP INDEX IF EXISTS idx_observacoes_documento;
+
+CREATE TABLE IF NOT EXISTS gestao_documentos (
+    posicao INTEGER PRIMARY KEY,
+    nome TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS gestao_casas (
+    posicao INTEGER PRIMARY KEY,
+    codigo TEXT NOT NULL,
+    presenca BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_gestao_casas_codigo ON gestao_casas (codigo);
+"""
+
+_databases: Dict[Path, "SqliteDatabase"] = {}
+_databases_lock = threading.Lock()
+
+
+class SqliteDatabase:
+    """Conexão SQLite compartilhada pelos repositórios de um diretório de dados."""
+
+    def __init__(self, db_file: Path):
+        """
+        Abre (e cria, se necessário) o banco de dados.
+
+        Args:
+            db_file: Caminho do arquivo do banco
+        """
+        self.db_file = Path(db_file)
+        self.db_file.parent.mkdir(parents=True, exist_ok=True)
+        self.lock = threading.RLock()
+        self.connection = sqlite3.connect(str(self.db_file), check_same_thread=False)
+        self.connection.row_factory = sqlite3.Row
+        with self.connection:
+            self.connection.executescript(_SCHEMA)
+        # Repositório de observações único do banco (ver SqliteObservacaoRepository.open)
+        self.observacao_repository: Optional["SqliteObservacaoRepository"] = None
+
+    @classmethod
+    def open(cls, data_dir: Path) -> "SqliteDatabase":
+        """
+        Retorna o banco compartilhado do processo, migrando os JSON na criação.
+
+        Args:
+            data_dir: Diretório de dados da aplicação
+        """
+        db_file = (Path(data_dir) / DATABASE_NAME).resolve()
+        with _databases_lock:
+            database = _databases.get(db_file)
+            if database is None:
+                database = cls(db_file)
+                try:
+                    migrate_json_to_sqlite(Path(data_dir), database)
+                except Exception as e:
+                    print(f"Erro ao migrar dados JSON para SQLite: {e}")
+                _databases[db_file] = database
+            return database
+
+    def fingerprint(self) -> Optional[Tuple[int, int]]:
+        """
+        Versão dos dados do banco, usada para invalidar caches.
+
+        PRAGMA data_version muda quando outra conexão grava no banco e
+        total_changes conta as linhas alteradas por esta conexão, então o par
+        muda a cada gravação (o mtime e o tamanho do arquivo podem não mudar
+        quando páginas são reescritas no lugar).
+        """
+        with self.lock:
+            data_version = self.connection.execute("PRAGMA data_version").fetchone()[0]
+            return data_version, self.connection.total_changes
+
+    def get_meta(self, chave: str) -> Optional[str]:
+        """Lê um valor da tabela de metadados."""
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT valor FROM meta WHERE chave = ?", (chave,)
+            ).fetchone()
+        return row["valor"] if row else None
+
+    def set_meta(self, chave: str, valor: str):
+        """Grava um valor na tabela de metadados."""
+        with self.lock, self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO meta (chave, valor) VALUES (?, ?)",
+                (chave, valor),
+            )
+
+
+class SqliteCasaRepository(CasaRepository):
+    """Casas de oração guardadas na tabela casas."""
+
+    def __init__(self, database: SqliteDatabase):
+        self.database = database
+
+    @classmethod
+    def open(cls, data_dir: Path) -> "SqliteCasaRepository":
+        return cls(SqliteDatabase.open(data_dir))
+
+    def exists(self) -> bool:
+        return True
+
+    def fingerprint(self) -> Optional[Tuple[int, int]]:
+        return self.database.fingerprint()
+
+    def load(self) -> List[CasaOracao]:
+        with self.database.lock:
+            rows = self.database.connection.execute(
+                "SELECT codigo, nome, tipo_imovel, endereco, observacoes, status "
+                "FROM casas ORDER BY id"
+            ).fetchall()
+        return [CasaOracao.from_dict(dict(row)) for row in rows]
+
+    def save(self, casas: List[CasaOracao]) -> None:
+        with self.database.lock, self.database.connection as conn:
+            conn.execute("DELETE FROM casas")
+            conn.executemany(
+                "INSERT INTO casas "
+                "(codigo, nome, tipo_imovel, endereco, observacoes, status) "
+                "VALUES (:codigo, :nome, :tipo_imovel, :endereco, :observacoes, :status)",
+                [casa.to_dict() for casa in casas],
+            )
+
+    def get(self, codigo: str) -> Optional[CasaOracao]:
+        """Busca uma casa pelo código (consulta indexada)."""
+        with self.database.lock:
+            row = self.database.connection.execute(
+                "SELECT codigo, nome, tipo_imovel, endereco, observacoes, status "
+                "FROM casas WHERE codigo = ? ORDER BY id LIMIT 1",
+                (codigo,),
+            ).fetchone()
+        return CasaOracao.from_dict(dict(row)) if row else None
+
+
+class SqliteGestaoRepository(GestaoRepository):
+    """
+    Matriz de presença guardada por linha: cada casa tem seus bits de
+    documentos empacotados em um BLOB, indexado pelo código.
+    """
+
+    def __init__(self, database: SqliteDatabase):
+        self.database = database
+
+    @classmethod
+    def open(cls, data_dir: Path) -> "SqliteGestaoRepository":
+        return cls(SqliteDatabase.open(data_dir))
+
+    def exists(self) -> bool:
+        return True
+
+    def fingerprint(self) -> Optional[Tuple[int, int]]:
+        return self.database.fingerprint()
+
+    def load(self) -> Optional[PresenceMatrix]:
+        with self.database.lock:
+            conn = self.database.connection
+            documentos = [
+                row["nome"]
+                for row in conn.execute(
+                    "SELECT nome FROM gestao_documentos ORDER BY posicao"
+                )
+            ]
+            rows = conn.execute(
+                "SELECT codigo, presenca FROM gestao_casas ORDER BY posicao"
+            ).fetchall()
+        coluna_codigo = self.database.get_meta("gestao_coluna_codigo") or "codigo"
+
+        if not rows:
+            return PresenceMatrix(
+                [], documentos, np.zeros((len(documentos), 0)), coluna_codigo
+            )
+
+        codigos = [row["codigo"] for row in rows]
+        n_bytes = (len(documentos) + 7) // 8
+        packed = np.frombuffer(
+            b"".join(row["presenca"] for row in rows), dtype=np.uint8
+        ).reshape(len(rows), n_bytes)
+        mask = np.unpackbits(packed, axis=1, count=len(documentos)).astype(bool)
+        return PresenceMatrix.from_mask(codigos, documentos, mask, coluna_codigo)
+
+    def save(self, presence: PresenceMatrix) -> None:
+        packed = np.packbits(presence.to_mask(), axis=1)
+        with self.database.lock, self.database.connection as conn:
+            conn.execute("DELETE FROM gestao_documentos")
+            conn.execute("DELETE FROM gestao_casas")
+            conn.executemany(
+                "INSERT INTO gestao_documentos (posicao, nome) VALUES (?, ?)",
+                enumerate(presence.documentos),
+            )
+            conn.executemany(
+                "INSERT INTO gestao_casas (posicao, codigo, presenca) VALUES (?, ?, ?)",
+                (
+                    (idx, codigo, packed[idx].tobytes())
+                    for idx, codigo in enumerate(presence.codigos)
+                ),
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO meta (chave, valor) VALUES (?, ?)",
+                ("gestao_coluna_codigo", presence.coluna_codigo),
+            )
+
+    def delete(self) -> None:
+        with self.database.lock, self.database.connection as conn:
+            conn.execute("DELETE FROM gestao_documentos")
+            conn.execute("DELETE FROM gestao_casas")
+
+
+class SqliteObservacaoRepository(ObservacaoRepository):
+    """Observações guardadas na tabela observacoes, indexada por casa e documento."""
+
+    _COLUMNS = "id, casa_oracao_id, documento, comentario, data_criacao"
+
+    def __init__(self, database: SqliteDatabase):
+        self.database = database
+
+    @classmethod
+    def open(cls, data_dir: Path) -> "SqliteObservacaoRepository":
+        # Uma instância por banco, para que os índices em memória do
+        # ObservacaoService sejam compartilhados pelo processo
+        database = SqliteDatabase.open(data_dir)
+        with database.lock:
+            repository = database.observacao_repository
+            if repository is None:
+                repository = cls(database)
+                database.observacao_repository = repository
+        return repository
+
+    def _query(self, sql: str, params: tuple = ()) -> List[dict]:
+        with self.database.lock:
+            rows = self.database.connection.execute(sql, params).fetchall()
+        return [dict(row) for row in rows]
+
+    def records(self) -> List[dict]:
+        return self._query(f"SELECT {self._COLUMNS} FROM observacoes ORDER BY rowid")
+
+    def get(self, observacao_id: str) -> Optional[dict]:
+        rows = self._query(
+            f"SELECT {self._COLUMNS} FROM observacoes WHERE id = ?", (observacao_id,)
+        )
+        return rows[0] if rows else None
+
+    def by_casa(self, casa_oracao_id: str) -> List[dict]:
+        # Usa o índice idx_observacoes_casa (casa_oracao_id, documento)
+        return self._query(
+            f"SELECT {self._COLUMNS} FROM observacoes "
+            "WHERE casa_oracao_id = ? ORDER BY rowid",
+            (casa_oracao_id,),
+        )
+
+    def next_id(self) -> str:
+        # A sequência fica na tabela meta; na primeira alocação parte do
+        # maior id numérico existente
+        with self.database.lock, self.database.connection as conn:
+            row = conn.execute(
+                "SELECT valor FROM meta WHERE chave = 'observacoes_ultimo_id'"
+            ).fetchone()
+            if row is not None:
+                ultimo_id = int(row["valor"])
+            else:
+                ultimo_id = conn.execute(
+                    "SELECT COALESCE(MAX(CAST(id AS INTEGER)), 0) FROM observacoes "
+                    "WHERE id <> '' AND id NOT GLOB '*[^0-9]*'"
+                ).fetchone()[0]
+            ultimo_id += 1
+            conn.execute(
+                "INSERT OR REPLACE INTO meta (chave, valor) "
+                "VALUES ('observacoes_ultimo_id', ?)",
+                (str(ultimo_id),),
+            )
+        return str(ultimo_id)
+
+    def put(self, record: dict) -> None:
+        with self.database.lock, self.database.connection as conn:
+            conn.execute(
+                "INSERT INTO observacoes "
+                "(id, casa_oracao_id, documento, comentario, data_criacao) "
+                "VALUES (:id, :casa_oracao_id, :documento, :comentario, :data_criacao) "
+                "ON CONFLICT(id) DO UPDATE SET "
+                "casa_oracao_id = excluded.casa_oracao_id, "
+                "documento = excluded.documento, "
+                "comentario = excluded.comentario, "
+                "data_criacao = excluded.data_criacao",
+                record,
+            )
+
+    def delete(self, observacao_id: str) -> bool:
+        with self.database.lock, self.database.connection as conn:
+            cursor = conn.execute(
+                "DELETE FROM observacoes WHERE id = ?", (observacao_id,)
+            )
+        return cursor.rowcount > 0
+
+    def __len__(self) -> int:
+        with self.database.lock:
+            return self.database.connection.execute(
+                "SELECT COUNT(*) FROM observacoes"
+            ).fetchone()[0]
+
+
+def migrate_json_to_sqlite(data_dir: Path, database: SqliteDatabase) -> bool:
+    """
+    Importa (uma única vez) os arquivos JSON/NPZ de data/ para o banco SQLite.
+
+    Os arquivos originais não são removidos.
+
+    Args:
+        data_dir: Diretório de dados com casas.json, gestao.npz e observacoes.json
+        database: Banco de destino
+
+    Returns:
+        bool: True se a migração foi realizada
+    """
+    from gestao_vista.services.gestao_snapshot import GestaoSnapshotStore
+    from gestao_vista.services.observacao_journal import ObservacaoJournal
+    from gestao_vista.services.repository import JsonCasaRepository
+
+    if database.get_meta("migrado_de_json"):
+        return False
+
+    data_dir = Path(data_dir)
+    casas_repo = JsonCasaRepository(data_dir / "casas.json")
+    if casas_repo.exists():
+        SqliteCasaRepository(database).save(casas_repo.load())
+
+    gestao_store = GestaoSnapshotStore(data_dir / "gestao.npz")
+    gestao_store.migrate_from_json(data_dir / "gestao.json")
+    presence = gestao_store.load()
+    if presence is not None:
+        SqliteGestaoRepository(database).save(presence)
+
+    observacoes_file = data_dir / "observacoes.json"
+    if observacoes_file.exists() or observacoes_file.with_suffix(".jsonl").exists():
+        observacoes_repo = SqliteObservacaoRepository(database)
+        journal = ObservacaoJournal(observacoes_file)
+        for record in journal.records():
+            observacoes_repo.put(record)
+        # Continua a sequência do journal (observacoes.seq), para que ids de
+        # observações já excluídas não sejam reutilizados
+        database.set_meta("observacoes_ultimo_id", str(journal.last_id))
+
+    database.set_meta("migrado_de_json", "1")
+    return True
@@ -0,0 +1,218 @@
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from gestao_vista.models.presence_matrix import PresenceMatrix
+from gestao_vista.services.observacao_service import ObservacaoService
+
+# Situação de cada documento em cada casa
+STATUS_FALTANTE = 0
+STATUS_COM_OBSERVACAO = 1
+STATUS_PRESENTE = 2
+
+# Quantidade de matrizes de situação guardadas em memória
+MAX_CACHED_MATRICES = 4
+
+
+class StatusMatrix:
+    """
+    Situação de cada documento em cada casa (casas x documentos, int8).
+
+    Junta a matriz de presença ao índice de observações: o documento está
+    presente (STATUS_PRESENTE), faltante com observação
+    (STATUS_COM_OBSERVACAO) ou faltante (STATUS_FALTANTE). A presença só muda
+    com um novo snapshot; as observações são atualizadas por casa.
+    """
+
+    def __init__(self, presence: PresenceMatrix, observacao_service: ObservacaoService):
+        """
+        Monta a matriz de forma vetorizada.
+
+        Args:
+            presence: Matriz de presença do Gestão à Vista
+            observacao_service: Serviço com o índice de observações
+        """
+        self.presence = presence
+        self._observacao_service = observacao_service
+        self._lock = threading.Lock()
+        self._mask = presence.to_mask()
+
+        observadas = np.zeros_like(self._mask)
+        codigo_index = presence.codigo_index
+        documento_index = presence.documento_index
+        for casa, documento in observacao_service.index.by_casa_documento:
+            row = codigo_index.get(casa)
+            col = documento_index.get(documento)
+            if row is not None and col is not None:
+                observadas[row, col] = True
+
+        self.status = np.where(
+            self._mask,
+            np.int8(STATUS_PRESENTE),
+            np.where(
+                observadas, np.int8(STATUS_COM_OBSERVACAO), np.int8(STATUS_FALTANTE)
+            ),
+        ).astype(np.int8)
+
+    @property
+    def documentos(self) -> List[str]:
+        return self.presence.documentos
+
+    def _colunas(self, documentos: Optional[Iterable[str]]) -> np.ndarray:
+        """Converte nomes de documentos em índices de coluna."""
+        if documentos is None:
+            return np.arange(self.presence.n_documentos)
+        return np.array(
+            [self.presence.documento_index[d] for d in documentos], dtype=np.intp
+        )
+
+    def row(self, codigo: str) -> Optional[np.ndarray]:
+        """Retorna a situação de todos os documentos de uma casa."""
+        idx = self.presence.codigo_index.get(str(codigo).strip())
+        if idx is None:
+            return None
+        return self.status[idx]
+
+    def gather(
+        self, codigos: Iterable[str], documentos: Optional[Iterable[str]] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Seleciona as linhas das casas e as colunas dos documentos.
+
+        Args:
+            codigos: Códigos das casas, na ordem desejada
+            documentos: Documentos a incluir (None para todos)
+
+        Returns:
+            Tuple com a situação (códigos x documentos) e um array booleano que
+            indica quais códigos existem na matriz (os ausentes ficam como
+            STATUS_FALTANTE)
+        """
+        codigo_index = self.presence.codigo_index
+        posicoes = np.fromiter(
+            (codigo_index.get(str(codigo).strip(), -1) for codigo in codigos),
+            dtype=np.intp,
+        )
+        encontrados = posicoes >= 0
+        colunas = self._colunas(documentos)
+        if self.presence.n_casas == 0:
+            return (
+                np.full((len(posicoes), len(colunas)), STATUS_FALTANTE, dtype=np.int8),
+                encontrados,
+            )
+        with self._lock:
+            status = self.status[np.ix_(np.where(encontrados, posicoes, 0), colunas)]
+        status[~encontrados] = STATUS_FALTANTE
+        return status, encontrados
+
+    def count(
+        self, situacao: int, documentos: Optional[Iterable[str]] = None
+    ) -> np.ndarray:
+        """
+        Conta, por casa, quantos documentos estão na situação informada.
+
+        Args:
+            situacao: STATUS_PRESENTE, STATUS_COM_OBSERVACAO ou STATUS_FALTANTE
+            documentos: Documentos considerados (None para todos)
+        """
+        colunas = self._colunas(documentos)
+        with self._lock:
+            return (self.status[:, colunas] == situacao).sum(axis=1, dtype=np.int64)
+
+    def pendentes(self, codigo: str) -> List[str]:
+        """Documentos faltantes e ainda sem observação da casa."""
+        status = self.row(codigo)
+        if status is None:
+            return []
+        documentos = self.presence.documentos
+        return [documentos[i] for i in np.flatnonzero(status == STATUS_FALTANTE)]
+
+    def refresh_casa(self, casa_oracao_id: str):
+        """
+        Recalcula a situação dos documentos faltantes de uma casa.
+
+        Args:
+            casa_oracao_id: Código da casa cujas observações mudaram
+        """
+        idx = self.presence.codigo_index.get(str(casa_oracao_id).strip())
+        if idx is None:
+            return
+        observados = self._observacao_service.documentos_com_observacao(casa_oracao_id)
+        observada = np.array(
+            [documento in observados for documento in self.presence.documentos],
+            dtype=bool,
+        )
+        with self._lock:
+            self.status[idx] = np.where(
+                self._mask[idx],
+                STATUS_PRESENTE,
+                np.where(observada, STATUS_COM_OBSERVACAO, STATUS_FALTANTE),
+            )
+
+
+# Matrizes por (repositório de observações, versão do snapshot): a situação
+# depende das observações do repositório, não apenas da matriz de presença
+_matrices: "OrderedDict[Tuple[int, int], StatusMatrix]" = OrderedDict()
+_matrices_lock = threading.Lock()
+# Listener de cada repositório (um só por repositório, para não duplicar)
+_listeners: Dict[int, Callable[[List[str]], None]] = {}
+
+
+def _on_observacao_changed(repository_key: int, casa_oracao_ids: List[str]):
+    """Atualiza as matrizes do repositório quando observações mudam."""
+    with _matrices_lock:
+        matrices = [
+            matrix for key, matrix in _matrices.items() if key[0] == repository_key
+        ]
+    for matrix in matrices:
+        for casa_oracao_id in casa_oracao_ids:
+            matrix.refresh_casa(casa_oracao_id)
+
+
+def _listener_for(repository_key: int) -> Callable[[List[str]], None]:
+    """Retorna o listener das matrizes de um repositório de observações."""
+    with _matrices_lock:
+        listener = _listeners.get(repository_key)
+        if listener is None:
+
+            def listener(casa_oracao_ids: List[str]):
+                _on_observacao_changed(repository_key, casa_oracao_ids)
+
+            _listeners[repository_key] = listener
+        return listener
+
+
+class StatusMatrixService:
+    """
+    Mantém as matrizes de situação (uma por snapshot), atualizadas
+    incrementalmente pelas observações.
+    """
+
+    def __init__(self, observacao_service: Optional[ObservacaoService] = None):
+        self.observacao_service = observacao_service or ObservacaoService()
+        self._repository_key = id(self.observacao_service.repository)
+        self.observacao_service.subscribe(_listener_for(self._repository_key))
+
+    def matrix(self, presence: PresenceMatrix) -> StatusMatrix:
+        """
+        Retorna a matriz de situação do snapshot (montada uma única vez).
+
+        Args:
+            presence: Matriz de presença do Gestão à Vista
+        """
+        key = (self._repository_key, presence.version)
+        with _matrices_lock:
+            matrix = _matrices.get(key)
+            if matrix is not None:
+                _matrices.move_to_end(key)
+                return matrix
+
+        matrix = StatusMatrix(presence, self.observacao_service)
+
+        with _matrices_lock:
+            _matrices[key] = matrix
+            while len(_matrices) > MAX_CACHED_MATRICES:
+                _matrices.popitem(last=False)
+        return matrix
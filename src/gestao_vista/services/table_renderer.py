@@ -0,0 +1,660 @@
+import math
+import os
+from dataclasses import dataclass, replace
+from functools import lru_cache
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.backends.backend_pdf import PdfPages
+from matplotlib.collections import LineCollection
+from matplotlib.colors import to_rgb
+from matplotlib.figure import Figure
+from matplotlib.font_manager import FontProperties
+from matplotlib.patches import PathPatch
+from matplotlib.path import Path
+from matplotlib.textpath import TextPath
+from PIL import Image
+
+from gestao_vista.services.export_planner import (
+    FORMATOS_EM_FAIXAS,
+    ExportPlan,
+    ExportPlanner,
+    PngStreamWriter,
+)
+from gestao_vista.services.status_matrix_service import (
+    STATUS_COM_OBSERVACAO,
+    STATUS_FALTANTE,
+    STATUS_PRESENTE,
+)
+from gestao_vista.utils.design_system import DESIGN_SYSTEM
+
+# Tamanho (em polegadas) da unidade da grade: altura de uma linha e largura
+# da coluna de um documento
+CELL_INCHES = 0.3
+
+# Larguras (em unidades da grade) das colunas fixas, do espaço entre as
+# metades e da margem
+PERCENT_WIDTH = 2.8
+SPACE_WIDTH = 0.6
+HALF_GAP = 1.5
+MARGIN = 0.5
+
+# Largura aproximada de um caractere em negrito 14pt, em unidades da grade
+CHAR_WIDTH = 0.48
+
+# Página do PDF (A4 paisagem), margem e altura do rodapé, em polegadas
+PAPEL_PDF = (11.69, 8.27)
+MARGEM_PAPEL = 0.4
+ALTURA_RODAPE = 0.3
+
+# Cor das células de documentos faltantes com observação
+COR_COM_OBSERVACAO = "#FFA726"
+
+# Fonte dos nomes e percentuais desenhados como contornos
+_FONTE_NEGRITO = FontProperties(weight="bold")
+
+
+def _vertices_desenhados(caminho: Path) -> np.ndarray:
+    """
+    Vértices do caminho, sem os de CLOSEPOLY (que não são desenhados).
+
+    Os pontos de controle das curvas ficam junto ao contorno, então os
+    limites desses vértices bastam para centralizar o texto, sem o custo de
+    Path.get_extents sobre cada curva.
+    """
+    return caminho.vertices[caminho.codes != Path.CLOSEPOLY]
+
+
+@lru_cache(maxsize=64)
+def _centro_vertical(tamanho: float) -> float:
+    """Altura (em pontos) do centro de "lp", usada como va="center" do Text."""
+    caminho = TextPath((0, 0), "lp", size=tamanho, prop=_FONTE_NEGRITO)
+    y = _vertices_desenhados(caminho)[:, 1]
+    return (y.min() + y.max()) / 2
+
+
+@lru_cache(maxsize=4096)
+def _contorno_texto(texto: str, tamanho: float) -> Path:
+    """
+    Contorno do texto em negrito, centrado na origem, em unidades da grade.
+
+    O eixo y é invertido (a grade cresce para baixo) e todos os textos do
+    mesmo tamanho compartilham a linha de base, como no Text com va="center".
+    """
+    if not texto.strip():
+        return Path(np.empty((0, 2)), np.empty(0, dtype=Path.code_type), readonly=True)
+
+    caminho = TextPath((0, 0), texto, size=tamanho, prop=_FONTE_NEGRITO)
+    vertices = np.array(caminho.vertices, dtype=float)
+    x = _vertices_desenhados(caminho)[:, 0]
+    vertices[:, 0] -= (x.min() + x.max()) / 2
+    vertices[:, 1] = _centro_vertical(tamanho) - vertices[:, 1]
+    vertices /= 72 * CELL_INCHES
+    return Path(vertices, caminho.codes, readonly=True)
+
+
+@dataclass
+class TableGridData:
+    """
+    Dados da tabela de documentos por casa.
+
+    Attributes:
+        nomes: Nome de cada casa (uma linha por casa)
+        obrigatorios: Documentos obrigatórios (colunas à esquerda)
+        opcionais: Documentos opcionais (colunas à direita)
+        status: Situação de cada documento (casas x obrigatórios + opcionais)
+        percentuais_obrigatorios: Texto do % de obrigatórios de cada casa
+        percentuais_opcionais: Texto do % de opcionais de cada casa
+    """
+
+    nomes: List[str]
+    obrigatorios: List[str]
+    opcionais: List[str]
+    status: np.ndarray
+    percentuais_obrigatorios: List[str]
+    percentuais_opcionais: List[str]
+
+    def recorte(self, inicio: int, fim: int) -> "TableGridData":
+        """Dados apenas das casas [inicio, fim)."""
+        return TableGridData(
+            nomes=self.nomes[inicio:fim],
+            obrigatorios=self.obrigatorios,
+            opcionais=self.opcionais,
+            status=self.status[inicio:fim],
+            percentuais_obrigatorios=self.percentuais_obrigatorios[inicio:fim],
+            percentuais_opcionais=self.percentuais_opcionais[inicio:fim],
+        )
+
+
+@dataclass
+class TableGridLayout:
+    """
+    Geometria da tabela em unidades da grade (uma unidade = CELL_INCHES).
+
+    O eixo y cresce para baixo: o cabeçalho ocupa [0, altura_cabecalho] e a
+    linha i de cada metade ocupa [altura_cabecalho + i, altura_cabecalho + i + 1].
+    A figura inteira vai de -MARGIN até a base do corpo mais MARGIN.
+
+    Attributes:
+        bordas: Bordas das colunas de uma metade
+        altura_cabecalho: Altura do cabeçalho (o corpo começa a uma quantidade
+            inteira de unidades do topo da figura)
+        n_casas: Total de casas
+        metade: Linhas de cada metade
+        n_metades: Quantidade de metades (1 ou 2)
+    """
+
+    bordas: np.ndarray
+    altura_cabecalho: float
+    n_casas: int
+    metade: int
+    n_metades: int
+
+    @classmethod
+    def from_data(cls, data: TableGridData) -> "TableGridLayout":
+        """Calcula a geometria a partir dos textos e documentos da tabela."""
+        n_casas = len(data.nomes)
+        metade = n_casas // 2 + n_casas % 2
+
+        cabecalhos = data.obrigatorios + data.opcionais + ["% Obrig.", "% Opc."]
+        largura_nome = (
+            CHAR_WIDTH * max(len(texto) for texto in data.nomes + ["Casa de Oração"])
+            + 0.8
+        )
+        altura_cabecalho = max(
+            3.0, CHAR_WIDTH * max(len(texto) for texto in cabecalhos) + 0.8
+        )
+        # Arredondar para que as linhas fiquem alinhadas aos pixels nas faixas
+        altura_cabecalho = np.ceil(altura_cabecalho + MARGIN) - MARGIN
+
+        larguras = (
+            [largura_nome]
+            + [1.0] * len(data.obrigatorios)
+            + [PERCENT_WIDTH, SPACE_WIDTH]
+            + [1.0] * len(data.opcionais)
+            + [PERCENT_WIDTH]
+        )
+        return cls(
+            bordas=np.concatenate([[0.0], np.cumsum(larguras)]),
+            altura_cabecalho=float(altura_cabecalho),
+            n_casas=n_casas,
+            metade=metade,
+            n_metades=2 if n_casas > metade else 1,
+        )
+
+    def paginado(self, casas_por_pagina: int) -> "TableGridLayout":
+        """
+        Mesma geometria para páginas de tamanho fixo com casas_por_pagina casas.
+
+        Args:
+            casas_por_pagina: Casas por página (divididas nas duas metades)
+        """
+        metade = casas_por_pagina // 2 + casas_por_pagina % 2
+        return replace(
+            self,
+            n_casas=casas_por_pagina,
+            metade=metade,
+            n_metades=2 if casas_por_pagina > metade else 1,
+        )
+
+    @property
+    def largura_metade(self) -> float:
+        return float(self.bordas[-1])
+
+    @property
+    def largura_total(self) -> float:
+        """Largura da figura, com as margens."""
+        return (
+            self.largura_metade * self.n_metades
+            + HALF_GAP * (self.n_metades - 1)
+            + 2 * MARGIN
+        )
+
+    def faixa(self, inicio: int, fim: int) -> Tuple[float, float]:
+        """
+        Limites verticais (topo, base) da figura que mostra as linhas [inicio, fim).
+
+        A primeira faixa inclui a margem superior e o cabeçalho; a última, a
+        margem inferior.
+        """
+        topo = -MARGIN if inicio == 0 else self.altura_cabecalho + inicio
+        base = self.altura_cabecalho + fim + (MARGIN if fim >= self.metade else 0)
+        return topo, base
+
+
+class TableGridRenderer:
+    """
+    Desenha a tabela de documentos por casa como uma grade.
+
+    As células coloridas de cada bloco de documentos são uma única malha
+    (pcolormesh), as bordas são uma LineCollection por metade e os nomes e
+    percentuais de cada coluna são um único contorno (PathPatch), em vez de
+    um Text por célula; só os cabeçalhos são Text. O layout é o
+    da tabela exportada: casas divididas em duas metades lado a lado,
+    cabeçalhos girados, colunas de percentual e laranja para documentos
+    faltantes com observação.
+
+    A tabela pode ser desenhada por faixas de linhas, o que permite gravar
+    imagens grandes sem rasterizar a tabela inteira de uma vez (ver save), ou
+    em páginas de papel, com os nomes e percentuais como texto (ver save_pdf).
+    """
+
+    @staticmethod
+    def render(
+        data: TableGridData,
+        layout: Optional[TableGridLayout] = None,
+        inicio: int = 0,
+        fim: Optional[int] = None,
+        fig: Optional[Figure] = None,
+        papel: Optional[Tuple[float, float]] = None,
+        escala: float = 1.0,
+    ) -> Figure:
+        """
+        Monta a Figure da tabela (fora do pyplot).
+
+        Sem papel, a Figure tem o tamanho da tabela e os nomes e percentuais
+        são contornos (para rasterização). Com papel, a tabela é reduzida por
+        escala e posicionada no canto superior esquerdo da página, e os nomes e
+        percentuais ficam como texto (selecionável no PDF).
+
+        Args:
+            data: Dados da tabela
+            layout: Geometria da tabela (None para calcular)
+            inicio: Primeira linha (de cada metade) desenhada
+            fim: Linha final exclusiva (None para até o fim)
+            fig: Figure a reaproveitar, limpa antes de desenhar (None para
+                criar uma nova)
+            papel: Tamanho da página (largura, altura), em polegadas
+            escala: Redução da tabela na página (apenas com papel)
+        """
+        layout = layout or TableGridLayout.from_data(data)
+        fim = layout.metade if fim is None else fim
+        topo, base = layout.faixa(inicio, fim)
+        largura = layout.largura_total * CELL_INCHES
+        altura = (base - topo) * CELL_INCHES
+
+        if fig is None:
+            fig = Figure(facecolor="white")
+        else:
+            fig.clear()
+        if papel is None:
+            escala = 1.0
+            fig.set_size_inches(largura, altura)
+            ax = fig.add_axes((0, 0, 1, 1))
+        else:
+            fig.set_size_inches(*papel)
+            largura_papel, altura_papel = papel
+            ax = fig.add_axes(
+                (
+                    MARGEM_PAPEL / largura_papel,
+                    1 - (MARGEM_PAPEL + altura * escala) / altura_papel,
+                    largura * escala / largura_papel,
+                    altura * escala / altura_papel,
+                )
+            )
+        ax.set_xlim(-MARGIN, layout.largura_total - MARGIN)
+        ax.set_ylim(base, topo)
+        ax.axis("off")
+
+        # Cores por situação do documento
+        cores = np.zeros((3, 3), dtype=float)
+        cores[STATUS_PRESENTE] = to_rgb(DESIGN_SYSTEM["colors"]["success"])
+        cores[STATUS_COM_OBSERVACAO] = to_rgb(COR_COM_OBSERVACAO)
+        cores[STATUS_FALTANTE] = to_rgb(DESIGN_SYSTEM["colors"]["error"])
+
+        for parte in range(layout.n_metades):
+            primeira = parte * layout.metade
+            TableGridRenderer._desenhar_metade(
+                ax,
+                data,
+                layout,
+                primeira,
+                inicio,
+                min(fim, layout.n_casas - primeira),
+                cores,
+                x0=parte * (layout.largura_metade + HALF_GAP),
+                escala=escala,
+                contornos=papel is None,
+            )
+        return fig
+
+    @staticmethod
+    def save(
+        data: TableGridData,
+        file_path: str,
+        dpi: float = 300,
+        planner: Optional[ExportPlanner] = None,
+    ) -> ExportPlan:
+        """
+        Grava a tabela respeitando o orçamento de memória do planejador.
+
+        PNG é rasterizado em faixas e gravado em streaming; JPEG é montado a
+        partir das faixas (com o DPI reduzido se preciso); PDF é vetorial e
+        paginado (ver save_pdf).
+
+        Args:
+            data: Dados da tabela
+            file_path: Caminho do arquivo (a extensão define o formato)
+            dpi: DPI desejado
+            planner: Planejador de exportação (None para o orçamento padrão)
+
+        Returns:
+            ExportPlan: Plano usado na gravação
+        """
+        layout = TableGridLayout.from_data(data)
+        plano = (planner or ExportPlanner()).plan(
+            largura=layout.largura_total,
+            topo=layout.altura_cabecalho + MARGIN,
+            n_linhas=layout.metade,
+            base=MARGIN,
+            unidade_pol=CELL_INCHES,
+            dpi=dpi,
+            formato=os.path.splitext(file_path)[1].lstrip(".") or "png",
+        )
+
+        if plano.vetorial:
+            TableGridRenderer.save_pdf(data, file_path)
+            return plano
+
+        # Uma única Figure (e canvas) desenha todas as faixas
+        fig = Figure(facecolor="white")
+        FigureCanvasAgg(fig)
+        faixas = (
+            TableGridRenderer._rasterizar(data, layout, plano, inicio, fim, fig)
+            for inicio, fim in plano.faixas
+        )
+        if plano.formato in FORMATOS_EM_FAIXAS:
+            with PngStreamWriter(
+                file_path, plano.largura_px, plano.altura_px, plano.dpi
+            ) as writer:
+                for pixels in faixas:
+                    writer.write(pixels)
+        else:
+            # Montar direto na imagem do PIL (Image.fromarray copiaria tudo)
+            imagem = Image.new("RGB", (plano.largura_px, plano.altura_px), "white")
+            linha = 0
+            for pixels in faixas:
+                imagem.paste(Image.fromarray(pixels), (0, linha))
+                linha += len(pixels)
+            imagem.save(file_path, dpi=(plano.dpi, plano.dpi))
+        return plano
+
+    @staticmethod
+    def save_pdf(
+        data: TableGridData,
+        file_path: str,
+        casas_por_pagina: Optional[int] = None,
+        papel: Tuple[float, float] = PAPEL_PDF,
+    ) -> int:
+        """
+        Grava a tabela em um PDF paginado, no tamanho de papel informado.
+
+        Cada página tem até casas_por_pagina casas, divididas igualmente nas
+        duas metades, com os cabeçalhos (obrigatórios e opcionais) repetidos.
+        A tabela é reduzida para caber na largura do papel, com a mesma escala
+        e as mesmas colunas em todas as páginas. Cada página é gravada e
+        liberada antes da próxima, então a memória não cresce com a quantidade
+        de casas.
+
+        Args:
+            data: Dados da tabela
+            file_path: Caminho do arquivo PDF
+            casas_por_pagina: Casas por página (None para preencher a altura
+                do papel)
+            papel: Tamanho da página (largura, altura), em polegadas
+
+        Returns:
+            int: Quantidade de páginas gravadas
+        """
+        layout = TableGridLayout.from_data(data)
+        largura_util = papel[0] - 2 * MARGEM_PAPEL
+        altura_util = papel[1] - 2 * MARGEM_PAPEL - ALTURA_RODAPE
+        altura_fixa = layout.altura_cabecalho + 2 * MARGIN
+
+        # A escala vem da largura das duas metades; a altura que sobra define
+        # quantas linhas cabem em cada metade
+        escala = largura_util / (layout.paginado(2).largura_total * CELL_INCHES)
+        if casas_por_pagina is None:
+            linhas = math.floor(altura_util / (escala * CELL_INCHES) - altura_fixa)
+            casas_por_pagina = 2 * max(1, linhas)
+        casas_por_pagina = max(1, casas_por_pagina)
+        escala = min(
+            escala,
+            largura_util
+            / (layout.paginado(casas_por_pagina).largura_total * CELL_INCHES),
+            altura_util
+            / ((altura_fixa + layout.paginado(casas_por_pagina).metade) * CELL_INCHES),
+        )
+        inicios = range(0, max(len(data.nomes), 1), casas_por_pagina)
+
+        with PdfPages(
+            file_path, metadata={"Title": "Gestão à Vista - Documentos por Casa"}
+        ) as pdf:
+            for numero, inicio in enumerate(inicios, start=1):
+                pagina = data.recorte(inicio, inicio + casas_por_pagina)
+                # A última página divide as casas que sobraram entre as metades
+                fig = TableGridRenderer.render(
+                    pagina,
+                    layout.paginado(len(pagina.nomes)),
+                    papel=papel,
+                    escala=escala,
+                )
+                fig.text(
+                    0.99,
+                    0.005,
+                    f"Página {numero} de {len(inicios)}",
+                    ha="right",
+                    va="bottom",
+                    color="black",
+                    fontsize=9,
+                )
+                pdf.savefig(fig, facecolor="white")
+
+                # Liberar a página antes de desenhar a próxima
+                fig.clear()
+        return len(inicios)
+
+    @staticmethod
+    def _rasterizar(
+        data: TableGridData,
+        layout: TableGridLayout,
+        plano: ExportPlan,
+        inicio: int,
+        fim: int,
+        fig: Figure,
+    ) -> np.ndarray:
+        """Rasteriza as linhas [inicio, fim) em um array RGB (uint8), na Figure."""
+        topo, base = layout.faixa(inicio, fim)
+        pixels = plano.pixels_por_unidade
+        # Posições em pixels a partir do topo da figura inteira, para que as
+        # faixas se encaixem sem sobra nem sobreposição
+        y0 = round((topo + MARGIN) * pixels)
+        y1 = round((base + MARGIN) * pixels)
+
+        TableGridRenderer.render(data, layout, inicio, fim, fig=fig)
+        fig.set_dpi(plano.dpi)
+        fig.set_size_inches(plano.largura_px / plano.dpi, (y1 - y0) / plano.dpi)
+        fig.canvas.draw()
+        rgba = np.asarray(fig.canvas.buffer_rgba())
+
+        # Completar/cortar diferenças de arredondamento do Agg (no máximo 1px)
+        faixa = np.full((y1 - y0, plano.largura_px, 3), 255, dtype=np.uint8)
+        altura = min(len(faixa), rgba.shape[0])
+        largura = min(plano.largura_px, rgba.shape[1])
+        faixa[:altura, :largura] = rgba[:altura, :largura, :3]
+        return faixa
+
+    @staticmethod
+    def _desenhar_metade(
+        ax,
+        data: TableGridData,
+        layout: TableGridLayout,
+        primeira: int,
+        inicio: int,
+        fim: int,
+        cores: np.ndarray,
+        x0: float,
+        escala: float = 1.0,
+        contornos: bool = True,
+    ):
+        """
+        Desenha as linhas [inicio, fim) de uma metade a partir da posição x0.
+
+        Args:
+            primeira: Índice (em data) da primeira casa da metade
+            inicio: Primeira linha desenhada
+            fim: Linha final exclusiva (já limitada às casas da metade)
+            escala: Redução aplicada às fontes e às bordas
+            contornos: Desenhar nomes e percentuais como contornos (False
+                para Text)
+        """
+        bordas = layout.bordas
+        cabecalho = inicio == 0
+        largura_borda = 0.5 * escala
+        if fim <= inicio:
+            # Uma faixa que começa exatamente no fim da metade ainda completa
+            # a borda inferior dela (cortada ao meio pela faixa anterior)
+            if 0 < inicio == fim:
+                y = layout.altura_cabecalho + fim
+                ax.add_collection(
+                    LineCollection(
+                        [((x0, y), (x0 + bordas[-1], y))],
+                        colors="black",
+                        linewidths=largura_borda,
+                    )
+                )
+            return
+
+        n_obrig = len(data.obrigatorios)
+        linhas = slice(primeira + inicio, primeira + fim)
+        nomes = data.nomes[linhas]
+        status = data.status[linhas]
+        n_linhas = len(nomes)
+        y0 = layout.altura_cabecalho + inicio
+        y1 = y0 + n_linhas
+        col_perc_obrig = 1 + n_obrig
+        col_opc = col_perc_obrig + 2
+        col_perc_opc = len(bordas) - 2
+
+        # Células dos documentos: uma malha de quadriláteros por bloco
+        # (obrigatórios e opcionais), pintada de uma vez pelas cores da situação
+        if n_linhas:
+            for coluna, bloco in (
+                (1, status[:, :n_obrig]),
+                (col_opc, status[:, n_obrig:]),
+            ):
+                if bloco.shape[1]:
+                    ax.pcolormesh(
+                        x0 + bordas[coluna : coluna + bloco.shape[1] + 1],
+                        y0 + np.arange(n_linhas + 1),
+                        cores[bloco],
+                        shading="flat",
+                        antialiased=False,
+                    )
+
+        # Bordas: horizontais de todas as linhas e verticais de todas as colunas
+        ys = y0 + np.arange(n_linhas + 1)
+        if cabecalho:
+            ys = np.concatenate([[0.0], ys])
+        y_topo = 0.0 if cabecalho else y0
+        horizontais = [((x0, y), (x0 + bordas[-1], y)) for y in ys]
+        verticais = [((x0 + x, y_topo), (x0 + x, y1)) for x in bordas]
+        ax.add_collection(
+            LineCollection(
+                horizontais + verticais, colors="black", linewidths=largura_borda
+            )
+        )
+
+        centros = x0 + (bordas[:-1] + bordas[1:]) / 2
+
+        # Cabeçalhos
+        if cabecalho:
+            ax.text(
+                centros[0],
+                y0 - 0.5,
+                "Casa de Oração",
+                ha="center",
+                va="center",
+                color="black",
+                fontweight="bold",
+                fontsize=15 * escala,
+            )
+            rotulos = {
+                1 + i: documento for i, documento in enumerate(data.obrigatorios)
+            }
+            rotulos.update(
+                {col_opc + i: documento for i, documento in enumerate(data.opcionais)}
+            )
+            rotulos[col_perc_obrig] = "% Obrig."
+            rotulos[col_perc_opc] = "% Opc."
+            for col, texto in rotulos.items():
+                ax.text(
+                    centros[col],
+                    y0 - 0.3,
+                    texto,
+                    ha="center",
+                    va="bottom",
+                    rotation=90,
+                    color="black",
+                    fontweight="bold",
+                    fontsize=14 * escala,
+                )
+
+        # Nomes e percentuais de cada casa: um contorno por coluna ou, no
+        # papel, texto
+        ys = y0 + np.arange(n_linhas) + 0.5
+        for col, textos, tamanho in (
+            (0, nomes, 14),
+            (col_perc_obrig, data.percentuais_obrigatorios[linhas], 13),
+            (col_perc_opc, data.percentuais_opcionais[linhas], 13),
+        ):
+            if contornos:
+                TableGridRenderer._desenhar_textos(
+                    ax, textos, centros[col], ys, tamanho
+                )
+                continue
+            for texto, y in zip(textos, ys):
+                ax.text(
+                    centros[col],
+                    y,
+                    texto,
+                    ha="center",
+                    va="center",
+                    color="black",
+                    fontweight="bold",
+                    fontsize=tamanho * escala,
+                )
+
+    @staticmethod
+    def _desenhar_textos(
+        ax, textos: Sequence[str], x: float, ys: np.ndarray, tamanho: float
+    ):
+        """
+        Desenha textos centrados em (x, ys[i]) como um único PathPatch.
+
+        Os contornos de cada texto ficam em cache, então percentuais repetidos
+        (e as mesmas casas em outra exportação) não são refeitos.
+
+        Args:
+            textos: Textos, um por linha
+            x: Centro horizontal da coluna
+            ys: Centro vertical de cada linha
+            tamanho: Tamanho da fonte, em pontos
+        """
+        contornos = [_contorno_texto(texto, tamanho) for texto in textos]
+        if not any(len(contorno.vertices) for contorno in contornos):
+            return
+        vertices = np.concatenate(
+            [contorno.vertices + (x, y) for contorno, y in zip(contornos, ys)]
+        )
+        codigos = np.concatenate([contorno.codes for contorno in contornos])
+        # add_artist (e não add_patch) evita recalcular os limites do eixo
+        ax.add_artist(
+            PathPatch(
+                Path(vertices, codigos),
+                facecolor="black",
+                edgecolor="none",
+                transform=ax.transData,
+            )
+        )
@@ -0,0 +1,257 @@
+import os
+from dataclasses import dataclass
+from tkinter import filedialog, messagebox
+from typing import List, Optional, Sequence, Tuple
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+from openpyxl import Workbook
+
+from gestao_vista.models.presence_matrix import PresenceMatrix
+from gestao_vista.services.gestao_history import GestaoHistoryStore
+from gestao_vista.services.report_service import write_sheet
+from gestao_vista.utils.constants import is_documento_obrigatorio
+from gestao_vista.utils.design_system import DESIGN_SYSTEM
+
+
+@dataclass
+class TrendAnalysis:
+    """
+    Séries históricas de um conjunto de períodos, alinhados pelo código da
+    casa e pelo nome do documento.
+
+    Attributes:
+        rotulos: Rótulos dos períodos, do mais antigo para o mais recente
+        codigos: Casas de todos os períodos (ordem de primeira aparição)
+        documentos: Documentos de todos os períodos
+        contagens: Casas com cada documento (períodos x documentos)
+        total_casas: Total de casas de cada período
+        primeira_conformidade: Índice do primeiro período em que a casa tinha
+            todos os documentos obrigatórios (-1 se nunca teve)
+    """
+
+    rotulos: List[str]
+    codigos: List[str]
+    documentos: List[str]
+    contagens: np.ndarray
+    total_casas: np.ndarray
+    primeira_conformidade: np.ndarray
+
+    @property
+    def percentuais(self) -> np.ndarray:
+        """Percentual de casas com cada documento (períodos x documentos)."""
+        total = self.total_casas[:, None].astype(float)
+        return np.divide(
+            self.contagens * 100.0,
+            total,
+            out=np.zeros(self.contagens.shape, dtype=float),
+            where=total > 0,
+        )
+
+    def series_dataframe(self) -> pd.DataFrame:
+        """Série de contagens por documento (uma linha por período)."""
+        df = pd.DataFrame(self.contagens, columns=self.documentos)
+        df.insert(0, "Total de casas", self.total_casas)
+        df.insert(0, "Período", self.rotulos)
+        return df
+
+    def primeira_conformidade_dataframe(self) -> pd.DataFrame:
+        """Primeiro período em que cada casa ficou conforme nos obrigatórios."""
+        rotulos = np.asarray(self.rotulos + [""], dtype=object)
+        return pd.DataFrame(
+            {
+                "codigo": self.codigos,
+                "Primeira conformidade": rotulos[self.primeira_conformidade],
+            }
+        )
+
+
+class TrendAnalysisService:
+    """
+    Análise de tendência de N períodos do Gestão à Vista.
+
+    Todos os períodos são empilhados em um único array booleano
+    (períodos x casas x documentos), de onde saem as séries por documento e a
+    primeira conformidade de cada casa.
+    """
+
+    @staticmethod
+    def analyze(periodos: Sequence[Tuple[str, PresenceMatrix]]) -> TrendAnalysis:
+        """
+        Calcula as séries dos períodos informados.
+
+        Args:
+            periodos: Pares (rótulo, matriz), do mais antigo para o mais recente
+        """
+        rotulos = [rotulo for rotulo, _ in periodos]
+        matrizes = [presence for _, presence in periodos]
+
+        codigos = list(
+            dict.fromkeys(c for presence in matrizes for c in presence.codigos)
+        )
+        documentos = list(
+            dict.fromkeys(d for presence in matrizes for d in presence.documentos)
+        )
+
+        # períodos x casas x documentos (casas ausentes no período ficam False)
+        cubo = np.stack([presence.align(codigos, documentos) for presence in matrizes])
+        existe = np.stack(
+            [
+                np.fromiter(
+                    (c in presence.codigo_index for c in codigos),
+                    dtype=bool,
+                    count=len(codigos),
+                )
+                for presence in matrizes
+            ]
+        )
+
+        obrigatorio = np.array(
+            [is_documento_obrigatorio(d) for d in documentos], dtype=bool
+        )
+        if obrigatorio.any():
+            conforme = existe & cubo[:, :, obrigatorio].all(axis=2)
+            primeira = np.where(conforme.any(axis=0), conforme.argmax(axis=0), -1)
+        else:
+            # Sem documentos obrigatórios nenhuma casa é considerada conforme
+            # (all() sobre um eixo vazio seria True em todos os períodos)
+            primeira = np.full(len(codigos), -1, dtype=np.intp)
+
+        return TrendAnalysis(
+            rotulos=rotulos,
+            codigos=codigos,
+            documentos=documentos,
+            contagens=cubo.sum(axis=1, dtype=np.int64),
+            total_casas=np.array([p.n_casas for p in matrizes], dtype=np.int64),
+            primeira_conformidade=primeira,
+        )
+
+    @staticmethod
+    def analyze_history(
+        history: GestaoHistoryStore, limite: Optional[int] = None
+    ) -> TrendAnalysis:
+        """
+        Calcula as séries dos períodos gravados no histórico.
+
+        Args:
+            history: Histórico dos períodos importados
+            limite: Quantidade máxima de períodos (os mais recentes)
+        """
+        periodos = [
+            (f"{period['rotulo']} ({period['importado_em'][:10]})", presence)
+            for period, presence in history.iter_presences()
+        ]
+        if limite is not None:
+            periodos = periodos[-limite:]
+        return TrendAnalysisService.analyze(periodos)
+
+    @staticmethod
+    def plot_trend(analysis: TrendAnalysis):
+        """
+        Gera o gráfico de tendência (% de casas com cada documento por período).
+
+        Args:
+            analysis: Séries calculadas por analyze
+        """
+        plt.style.use("dark_background")
+        fig, ax = plt.subplots(
+            figsize=(15, 8),
+            facecolor=DESIGN_SYSTEM["colors"]["background"]["default"],
+        )
+
+        x = np.arange(len(analysis.rotulos))
+        percentuais = analysis.percentuais
+        for idx, documento in enumerate(analysis.documentos):
+            obrigatorio = is_documento_obrigatorio(documento)
+            ax.plot(
+                x,
+                percentuais[:, idx],
+                marker="o",
+                linestyle="-" if obrigatorio else "--",
+                linewidth=2 if obrigatorio else 1.2,
+                label=documento,
+            )
+
+        ax.set_ylabel("% de Casas com o Documento", fontsize=12)
+        ax.set_title("Tendência por Documento", fontsize=14, pad=20)
+        ax.set_xticks(x)
+        ax.set_xticklabels(analysis.rotulos, rotation=45, ha="right")
+        ax.set_ylim(0, 105)
+        ax.grid(True, alpha=0.2)
+        ax.legend(loc="center left", bbox_to_anchor=(1.01, 0.5), fontsize=9)
+
+        plt.tight_layout()
+        return fig
+
+    @staticmethod
+    def generate_trend_analysis(history: GestaoHistoryStore) -> bool:
+        """
+        Gera e salva o gráfico de tendência dos períodos do histórico, com uma
+        planilha das séries e da primeira conformidade de cada casa.
+
+        Args:
+            history: Histórico dos períodos importados
+
+        Returns:
+            bool: True se a análise foi salva
+        """
+        if len(history.periods()) < 2:
+            messagebox.showwarning(
+                "⚠️ Aviso",
+                "São necessários pelo menos dois períodos importados para "
+                "gerar a análise de tendência.",
+            )
+            return False
+
+        try:
+            analysis = TrendAnalysisService.analyze_history(history)
+            fig = TrendAnalysisService.plot_trend(analysis)
+
+            file_path = filedialog.asksaveasfilename(
+                defaultextension=".png",
+                filetypes=[
+                    ("PNG files", "*.png"),
+                    ("JPEG files", "*.jpg"),
+                    ("PDF files", "*.pdf"),
+                ],
+                title="Salvar análise de tendência como",
+                initialfile="analise_tendencia.png",
+            )
+
+            if not file_path:
+                plt.close(fig)
+                return False
+
+            fig.savefig(
+                file_path,
+                facecolor=fig.get_facecolor(),
+                bbox_inches="tight",
+                dpi=300,
+            )
+            plt.close(fig)
+
+            # Planilha com as séries, ao lado do gráfico
+            excel_path = os.path.splitext(file_path)[0] + "_series.xlsx"
+            workbook = Workbook(write_only=True)
+            write_sheet(workbook, analysis.series_dataframe(), "Séries por Documento")
+            write_sheet(
+                workbook,
+                analysis.primeira_conformidade_dataframe(),
+                "Primeira Conformidade",
+            )
+            workbook.save(excel_path)
+
+            messagebox.showinfo(
+                "✅ Sucesso",
+                "Análise de tendência gerada com sucesso!\n"
+                f"Períodos analisados: {len(analysis.rotulos)}\n"
+                f"Séries: {os.path.basename(excel_path)}",
+            )
+            return True
+
+        except Exception as e:
+            messagebox.showerror(
+                "❌ Erro", f"Erro ao gerar análise de tendência: {str(e)}"
+            )
+            return False
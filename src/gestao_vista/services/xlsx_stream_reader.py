@@ -0,0 +1,286 @@
+import posixpath
+import zipfile
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+from xml.etree.ElementTree import iterparse, parse
+
+import numpy as np
+import pandas as pd
+
+_NS_MAIN = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+_NS_REL = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+_NS_PKG_REL = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+# Valores que o pandas interpreta como vazios (NaN) por padrão ao ler planilhas
+_NA_VALUES = {
+    "",
+    "#N/A",
+    "#N/A N/A",
+    "#NA",
+    "-1.#IND",
+    "-1.#QNAN",
+    "-NaN",
+    "-nan",
+    "1.#IND",
+    "1.#QNAN",
+    "<NA>",
+    "N/A",
+    "NA",
+    "NULL",
+    "NaN",
+    "None",
+    "n/a",
+    "nan",
+    "null",
+}
+
+
+@dataclass
+class GestaoSheet:
+    """
+    Conteúdo bruto da planilha de Gestão à Vista, antes da normalização.
+
+    Guarda apenas o necessário para montar a matriz de presença: os
+    cabeçalhos, os códigos de uma coluna e, para cada célula, se contém "X"
+    e se está preenchida.
+    """
+
+    headers: List[Optional[str]]
+    codigo_column: int
+    codigos: List[str]
+    presenca: np.ndarray
+    preenchidas: np.ndarray
+
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame) -> "GestaoSheet":
+        """
+        Converte o DataFrame lido pelo pandas (dtype=str) para o formato bruto.
+
+        Args:
+            df: DataFrame com os cabeçalhos já aplicados
+        """
+        headers = [
+            None if str(col).startswith("Unnamed") else str(col) for col in df.columns
+        ]
+        preenchidas = df.notna().to_numpy()
+        presenca = np.zeros(df.shape, dtype=bool)
+        for idx in range(df.shape[1]):
+            coluna = df.iloc[:, idx]
+            presenca[:, idx] = coluna.str.strip().str.upper().eq("X").to_numpy()
+
+        # A coluna de código é a primeira coluna nomeada com algum valor
+        codigo_column = next(
+            (
+                idx
+                for idx, header in enumerate(headers)
+                if header is not None and preenchidas[:, idx].any()
+            ),
+            0,
+        )
+        codigos = (
+            df.iloc[:, codigo_column].astype(str).tolist() if len(df.columns) else []
+        )
+        return cls(headers, codigo_column, codigos, presenca, preenchidas)
+
+
+def _column_index(ref: str) -> int:
+    """Converte a referência da célula ("AB15") no índice da coluna (0-based)."""
+    idx = 0
+    for char in ref:
+        if not char.isalpha():
+            break
+        idx = idx * 26 + (ord(char.upper()) - 64)
+    return idx - 1
+
+
+def _dedup_headers(headers: List[Optional[str]]) -> List[Optional[str]]:
+    """
+    Renomeia cabeçalhos repetidos como o pandas ao ler a linha de cabeçalhos.
+
+    A segunda ocorrência de "Foo" vira "Foo.1", a terceira "Foo.2", e assim
+    por diante; sufixos que já são nomes de outra coluna da linha são pulados
+    (com "Foo", "Foo.1", "Foo" a última vira "Foo.2"), como no pandas.
+
+    Args:
+        headers: Cabeçalhos da planilha (None para colunas sem nome)
+    """
+    names = list(headers)
+    counts: Dict[str, int] = {}
+    for idx, header in enumerate(names):
+        if header is None:
+            continue
+        name = header
+        count = counts.get(header, 0)
+        while count > 0:
+            counts[header] = count + 1
+            name = f"{header}.{count}"
+            if name in names:
+                count += 1
+            else:
+                count = counts.get(name, 0)
+        names[idx] = name
+        counts[name] = count + 1
+    return names
+
+
+def _first_sheet_path(package: zipfile.ZipFile) -> str:
+    """Localiza o XML da primeira planilha do workbook."""
+    workbook = parse(package.open("xl/workbook.xml")).getroot()
+    sheet = workbook.find(f"{_NS_MAIN}sheets/{_NS_MAIN}sheet")
+    if sheet is None:
+        raise ValueError("A planilha não contém abas")
+    rel_id = sheet.get(f"{_NS_REL}id")
+
+    rels = parse(package.open("xl/_rels/workbook.xml.rels")).getroot()
+    for rel in rels.iter(f"{_NS_PKG_REL}Relationship"):
+        if rel.get("Id") == rel_id:
+            target = rel.get("Target")
+            if target.startswith("/"):
+                return target.lstrip("/")
+            return posixpath.normpath(posixpath.join("xl", target))
+    raise ValueError("Não foi possível localizar a primeira aba da planilha")
+
+
+def _shared_strings(package: zipfile.ZipFile) -> List[str]:
+    """Carrega a tabela de strings compartilhadas (sharedStrings.xml)."""
+    if "xl/sharedStrings.xml" not in package.namelist():
+        return []
+
+    strings = []
+    sst = None
+    with package.open("xl/sharedStrings.xml") as f:
+        for event, elem in iterparse(f, events=("start", "end")):
+            if event == "start":
+                if elem.tag == f"{_NS_MAIN}sst":
+                    sst = elem
+                continue
+            if elem.tag == f"{_NS_MAIN}si":
+                # Texto simples (<t>) ou rico (<r><t>), ignorando a fonética (<rPh>)
+                parts = [t.text or "" for t in elem.findall(f"{_NS_MAIN}t")]
+                parts += [
+                    t.text or "" for t in elem.findall(f"{_NS_MAIN}r/{_NS_MAIN}t")
+                ]
+                strings.append("".join(parts))
+                # Desligar o <si> já lido da raiz para não acumular a árvore
+                if sst is not None:
+                    sst.clear()
+    return strings
+
+
+def _cell_text(elem, shared: List[str]) -> Optional[str]:
+    """Retorna o valor da célula como texto (None se vazia)."""
+    cell_type = elem.get("t", "n")
+
+    if cell_type == "inlineStr":
+        node = elem.find(f"{_NS_MAIN}is")
+        if node is None:
+            return None
+        return "".join(t.text or "" for t in node.iter(f"{_NS_MAIN}t"))
+
+    value = elem.find(f"{_NS_MAIN}v")
+    if value is None or value.text is None:
+        return None
+    text = value.text
+
+    if cell_type == "s":
+        return shared[int(text)]
+    if cell_type == "b":
+        return "True" if text == "1" else "False"
+    if cell_type == "n":
+        number = float(text)
+        return str(int(number)) if number.is_integer() else str(number)
+    return text
+
+
+def read_gestao_sheet(file_path: str, header_row: int = 14) -> Optional[GestaoSheet]:
+    """
+    Lê a planilha de Gestão à Vista (.xlsx) em streaming.
+
+    O XML da primeira aba é percorrido linha a linha: as linhas antes do
+    cabeçalho são descartadas e, das demais, só são guardados o texto da
+    coluna de código e as flags de presença/preenchimento de cada célula.
+
+    Args:
+        file_path: Caminho para o arquivo .xlsx
+        header_row: Índice (0-based) da linha de cabeçalhos
+
+    Returns:
+        GestaoSheet com os dados brutos, ou None se a planilha precisar ser
+        lida pelo pandas (primeira coluna nomeada sem nenhum valor)
+    """
+    header_number = header_row + 1  # Linhas no XML são numeradas a partir de 1
+
+    with zipfile.ZipFile(file_path) as package:
+        shared = _shared_strings(package)
+        sheet_path = _first_sheet_path(package)
+
+        headers: List[Optional[str]] = []
+        codigo_column = 0
+        codigos: List[str] = []
+        # Flags das linhas lidas, um byte por célula (sem um array por linha)
+        presenca_bytes = bytearray()
+        preenchidas_bytes = bytearray()
+        row_cells: Dict[int, str] = {}
+        row_number = 0
+        sheet_data = None
+
+        with package.open(sheet_path) as f:
+            for event, elem in iterparse(f, events=("start", "end")):
+                if event == "start":
+                    if elem.tag == f"{_NS_MAIN}row":
+                        row_number = int(elem.get("r", row_number + 1))
+                        row_cells = {}
+                    elif elem.tag == f"{_NS_MAIN}sheetData":
+                        sheet_data = elem
+                    continue
+
+                if elem.tag == f"{_NS_MAIN}c":
+                    # Linhas antes do cabeçalho são descartadas sem ler as células
+                    if row_number >= header_number:
+                        text = _cell_text(elem, shared)
+                        if text is not None and text not in _NA_VALUES:
+                            ref = elem.get("r")
+                            col = _column_index(ref) if ref else len(row_cells)
+                            row_cells[col] = text
+                    elem.clear()
+
+                elif elem.tag == f"{_NS_MAIN}row":
+                    if row_number == header_number:
+                        n_cols = max(row_cells) + 1 if row_cells else 0
+                        headers = _dedup_headers(
+                            [row_cells.get(col) for col in range(n_cols)]
+                        )
+                        named = [idx for idx, h in enumerate(headers) if h is not None]
+                        if not named:
+                            return None
+                        codigo_column = named[0]
+                    elif row_number > header_number and headers:
+                        presenca = np.zeros(len(headers), dtype=bool)
+                        preenchidas = np.zeros(len(headers), dtype=bool)
+                        for col, text in row_cells.items():
+                            if col < len(headers):
+                                preenchidas[col] = True
+                                presenca[col] = text.strip().upper() == "X"
+                        codigos.append(row_cells.get(codigo_column, "nan"))
+                        presenca_bytes += presenca.tobytes()
+                        preenchidas_bytes += preenchidas.tobytes()
+                    # Desligar a linha já processada de <sheetData>; apenas
+                    # limpá-la deixaria um elemento vazio por linha na árvore
+                    if sheet_data is not None:
+                        sheet_data.clear()
+                    else:
+                        elem.clear()
+
+    if not headers:
+        return None
+
+    shape = (len(codigos), len(headers))
+    presenca = np.frombuffer(presenca_bytes, dtype=bool).reshape(shape)
+    preenchidas = np.frombuffer(preenchidas_bytes, dtype=bool).reshape(shape)
+
+    # Se a primeira coluna nomeada estiver vazia, a coluna de código seria
+    # outra; nesse caso a leitura completa pelo pandas decide
+    if not preenchidas[:, codigo_column].any():
+        return None
+
+    return GestaoSheet(headers, codigo_column, codigos, presenca, preenchidas)
@@ -2,10 +2,12 @@ import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 import pandas as pd
 import platform
+from typing import Optional
 
 from gestao_vista.services.comparative_analysis_service import (
     ComparativeAnalysisService,
 )
+from gestao_vista.models.presence_matrix import PresenceMatrix
 from gestao_vista.services.data_service import DataService
 from gestao_vista.utils.design_system import DESIGN_SYSTEM
 from gestao_vista.ui.components import create_button
@@ -22,15 +24,18 @@ class ComparativeAnalysisUI:
         self.data_service = data_service
         self.comparative_service = ComparativeAnalysisService()
 
-    def show_dialog(self, current_data: pd.DataFrame):
+    def show_dialog(
+        self, current_data: pd.DataFrame, presence: Optional[PresenceMatrix] = None
+    ):
         """
         Mostra o diálogo de análise comparativa.
 
         Args:
             current_data: DataFrame com os dados atuais
+            presence: Matriz de presença dos dados atuais (opcional)
         """
         # Configurar serviço com dados atuais
-        self.comparative_service.set_current_data(current_data)
+        self.comparative_service.set_current_data(current_data, presence)
 
         # Criar janela de diálogo
         dialog = tk.Toplevel()
@@ -103,14 +108,15 @@ class ComparativeAnalysisUI:
 
             if file_path:
                 try:
-                    comparison_data = self.data_service.import_gestao_from_excel(
+                    comparison_presence = self.data_service.import_gestao_presence(
                         file_path,
                         should_save=False,  # Não salvar os dados de comparação
                     )
-                    if comparison_data is not None:
+                    if comparison_presence is not None:
                         self.comparative_service.set_comparison_data(
-                            comparison_data,
+                            comparison_presence.to_dataframe(),
                             name_entry.get().strip() or "Período Anterior",
+                            comparison_presence,
                         )
                         self.file_label.config(
                             text=f"Arquivo selecionado: {file_path.split('/')[-1]}"
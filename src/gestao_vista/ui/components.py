@@ -142,6 +142,7 @@ def create_sidebar(
     on_clear_casas: Callable,
     on_view_casas: Callable,
     on_observacoes: Callable,
+    on_export_all: Optional[Callable] = None,
 ) -> Tuple[ttk.Frame, Tuple[ttk.Frame, tk.Button]]:
     """
     Cria a sidebar com os controles principais.
@@ -155,6 +156,7 @@ def create_sidebar(
         on_clear_casas: Callback para limpar dados das casas
         on_view_casas: Callback para visualizar casas
         on_observacoes: Callback para gerenciar observações
+        on_export_all: Callback para exportar os faltantes de todos os documentos
     """
     # Frame principal da sidebar com fundo escuro
     sidebar = ttk.Frame(root, style="Card.TFrame")
@@ -175,6 +177,8 @@ def create_sidebar(
         ("📝 Observações", on_observacoes, "secondary"),
         ("🗑️ Limpar Gestão", on_clear_gestao, "error"),
     ]
+    if on_export_all is not None:
+        buttons.insert(3, ("📦 Exportar Todos os Faltantes", on_export_all, "success"))
 
     for text, command, style in buttons:
         btn = create_button(content_frame, text, command, style)
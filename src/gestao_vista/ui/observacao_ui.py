@@ -1,6 +1,7 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 from gestao_vista.services.observacao_service import ObservacaoService
+from gestao_vista.services.status_matrix_service import StatusMatrixService
 from gestao_vista.services.casa_oracao_service import CasaOracaoService
 from gestao_vista.models.observacao import Observacao
 from gestao_vista.ui.styles import *
@@ -20,6 +21,7 @@ class ObservacaoUI:
     ):
         self.root = root
         self.observacao_service = ObservacaoService()
+        self.status_matrix_service = StatusMatrixService(self.observacao_service)
         self.casa_oracao_service = casa_oracao_service
         self.data_service = data_service
 
@@ -268,34 +270,24 @@ class ObservacaoUI:
         casa = self.casas_dict[casa_key]
 
         # Carregar dados do Gestão à Vista
-        df_gestao = self.data_service.load_gestao()
-        if df_gestao is None or df_gestao.empty:
+        presence = self.data_service.load_presence()
+        if presence.is_empty:
             messagebox.showerror(
                 "Erro", "Por favor, carregue primeiro o arquivo de Gestão à Vista!"
             )
             return
 
-        # Encontrar a linha correspondente à casa selecionada
-        casa_row = df_gestao[df_gestao["codigo"] == casa.codigo]
-        if casa_row.empty:
+        # Situação dos documentos da casa selecionada
+        status = self.status_matrix_service.matrix(presence)
+        if status.row(casa.codigo) is None:
             messagebox.showerror(
                 "Erro",
                 f"Casa de código {casa.codigo} não encontrada no arquivo de Gestão à Vista!",
             )
             return
 
-        # Carregar observações existentes para esta casa
-        observacoes_existentes = self.observacao_service.listar_observacoes_por_casa(
-            casa.codigo
-        )
-        documentos_com_observacao = {obs.documento for obs in observacoes_existentes}
-
-        # Identificar documentos faltantes (colunas onde não tem "X" e não tem observação)
-        documentos_faltantes = []
-        for coluna in df_gestao.columns[1:]:  # Ignorar a coluna 'codigo'
-            valor = str(casa_row[coluna].iloc[0]).upper().strip()
-            if valor != "X" and coluna not in documentos_com_observacao:
-                documentos_faltantes.append(coluna)
+        # Documentos faltantes (sem documento e sem observação)
+        documentos_faltantes = status.pendentes(casa.codigo)
 
         if not documentos_faltantes:
             messagebox.showinfo(
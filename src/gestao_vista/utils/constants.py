@@ -1,5 +1,18 @@
 """Constantes utilizadas no sistema."""
 
+import os
+import unicodedata
+from bisect import bisect_right
+from collections import deque
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+# Backend de persistência: "json" (arquivos em data/) ou "sqlite" (data/gestao_vista.db)
+STORAGE_BACKEND = os.environ.get("GESTAO_VISTA_STORAGE", "json").strip().lower()
+
+# Memória máxima (em MB) usada para rasterizar imagens exportadas
+EXPORT_MEMORY_BUDGET_MB = int(os.environ.get("GESTAO_VISTA_EXPORT_BUDGET_MB", "256"))
+
 DOCUMENTOS = {
     # Documentos de Propriedade
     "Escritura Definitiva - Compra e Venda/Permuta": "Escritura de Compra e Venda",
@@ -44,10 +57,19 @@ DOCUMENTOS_OBRIGATORIOS = [
 ]
 
 
+# Versão das regras de normalização de documentos. Incrementar sempre que
+# DOCUMENTOS ou normalizar_nome_documento mudarem, para invalidar importações
+# guardadas em cache.
+NORMALIZADOR_VERSAO = 1
+
+# Versão da leitura das planilhas de Gestão à Vista (leitor, mesclagem de
+# colunas duplicadas). Incrementar sempre que a importação mudar, para
+# invalidar importações guardadas em cache.
+IMPORTADOR_VERSAO = 3
+
+
 def _normalizar_texto(texto: str) -> str:
     """Normaliza o texto removendo espaços extras, acentos e convertendo para minúsculo."""
-    import unicodedata
-
     # Remover acentos
     texto = (
         unicodedata.normalize("NFKD", texto).encode("ASCII", "ignore").decode("ASCII")
@@ -56,22 +78,105 @@ def _normalizar_texto(texto: str) -> str:
     return texto.lower().strip()
 
 
-def normalizar_nome_documento(nome: str) -> str:
-    """Normaliza o nome do documento conforme o dicionário DOCUMENTOS."""
-    # Criar um dicionário com chaves normalizadas
-    docs_normalizados = {_normalizar_texto(k): v for k, v in DOCUMENTOS.items()}
+class _CasadorDocumentos:
+    """
+    Localiza, em uma única passada, a primeira chave de DOCUMENTOS (na ordem
+    do dicionário) que contém o nome ou está contida nele.
+
+    As chaves normalizadas são calculadas uma única vez. Para "chave contida
+    no nome" é usado um autômato de Aho-Corasick sobre as chaves; para "nome
+    contido na chave" basta uma busca no texto de todas as chaves concatenadas
+    com um separador, pois a primeira ocorrência pertence à chave de menor
+    índice.
+    """
+
+    _SEPARADOR = "\0"
 
-    # Normalizar o nome de entrada
-    nome_normalizado = _normalizar_texto(nome)
+    def __init__(self, documentos: Dict[str, str]):
+        docs_normalizados = {_normalizar_texto(k): v for k, v in documentos.items()}
+        self.chaves = list(docs_normalizados)
+        self.valores = list(docs_normalizados.values())
 
-    # Procurar correspondência
-    for key, value in docs_normalizados.items():
-        if nome_normalizado in key or key in nome_normalizado:
-            return value
+        # Texto com todas as chaves e o índice da chave em cada posição
+        self._texto = self._SEPARADOR.join(self.chaves)
+        self._inicios = []
+        posicao = 0
+        for chave in self.chaves:
+            self._inicios.append(posicao)
+            posicao += len(chave) + 1
 
-    return nome
+        # Autômato: transições, link de falha e menor índice de chave
+        # reconhecida em cada estado (incluindo as herdadas pelos links)
+        self._transicoes: List[Dict[str, int]] = [{}]
+        self._falha = [0]
+        self._saida = [len(self.chaves)]
+        for idx, chave in enumerate(self.chaves):
+            estado = 0
+            for char in chave:
+                proximo = self._transicoes[estado].get(char)
+                if proximo is None:
+                    proximo = len(self._transicoes)
+                    self._transicoes[estado][char] = proximo
+                    self._transicoes.append({})
+                    self._falha.append(0)
+                    self._saida.append(len(self.chaves))
+                estado = proximo
+            self._saida[estado] = min(self._saida[estado], idx)
+
+        fila = deque(self._transicoes[0].values())
+        while fila:
+            estado = fila.popleft()
+            for char, proximo in self._transicoes[estado].items():
+                falha = self._falha[estado]
+                while falha and char not in self._transicoes[falha]:
+                    falha = self._falha[falha]
+                destino = self._transicoes[falha].get(char, 0)
+                self._falha[proximo] = destino if destino != proximo else 0
+                self._saida[proximo] = min(
+                    self._saida[proximo], self._saida[self._falha[proximo]]
+                )
+                fila.append(proximo)
+
+    def _chave_no_nome(self, nome: str) -> int:
+        """Menor índice de chave contida no nome (len(chaves) se nenhuma)."""
+        melhor = self._saida[0]
+        estado = 0
+        for char in nome:
+            while estado and char not in self._transicoes[estado]:
+                estado = self._falha[estado]
+            estado = self._transicoes[estado].get(char, 0)
+            melhor = min(melhor, self._saida[estado])
+        return melhor
+
+    def _nome_na_chave(self, nome: str) -> int:
+        """Menor índice de chave que contém o nome (len(chaves) se nenhuma)."""
+        if self._SEPARADOR in nome:
+            return len(self.chaves)
+        posicao = self._texto.find(nome)
+        if posicao < 0:
+            return len(self.chaves)
+        return bisect_right(self._inicios, posicao) - 1
+
+    def buscar(self, nome_normalizado: str) -> Optional[str]:
+        """Retorna o valor da primeira chave correspondente (None se nenhuma)."""
+        idx = min(
+            self._nome_na_chave(nome_normalizado),
+            self._chave_no_nome(nome_normalizado),
+        )
+        return self.valores[idx] if idx < len(self.chaves) else None
+
+
+_casador_documentos = _CasadorDocumentos(DOCUMENTOS)
+
+
+@lru_cache(maxsize=1024)
+def normalizar_nome_documento(nome: str) -> str:
+    """Normaliza o nome do documento conforme o dicionário DOCUMENTOS."""
+    valor = _casador_documentos.buscar(_normalizar_texto(nome))
+    return nome if valor is None else valor
 
 
+@lru_cache(maxsize=1024)
 def is_documento_obrigatorio(nome: str) -> bool:
     """Verifica se um documento é obrigatório."""
     nome_normalizado = normalizar_nome_documento(nome)
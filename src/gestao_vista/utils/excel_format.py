@@ -0,0 +1,70 @@
+"""Detecção do formato de planilhas pelo conteúdo do arquivo."""
+
+import zipfile
+
+# Assinatura de arquivos OLE2 (Excel 97-2003, .xls)
+OLE2_MAGIC = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"
+# Assinatura de arquivos ZIP (.xlsx, .ods)
+ZIP_MAGIC = b"PK\x03\x04"
+
+ODS_MIMETYPE = "application/vnd.oasis.opendocument.spreadsheet"
+
+
+def detect_excel_engine(file_path: str) -> str:
+    """
+    Identifica o engine do pandas adequado para a planilha, sem tentar lê-la.
+
+    O formato é identificado pelos bytes iniciais (OLE2 ou ZIP) e, no caso de
+    arquivos ZIP, pelo conteúdo do pacote (workbook do Excel ou mimetype ODF).
+
+    Args:
+        file_path: Caminho para a planilha
+
+    Returns:
+        str: "openpyxl" (.xlsx), "xlrd" (.xls) ou "odf" (.ods)
+
+    Raises:
+        ValueError: Se o formato não for suportado
+    """
+    with open(file_path, "rb") as f:
+        header = f.read(8)
+
+    if not header:
+        raise ValueError("O arquivo está vazio.")
+
+    if header.startswith(OLE2_MAGIC):
+        return "xlrd"
+
+    if header.startswith(ZIP_MAGIC):
+        try:
+            with zipfile.ZipFile(file_path) as package:
+                names = set(package.namelist())
+                if "xl/workbook.xml" in names:
+                    return "openpyxl"
+                if "xl/workbook.bin" in names:
+                    raise ValueError(
+                        "Planilhas binárias do Excel (.xlsb) não são suportadas. "
+                        "Salve o arquivo como .xlsx e tente novamente."
+                    )
+                if "mimetype" in names:
+                    mimetype = package.read("mimetype").decode("ascii", "ignore")
+                    if mimetype.strip() == ODS_MIMETYPE:
+                        return "odf"
+                    raise ValueError(
+                        f"Documento OpenDocument não é uma planilha ({mimetype})."
+                    )
+        except zipfile.BadZipFile:
+            raise ValueError("O arquivo ZIP da planilha está corrompido.")
+        raise ValueError(
+            "O arquivo é um pacote ZIP, mas não contém uma planilha .xlsx ou .ods."
+        )
+
+    if header.lstrip().startswith(b"<"):
+        raise ValueError(
+            "O arquivo é HTML/XML, não uma planilha Excel. "
+            "Abra-o no Excel e salve como .xlsx."
+        )
+
+    raise ValueError(
+        "Formato de planilha não reconhecido. Use arquivos .xlsx, .xls ou .ods."
+    )
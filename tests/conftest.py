@@ -0,0 +1,7 @@
+import os
+import sys
+from pathlib import Path
+
+# Executar os testes sem instalar o pacote e sem abrir janelas
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+os.environ.setdefault("MPLBACKEND", "Agg")
@@ -0,0 +1,57 @@
+import numpy as np
+
+from gestao_vista.models.presence_matrix import PresenceMatrix
+from gestao_vista.services.comparative_analysis_service import (
+    ComparativeAnalysisService,
+)
+
+
+def _service():
+    atual = PresenceMatrix.from_mask(
+        ["101", "102", "103"],
+        ["Habite-se", "CNO", "REURB"],
+        np.array([[1, 1, 1], [0, 1, 0], [1, 0, 1]], dtype=bool),
+    )
+    anterior = PresenceMatrix.from_mask(
+        ["101", "102", "104"],
+        ["Habite-se", "CNO", "Bombeiros"],
+        np.array([[0, 1, 1], [1, 1, 0], [1, 1, 1]], dtype=bool),
+    )
+    service = ComparativeAnalysisService()
+    service.set_current_data(atual.to_dataframe(), atual)
+    service.set_comparison_data(anterior.to_dataframe(), "Janeiro", anterior)
+    return service
+
+
+def test_ganhos_e_perdas_apenas_de_casas_e_documentos_dos_dois_periodos():
+    diff = _service().per_casa_diff()
+
+    assert diff.codigos == ["101", "102", "103", "104"]
+    assert diff.documentos == ["Habite-se", "CNO", "REURB", "Bombeiros"]
+    mudancas = diff.mudancas_dataframe()
+    assert sorted(map(tuple, mudancas.values.tolist())) == [
+        ("101", "Habite-se", "Ganhou"),
+        ("102", "Habite-se", "Perdeu"),
+    ]
+    # REURB só existe no período atual e Bombeiros só no anterior
+    assert not diff.ganhou[:, 2].any() and not diff.perdeu[:, 3].any()
+    assert not diff.inalterado[:, 2:].any()
+
+    resumo = diff.resumo_dataframe()
+    assert resumo["Documento"].tolist() == ["Habite-se", "CNO"]
+    assert resumo["Ganharam"].tolist() == [1, 0]
+    assert resumo["Perderam"].tolist() == [1, 0]
+    assert resumo["Sem alteração"].tolist() == [0, 2]
+
+
+def test_casas_e_documentos_de_um_periodo_sao_listados_a_parte():
+    diff = _service().per_casa_diff()
+
+    assert diff.casas_um_periodo_dataframe("Janeiro").values.tolist() == [
+        ["103", "Atual"],
+        ["104", "Janeiro"],
+    ]
+    assert diff.documentos_um_periodo_dataframe("Janeiro").values.tolist() == [
+        ["REURB", "Atual"],
+        ["Bombeiros", "Janeiro"],
+    ]
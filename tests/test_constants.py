@@ -0,0 +1,42 @@
+import random
+
+from gestao_vista.utils.constants import (
+    DOCUMENTOS,
+    _normalizar_texto,
+    normalizar_nome_documento,
+)
+
+
+def _normalizar_nome_documento_original(nome):
+    """Implementação anterior: varre DOCUMENTOS a cada chamada."""
+    docs_normalizados = {_normalizar_texto(k): v for k, v in DOCUMENTOS.items()}
+    nome_normalizado = _normalizar_texto(nome)
+    for key, value in docs_normalizados.items():
+        if nome_normalizado in key or key in nome_normalizado:
+            return value
+    return nome
+
+
+def _nomes():
+    nomes = ["", " ", "Documento Desconhecido", "habite-se 2024", "ALVARÁ"]
+    for chave, valor in DOCUMENTOS.items():
+        nomes += [chave, valor, chave.upper(), f"  {chave} (cópia) ", valor.lower()]
+
+    rng = random.Random(9)
+    chaves = list(DOCUMENTOS)
+    for _ in range(500):
+        chave = rng.choice(chaves)
+        inicio = rng.randrange(len(chave))
+        fim = rng.randrange(inicio, len(chave)) + 1
+        nomes.append(chave[inicio:fim])
+        nomes.append(f"{rng.choice(chaves)} / {chave[inicio:fim]}")
+    return nomes
+
+
+def test_casador_equivale_a_busca_original():
+    divergentes = [
+        nome
+        for nome in _nomes()
+        if normalizar_nome_documento(nome) != _normalizar_nome_documento_original(nome)
+    ]
+    assert divergentes == []
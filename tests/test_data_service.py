@@ -0,0 +1,48 @@
+import numpy as np
+
+from gestao_vista.services.data_service import DataService
+from gestao_vista.services.xlsx_stream_reader import GestaoSheet
+
+
+def _sheet(headers, linhas):
+    valores = np.array(linhas, dtype=object)
+    preenchidas = valores != None  # noqa: E711
+    presenca = np.vectorize(lambda v: v == "X", otypes=[bool])(valores)
+    codigos = [str(codigo) for codigo in valores[:, 0]]
+    return GestaoSheet(headers, 0, codigos, presenca, preenchidas)
+
+
+def test_colunas_do_mesmo_documento_sao_combinadas(tmp_path):
+    service = DataService(str(tmp_path))
+    sheet = _sheet(
+        [
+            "Código",
+            "AVCB - Auto de Vistoria do Corpo de Bombeiros",
+            "Habite-se",
+            None,
+            "CLCB - Certificado de Licença Corpo de Bombeiros",
+            "Habite-se.1",
+            "CNO – Cadastro Nacional de Obras",
+        ],
+        [
+            ["101", "X", None, "X", None, None, "X"],
+            ["102", None, None, None, "X", "X", None],
+            [None, None, None, None, None, None, None],
+            ["103", None, "X", None, "X", None, None],
+            ["104", "", None, None, None, None, None],
+        ],
+    )
+
+    presence = service._normalize_gestao_sheet(sheet)
+
+    assert presence.coluna_codigo == "codigo"
+    assert presence.codigos == ["101", "102", "103", "104"]
+    assert presence.documentos == ["Bombeiros", "Habite-se", "CNO"]
+    # Bombeiros = AVCB ou CLCB; Habite-se = Habite-se ou Habite-se.1; a
+    # coluna sem nome é descartada
+    assert presence.to_mask().tolist() == [
+        [True, False, True],
+        [True, True, False],
+        [True, True, False],
+        [False, False, False],
+    ]
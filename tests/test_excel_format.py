@@ -0,0 +1,59 @@
+import zipfile
+
+import pytest
+
+from gestao_vista.utils.excel_format import (
+    OLE2_MAGIC,
+    ODS_MIMETYPE,
+    detect_excel_engine,
+)
+
+
+def _zip(path, arquivos):
+    with zipfile.ZipFile(path, "w") as package:
+        for nome, conteudo in arquivos.items():
+            package.writestr(nome, conteudo)
+    return str(path)
+
+
+def test_xlsx_pelo_workbook_do_pacote(tmp_path):
+    # A extensão não importa, apenas o conteúdo
+    path = _zip(tmp_path / "gestao.xls", {"xl/workbook.xml": "<workbook/>"})
+    assert detect_excel_engine(path) == "openpyxl"
+
+
+def test_xls_pela_assinatura_ole2(tmp_path):
+    path = tmp_path / "gestao.xlsx"
+    path.write_bytes(OLE2_MAGIC + b"\x00" * 64)
+    assert detect_excel_engine(str(path)) == "xlrd"
+
+
+def test_ods_pelo_mimetype(tmp_path):
+    path = _zip(tmp_path / "gestao.ods", {"mimetype": ODS_MIMETYPE})
+    assert detect_excel_engine(path) == "odf"
+
+
+@pytest.mark.parametrize(
+    "conteudo, mensagem",
+    [
+        (b"", "vazio"),
+        (b"  <html><body></body></html>", "HTML"),
+        (b"codigo;Habite-se\n", "não reconhecido"),
+        (b"PK\x03\x04corrompido", "corrompido"),
+    ],
+)
+def test_formatos_invalidos(tmp_path, conteudo, mensagem):
+    path = tmp_path / "gestao.xlsx"
+    path.write_bytes(conteudo)
+    with pytest.raises(ValueError, match=mensagem):
+        detect_excel_engine(str(path))
+
+
+def test_xlsb_e_zip_sem_planilha(tmp_path):
+    xlsb = _zip(tmp_path / "a.xlsb", {"xl/workbook.bin": b"\x00"})
+    with pytest.raises(ValueError, match="xlsb"):
+        detect_excel_engine(xlsb)
+
+    outro = _zip(tmp_path / "b.zip", {"leiame.txt": "oi"})
+    with pytest.raises(ValueError, match="não contém uma planilha"):
+        detect_excel_engine(outro)
@@ -0,0 +1,83 @@
+import math
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from gestao_vista.services.export_planner import (
+    MAX_PIXELS_IMAGEM,
+    MIN_LINHAS_POR_FAIXA,
+    ExportPlanner,
+    PngStreamWriter,
+)
+
+# Grade parecida com a tabela exportada de 400 casas e 30 documentos
+GRADE = dict(largura=95.0, topo=13.0, base=0.5, unidade_pol=0.3)
+
+
+def test_jpeg_grande_reserva_faixas_com_linhas_minimas():
+    planner = ExportPlanner(orcamento_mb=256)
+    plano = planner.plan(n_linhas=200, dpi=300, formato="jpg", **GRADE)
+
+    assert plano.dpi < 300
+    assert len(plano.faixas) <= math.ceil(200 / MIN_LINHAS_POR_FAIXA)
+    assert all(
+        fim - inicio >= MIN_LINHAS_POR_FAIXA for inicio, fim in plano.faixas[:-1]
+    )
+    assert plano.faixas[0][0] == 0 and plano.faixas[-1][1] == 200
+    assert plano.pico_bytes <= planner.orcamento
+
+
+def test_png_mantem_dpi_e_divide_em_faixas():
+    planner = ExportPlanner(orcamento_mb=256)
+    plano = planner.plan(n_linhas=50, dpi=300, formato="png", **GRADE)
+
+    assert round(plano.dpi) == 300
+    assert len(plano.faixas) > 1
+    assert plano.pico_bytes <= planner.orcamento
+
+
+@pytest.mark.parametrize("formato", ["png", "jpg"])
+def test_imagem_grande_fica_abaixo_do_limite_de_pixels_do_pil(formato):
+    # 400 casas a 300 dpi dariam 8550 x 19215 pixels (~164M)
+    plano = ExportPlanner(orcamento_mb=4096).plan(
+        n_linhas=200, dpi=300, formato=formato, **GRADE
+    )
+
+    assert plano.dpi < 300
+    assert plano.largura_px * plano.altura_px <= MAX_PIXELS_IMAGEM
+    assert MAX_PIXELS_IMAGEM <= Image.MAX_IMAGE_PIXELS
+
+
+def test_grade_pequena_em_uma_faixa():
+    plano = ExportPlanner(orcamento_mb=256).plan(
+        n_linhas=5, dpi=300, formato="jpg", **GRADE
+    )
+
+    assert plano.faixas == [(0, 5)]
+
+
+def test_png_em_faixas_so_substitui_o_destino_quando_completo(tmp_path):
+    destino = tmp_path / "tabela.png"
+    with PngStreamWriter(str(destino), 4, 6, 300) as writer:
+        writer.write(np.zeros((3, 4, 3), dtype=np.uint8))
+        writer.write(np.full((3, 4, 3), 255, dtype=np.uint8))
+
+    with Image.open(destino) as imagem:
+        assert imagem.size == (4, 6)
+        assert imagem.getpixel((0, 5)) == (255, 255, 255)
+    assert list(tmp_path.iterdir()) == [destino]
+
+
+def test_png_interrompido_nao_deixa_arquivo_parcial(tmp_path):
+    destino = tmp_path / "tabela.png"
+    with pytest.raises(RuntimeError):
+        with PngStreamWriter(str(destino), 4, 6, 300) as writer:
+            writer.write(np.zeros((3, 4, 3), dtype=np.uint8))
+            raise RuntimeError("falha na rasterização")
+
+    with pytest.raises(ValueError, match="incompleta"):
+        with PngStreamWriter(str(destino), 4, 6, 300) as writer:
+            writer.write(np.zeros((3, 4, 3), dtype=np.uint8))
+
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,86 @@
+import numpy as np
+
+from gestao_vista.models.presence_matrix import PresenceMatrix
+from gestao_vista.services.gestao_history import GestaoHistoryStore
+
+DOCUMENTOS = [f"Documento {i}" for i in range(8)]
+
+
+def _periodos():
+    rng = np.random.default_rng(18)
+    codigos = [f"{i:05d}" for i in range(2000)]
+    mask = rng.random((len(codigos), len(DOCUMENTOS))) < 0.5
+    p1 = PresenceMatrix.from_mask(codigos, DOCUMENTOS, mask)
+
+    # Alguns documentos entregues
+    mask2 = mask.copy()
+    mask2[
+        rng.integers(0, len(codigos), 20), rng.integers(0, len(DOCUMENTOS), 20)
+    ] ^= True
+    p2 = PresenceMatrix.from_mask(codigos, DOCUMENTOS, mask2)
+
+    # Casas removidas e novas casas no final
+    codigos3 = codigos[10:] + ["90001", "90002"]
+    mask3 = np.vstack([mask2[10:], [[True] * 8, [False] * 8]])
+    p3 = PresenceMatrix.from_mask(codigos3, DOCUMENTOS, mask3)
+
+    # Um documento novo, entregue por poucas casas
+    novo = np.zeros((len(codigos3), 1), dtype=bool)
+    novo[:5] = True
+    p4 = PresenceMatrix.from_mask(
+        codigos3, DOCUMENTOS + ["Documento novo"], np.hstack([mask3, novo])
+    )
+
+    # Casas em outra ordem (a ordem completa não cabe em um delta pequeno)
+    ordem = rng.permutation(len(codigos3))
+    p5 = PresenceMatrix.from_mask(
+        [codigos3[i] for i in ordem], p4.documentos, p4.to_mask()[ordem]
+    )
+    return [p1, p2, p3, p4, p5]
+
+
+def _iguais(a, b):
+    return (
+        a.codigos == b.codigos
+        and a.documentos == b.documentos
+        and np.array_equal(a.to_mask(), b.to_mask())
+    )
+
+
+def test_deltas_reconstroem_cada_periodo(tmp_path):
+    store = GestaoHistoryStore(tmp_path)
+    periodos = _periodos()
+    for idx, presence in enumerate(periodos):
+        store.record(presence, rotulo=f"p{idx + 1}")
+
+    assert [p["tipo"] for p in store.periods()] == [
+        "keyframe",
+        "delta",
+        "delta",
+        "delta",
+        "keyframe",
+    ]
+    # Um store novo não tem o último período em memória
+    reaberto = GestaoHistoryStore(tmp_path)
+    for period, esperado in zip(reaberto.periods(), periodos):
+        assert _iguais(reaberto.load(period["id"]), esperado)
+    for (_, presence), esperado in zip(reaberto.iter_presences(), periodos):
+        assert _iguais(presence, esperado)
+
+
+def test_keyframe_a_cada_intervalo_e_periodo_repetido_ignorado(tmp_path):
+    store = GestaoHistoryStore(tmp_path, keyframe_interval=2)
+    periodos = _periodos()
+    for idx, presence in enumerate(periodos):
+        store.record(presence, rotulo=f"p{idx + 1}")
+
+    assert store.record(periodos[-1], rotulo="repetido") is None
+    assert [p["tipo"] for p in store.periods()] == [
+        "keyframe",
+        "delta",
+        "keyframe",
+        "delta",
+        "keyframe",
+    ]
+    reaberto = GestaoHistoryStore(tmp_path)
+    assert _iguais(reaberto.load(4), periodos[3])
@@ -0,0 +1,38 @@
+from matplotlib.figure import Figure
+
+from gestao_vista.services.graph_service import GraphService
+
+
+def _service():
+    service = GraphService()
+    service.fig = Figure()
+    service.ax = service.fig.add_subplot()
+    return service
+
+
+def test_atualizacoes_reutilizam_as_barras():
+    service = _service()
+    service._update_bars([3, 2, 1], ["red"] * 3)
+    barras = list(service.bars)
+
+    for refresh in range(20):
+        service._update_bars([refresh, 1, 2], ["blue"] * 3)
+
+    assert list(service.bars) == barras
+    assert [bar.get_height() for bar in service.bars] == [19, 1, 2]
+    assert len(service.ax.containers) == 1
+    assert len(service.ax.patches) == 3
+    assert len(service.ax.texts) == 3
+
+
+def test_mudanca_na_quantidade_de_documentos_nao_acumula_artistas():
+    service = _service()
+
+    for refresh in range(20):
+        n = 2 + refresh % 4
+        service._update_bars(list(range(n)), ["red"] * n)
+
+        assert len(service.ax.containers) == 1
+        assert len(service.ax.patches) == n
+        assert len(service.ax.texts) == n
+        assert len(service.labels) == n
@@ -0,0 +1,59 @@
+import os
+
+import numpy as np
+
+from gestao_vista.models.presence_matrix import PresenceMatrix
+from gestao_vista.services.import_cache import ImportCache
+from gestao_vista.utils.constants import IMPORTADOR_VERSAO, NORMALIZADOR_VERSAO
+
+
+def _presence(n_casas=4):
+    return PresenceMatrix.from_mask(
+        [str(i) for i in range(n_casas)],
+        ["Habite-se", "CNO"],
+        np.ones((n_casas, 2), dtype=bool),
+    )
+
+
+def test_chave_inclui_conteudo_e_versoes(tmp_path):
+    planilha = tmp_path / "gestao.xlsx"
+    planilha.write_bytes(b"conteudo")
+    copia = tmp_path / "copia.xlsx"
+    copia.write_bytes(b"conteudo")
+    cache = ImportCache(tmp_path / "cache")
+
+    key = cache.key_for(str(planilha))
+    assert key == cache.key_for(str(copia))
+    assert key.endswith(f"-i{IMPORTADOR_VERSAO}-v{NORMALIZADOR_VERSAO}")
+
+    planilha.write_bytes(b"outro conteudo")
+    assert cache.key_for(str(planilha)) != key
+
+
+def test_acerto_devolve_a_matriz_gravada(tmp_path):
+    cache = ImportCache(tmp_path / "cache")
+    assert cache.get("ausente") is None
+
+    cache.put("a", _presence())
+    presence = cache.get("a")
+    assert presence.codigos == ["0", "1", "2", "3"]
+    assert presence.to_mask().all()
+
+
+def test_lru_remove_a_entrada_usada_ha_mais_tempo(tmp_path):
+    cache = ImportCache(tmp_path / "cache")
+    cache.put("a", _presence())
+    tamanho = (tmp_path / "cache" / "a.npz").stat().st_size
+    cache.max_bytes = 2 * tamanho
+
+    cache.put("b", _presence())
+    os.utime(tmp_path / "cache" / "a.npz", ns=(1, 1))
+    os.utime(tmp_path / "cache" / "b.npz", ns=(2, 2))
+    # O acerto em "a" a torna a mais recente; "b" passa a ser a mais antiga
+    assert cache.get("a") is not None
+
+    cache.put("c", _presence())
+
+    assert cache.get("a") is not None
+    assert cache.get("b") is None
+    assert cache.get("c") is not None
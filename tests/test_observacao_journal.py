@@ -0,0 +1,68 @@
+import json
+
+from gestao_vista.services.observacao_journal import ObservacaoJournal
+
+
+def _record(observacao_id, casa="101"):
+    return {
+        "id": observacao_id,
+        "casa_oracao_id": casa,
+        "texto": f"obs {observacao_id}",
+    }
+
+
+def test_journal_e_reaplicado_sobre_o_snapshot(tmp_path):
+    snapshot = tmp_path / "observacoes.json"
+    journal = ObservacaoJournal(snapshot)
+    journal.put(_record(journal.next_id()))
+    journal.put(_record(journal.next_id()))
+    journal.delete("1")
+
+    reaberto = ObservacaoJournal(snapshot)
+    assert [r["id"] for r in reaberto.records()] == ["2"]
+    # Ids excluídos não são reutilizados
+    assert reaberto.next_id() == "3"
+
+
+def test_compactacao_grava_snapshot_e_esvazia_journal(tmp_path):
+    snapshot = tmp_path / "observacoes.json"
+    journal = ObservacaoJournal(snapshot)
+    journal.put(_record(journal.next_id()))
+    journal.compact()
+
+    assert journal.journal_file.read_text() == ""
+    assert [r["id"] for r in json.loads(snapshot.read_text())] == ["1"]
+    assert [r["id"] for r in ObservacaoJournal(snapshot).records()] == ["1"]
+
+
+def test_journal_grande_e_compactado_no_carregamento(tmp_path):
+    snapshot = tmp_path / "observacoes.json"
+    journal = ObservacaoJournal(snapshot, compact_threshold=1 << 20)
+    for _ in range(3):
+        journal.put(_record(journal.next_id()))
+
+    ObservacaoJournal(snapshot, compact_threshold=1)
+    assert len(json.loads(snapshot.read_text())) == 3
+
+
+def test_ids_repetidos_do_snapshot_antigo_sao_renumerados(tmp_path):
+    snapshot = tmp_path / "observacoes.json"
+    snapshot.write_text(json.dumps([_record("1"), _record("2"), _record("2", "102")]))
+
+    journal = ObservacaoJournal(snapshot)
+    records = journal.records()
+    assert [r["id"] for r in records] == ["1", "2", "3"]
+    assert records[2]["casa_oracao_id"] == "102"
+    assert journal.next_id() == "4"
+
+
+def test_linha_incompleta_nao_corrompe_o_proximo_evento(tmp_path):
+    snapshot = tmp_path / "observacoes.json"
+    journal = ObservacaoJournal(snapshot)
+    journal.put(_record(journal.next_id()))
+    with open(journal.journal_file, "a", encoding="utf-8") as f:
+        f.write('{"op": "put", "data": {"id": "9"')
+
+    journal.put(_record(journal.next_id()))
+
+    assert [r["id"] for r in ObservacaoJournal(snapshot).records()] == ["1", "2"]
@@ -0,0 +1,28 @@
+import numpy as np
+
+from gestao_vista.models.presence_matrix import PresenceMatrix
+
+
+def _matriz():
+    return PresenceMatrix.from_mask(
+        ["101", "102"], ["Doc A", "Doc B"], np.array([[True, False], [False, True]])
+    )
+
+
+def test_consultas_normalizam_codigo_como_from_dataframe():
+    presence = _matriz()
+
+    assert presence.row(" 101 ").tolist() == [True, False]
+    assert presence.has_documento("102 ", "Doc B")
+    assert not presence.has_documento(" 102", "Doc A")
+
+    mask, encontrados = presence.gather([" 102", "999"])
+    assert encontrados.tolist() == [True, False]
+    assert mask.tolist() == [[False, True], [False, False]]
+
+    assert presence.align(["101 "], ["Doc A"]).tolist() == [[True]]
+
+
+def test_codigos_numericos_sao_aceitos():
+    presence = _matriz()
+    assert presence.has_documento(101, "Doc A")
@@ -0,0 +1,22 @@
+import pandas as pd
+
+from gestao_vista.models.casa_oracao import CasaOracao
+from gestao_vista.services.report_service import COLUNAS_CASA, ReportService
+
+
+def test_faltantes_mantem_o_valor_original_da_celula():
+    df_gestao = pd.DataFrame(
+        {
+            "codigo": ["101", "102", "103"],
+            "Habite-se": ["X", "em andamento", None],
+        }
+    )
+    casas = [CasaOracao("102", "Casa 102", "Templo", "Rua A", "", "Ativo")]
+
+    df_export = ReportService(df_gestao, casas).faltantes_dataframe("Habite-se")
+
+    assert df_export.columns.tolist() == COLUNAS_CASA + ["Habite-se", "Status"]
+    assert df_export["codigo"].tolist() == ["102", "103"]
+    assert df_export["nome"].tolist()[0] == "Casa 102"
+    assert df_export["Habite-se"].tolist()[0] == "em andamento"
+    assert pd.isna(df_export["Habite-se"].tolist()[1])
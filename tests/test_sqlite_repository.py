@@ -0,0 +1,86 @@
+import json
+
+import numpy as np
+
+from gestao_vista.models.presence_matrix import PresenceMatrix
+from gestao_vista.services.observacao_journal import ObservacaoJournal
+from gestao_vista.services.sqlite_repository import (
+    SqliteCasaRepository,
+    SqliteDatabase,
+    SqliteGestaoRepository,
+    SqliteObservacaoRepository,
+    migrate_json_to_sqlite,
+)
+
+
+def _casa(codigo):
+    return {
+        "codigo": codigo,
+        "nome": f"Casa {codigo}",
+        "tipo_imovel": "Templo",
+        "endereco": "Rua A",
+        "observacoes": "",
+        "status": "Ativo",
+    }
+
+
+def _observacao(observacao_id, casa="101", documento="Habite-se"):
+    return {
+        "id": observacao_id,
+        "casa_oracao_id": casa,
+        "documento": documento,
+        "comentario": "pendente",
+        "data_criacao": "2026-01-01T00:00:00",
+    }
+
+
+def test_migracao_importa_json_e_continua_a_sequencia(tmp_path):
+    (tmp_path / "casas.json").write_text(json.dumps([_casa("101"), _casa("102")]))
+    (tmp_path / "gestao.json").write_text(
+        json.dumps(
+            [{"codigo": "101", "Habite-se": "X"}, {"codigo": "102", "Habite-se": ""}]
+        )
+    )
+    journal = ObservacaoJournal(tmp_path / "observacoes.json")
+    for _ in range(3):
+        journal.put(_observacao(journal.next_id()))
+    journal.delete("3")
+
+    database = SqliteDatabase(tmp_path / "gestao_vista.db")
+    assert migrate_json_to_sqlite(tmp_path, database)
+    assert not migrate_json_to_sqlite(tmp_path, database)
+
+    assert [c.codigo for c in SqliteCasaRepository(database).load()] == ["101", "102"]
+    presence = SqliteGestaoRepository(database).load()
+    assert presence.has_documento("101", "Habite-se")
+    assert not presence.has_documento("102", "Habite-se")
+
+    observacoes = SqliteObservacaoRepository(database)
+    assert [r["id"] for r in observacoes.records()] == ["1", "2"]
+    # O id 3 foi excluído no journal e não pode ser reutilizado
+    assert observacoes.next_id() == "4"
+
+
+def test_consultas_indexadas_de_observacoes(tmp_path):
+    observacoes = SqliteObservacaoRepository(SqliteDatabase(tmp_path / "db.sqlite"))
+    observacoes.put(_observacao("1", "101"))
+    observacoes.put(_observacao("2", "102"))
+    observacoes.put(_observacao("3", "101", "CNO"))
+
+    assert observacoes.get("2")["casa_oracao_id"] == "102"
+    assert observacoes.get("9") is None
+    assert [r["id"] for r in observacoes.by_casa("101")] == ["1", "3"]
+
+
+def test_fingerprint_muda_a_cada_gravacao(tmp_path):
+    database = SqliteDatabase(tmp_path / "db.sqlite")
+    gestao = SqliteGestaoRepository(database)
+    presence = PresenceMatrix.from_mask(["101"], ["CNO"], np.array([[True]]))
+
+    antes = gestao.fingerprint()
+    gestao.save(presence)
+    depois = gestao.fingerprint()
+    gestao.save(presence)
+
+    assert antes != depois
+    assert depois != gestao.fingerprint()
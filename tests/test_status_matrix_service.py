@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+
+from gestao_vista.models.observacao import Observacao
+from gestao_vista.models.presence_matrix import PresenceMatrix
+from gestao_vista.services.compliance_service import ComplianceService
+from gestao_vista.services.observacao_service import ObservacaoService
+from gestao_vista.services.status_matrix_service import (
+    STATUS_COM_OBSERVACAO,
+    STATUS_FALTANTE,
+    STATUS_PRESENTE,
+    StatusMatrixService,
+)
+
+DOCUMENTOS = ["Habite-se", "Bombeiros", "CNO"]
+
+
+@pytest.fixture
+def observacao_service(tmp_path, monkeypatch):
+    # O ObservacaoService grava em data/ no diretório atual
+    monkeypatch.chdir(tmp_path)
+    return ObservacaoService()
+
+
+def _presence():
+    return PresenceMatrix.from_mask(
+        ["101", "102"],
+        DOCUMENTOS,
+        np.array([[True, False, False], [False, False, True]]),
+    )
+
+
+def test_situacao_junta_presenca_e_observacoes(observacao_service):
+    observacao_service.criar_observacao(Observacao("101", "Bombeiros", "vistoria"))
+    observacao_service.criar_observacao(Observacao("101", "Habite-se", "já tem"))
+
+    matrix = StatusMatrixService(observacao_service).matrix(_presence())
+
+    assert matrix.status.tolist() == [
+        [STATUS_PRESENTE, STATUS_COM_OBSERVACAO, STATUS_FALTANTE],
+        [STATUS_FALTANTE, STATUS_FALTANTE, STATUS_PRESENTE],
+    ]
+    assert matrix.pendentes("101") == ["CNO"]
+    status, encontrados = matrix.gather(["102", "999"], ["CNO"])
+    assert status.tolist() == [[STATUS_PRESENTE], [STATUS_FALTANTE]]
+    assert encontrados.tolist() == [True, False]
+
+
+def test_observacoes_atualizam_matriz_e_conformidade(observacao_service):
+    presence = _presence()
+    service = StatusMatrixService(observacao_service)
+    matrix = service.matrix(presence)
+    table = ComplianceService(observacao_service).table(presence)
+
+    assert table.status_matrix is matrix
+    assert table.faltantes_com_observacao.tolist() == [0, 0]
+
+    observacao = observacao_service.criar_observacao(
+        Observacao("102", "Habite-se", "em análise")
+    )
+    assert matrix.row("102").tolist()[0] == STATUS_COM_OBSERVACAO
+    assert table.faltantes_com_observacao.tolist() == [0, 1]
+
+    observacao_service.excluir_observacao(observacao.id)
+    assert matrix.row("102").tolist()[0] == STATUS_FALTANTE
+    assert table.faltantes_com_observacao.tolist() == [0, 0]
+
+
+def test_matriz_em_cache_por_snapshot(observacao_service):
+    service = StatusMatrixService(observacao_service)
+    presence = _presence()
+
+    assert service.matrix(presence) is service.matrix(presence)
+    assert service.matrix(_presence()) is not service.matrix(presence)
+
+
+def test_conformidade_conta_presentes_por_tipo(observacao_service):
+    table = ComplianceService(observacao_service).table(_presence())
+
+    assert table.obrigatorios == ["Habite-se", "Bombeiros"]
+    assert table.opcionais == ["CNO"]
+    assert table.percentuais_obrigatorios.tolist() == [50.0, 0.0]
+    assert table.percentuais_opcionais.tolist() == [0.0, 100.0]
@@ -0,0 +1,55 @@
+from dataclasses import replace
+
+import numpy as np
+from matplotlib.backends.backend_pdf import PdfPages
+
+from gestao_vista.services.table_renderer import (
+    PAPEL_PDF,
+    TableGridData,
+    TableGridLayout,
+    TableGridRenderer,
+)
+
+
+def _dados(n_casas):
+    return TableGridData(
+        nomes=[f"Casa {i}" for i in range(n_casas)],
+        obrigatorios=["Habite-se", "Bombeiros"],
+        opcionais=["CNO"],
+        status=np.zeros((n_casas, 3), dtype=np.int8),
+        percentuais_obrigatorios=["0.0%"] * n_casas,
+        percentuais_opcionais=["0.0%"] * n_casas,
+    )
+
+
+def test_metade_sem_casas_nao_desenha_cabecalho():
+    # 20 casas em uma página de 40: a metade direita fica vazia
+    dados = _dados(20)
+    layout = replace(TableGridLayout.from_data(dados).paginado(40), n_casas=20)
+    fig = TableGridRenderer.render(dados, layout)
+
+    # Apenas a metade esquerda tem cabeçalhos ("Casa de Oração" + 5 colunas)
+    assert len(fig.axes[0].texts) == 6
+
+
+def test_ultima_pagina_divide_as_casas_nas_duas_metades():
+    layout = TableGridLayout.from_data(_dados(45)).paginado(5)
+
+    assert (layout.metade, layout.n_metades) == (3, 2)
+
+
+def test_pdf_em_papel_a4_paisagem(tmp_path, monkeypatch):
+    tamanhos = []
+    savefig = PdfPages.savefig
+
+    def registrar(self, figure=None, **kwargs):
+        tamanhos.append(tuple(figure.get_size_inches()))
+        return savefig(self, figure, **kwargs)
+
+    monkeypatch.setattr(PdfPages, "savefig", registrar)
+    paginas = TableGridRenderer.save_pdf(
+        _dados(45), str(tmp_path / "tabela.pdf"), casas_por_pagina=40
+    )
+
+    assert paginas == 2
+    assert tamanhos == [PAPEL_PDF, PAPEL_PDF]
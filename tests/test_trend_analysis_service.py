@@ -0,0 +1,37 @@
+import numpy as np
+
+from gestao_vista.models.presence_matrix import PresenceMatrix
+from gestao_vista.services.trend_analysis_service import TrendAnalysisService
+
+
+def _periodo(rotulo, codigos, documentos, mask):
+    return rotulo, PresenceMatrix.from_mask(
+        codigos, documentos, np.array(mask, dtype=bool)
+    )
+
+
+def test_primeira_conformidade_nos_obrigatorios():
+    documentos = ["Habite-se", "Bombeiros", "CNO"]
+    analysis = TrendAnalysisService.analyze(
+        [
+            _periodo("jan", ["A", "B"], documentos, [[1, 0, 1], [0, 0, 0]]),
+            _periodo("fev", ["A", "B"], documentos, [[1, 1, 0], [0, 0, 1]]),
+        ]
+    )
+
+    assert analysis.primeira_conformidade.tolist() == [1, -1]
+
+
+def test_sem_obrigatorios_nenhuma_casa_e_conforme():
+    documentos = ["CNO", "Contrato de Aluguel"]
+    analysis = TrendAnalysisService.analyze(
+        [
+            _periodo("jan", ["A", "B"], documentos, [[1, 1], [0, 0]]),
+            _periodo("fev", ["A", "B"], documentos, [[1, 1], [1, 1]]),
+        ]
+    )
+
+    assert analysis.primeira_conformidade.tolist() == [-1, -1]
+    assert analysis.primeira_conformidade_dataframe()[
+        "Primeira conformidade"
+    ].tolist() == ["", ""]
@@ -0,0 +1,70 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+from openpyxl import Workbook
+
+from gestao_vista.services.xlsx_stream_reader import (
+    GestaoSheet,
+    _dedup_headers,
+    read_gestao_sheet,
+)
+
+HEADER_ROW = 14
+
+
+def _planilha(path, headers, linhas):
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.append(["Relatório Gestão à Vista"])
+    for _ in range(HEADER_ROW - 1):
+        sheet.append([])
+    sheet.append(headers)
+    for linha in linhas:
+        sheet.append(linha)
+    workbook.save(path)
+    return str(path)
+
+
+def _ler_pelo_pandas(path):
+    df = pd.read_excel(path, header=HEADER_ROW, engine="openpyxl", dtype=str)
+    return GestaoSheet.from_dataframe(df)
+
+
+@pytest.mark.parametrize(
+    "headers",
+    [
+        ["Foo", "Foo", "Bar", "Foo"],
+        ["Foo", "Foo", "Foo.1", "Foo"],
+        ["x", "x", "x.1", "x.1", "x"],
+    ],
+)
+def test_cabecalhos_repetidos_como_no_pandas(headers):
+    csv = ",".join(headers) + "\n" + ",".join("1" * len(headers))
+    esperado = pd.read_csv(io.StringIO(csv), engine="python").columns.tolist()
+    assert _dedup_headers(headers) == esperado
+    assert _dedup_headers(["Foo", None, "Foo"]) == ["Foo", None, "Foo.1"]
+
+
+def test_leitura_em_streaming_equivale_ao_pandas(tmp_path):
+    path = _planilha(
+        tmp_path / "gestao.xlsx",
+        ["Código", "Habite-se", "Habite-se", None, "CNO", "CNO.1", "CNO"],
+        [
+            [101, "X", None, None, "x", None, " X "],
+            ["BR-102", None, "X", None, None, "X", None],
+            [103.5, "não", "", None, "X", None, None],
+            [104, None, None, None, None, None, "NA"],
+        ],
+    )
+
+    stream = read_gestao_sheet(path, header_row=HEADER_ROW)
+    pandas = _ler_pelo_pandas(path)
+
+    assert stream.headers == pandas.headers
+    assert stream.headers[1:3] == ["Habite-se", "Habite-se.1"]
+    assert stream.codigo_column == pandas.codigo_column
+    assert stream.codigos == pandas.codigos
+    np.testing.assert_array_equal(stream.presenca, pandas.presenca)
+    np.testing.assert_array_equal(stream.preenchidas, pandas.preenchidas)